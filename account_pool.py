@@ -0,0 +1,177 @@
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class NoAccountAvailable(Exception):
+    """Semua akun sedang kehabisan token atau di-quarantine"""
+
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(f"Tidak ada akun LinkedIn yang tersedia, coba lagi dalam {retry_after}s")
+
+
+class Account:
+    """Satu session li_at beserta token bucket dan statistik pemakaiannya"""
+
+    def __init__(self, account_id: str, li_at_cookie: str, rate_per_minute: float, burst: int):
+        self.account_id = account_id
+        self.li_at_cookie = li_at_cookie
+        self.rate_per_second = rate_per_minute / 60.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+
+        self.quarantined_until = 0.0
+        self.quarantine_reason = None
+        self.strikes = 0
+
+        self.scrapes = 0
+        self.successes = 0
+        self.failures = 0
+        self.login_walls = 0
+        self.last_used = 0.0
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_second <= 0
+
+    def refill(self, now: float):
+        if self.unlimited:
+            return
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled_at) * self.rate_per_second)
+        self.refilled_at = now
+
+    def is_quarantined(self, now: float) -> bool:
+        return now < self.quarantined_until
+
+    def wait_time(self, now: float) -> float:
+        """Detik sampai akun bisa dipakai lagi"""
+        if self.is_quarantined(now):
+            return self.quarantined_until - now
+        if self.unlimited or self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate_per_second
+
+    def masked_cookie(self) -> str:
+        return f"…{self.li_at_cookie[-4:]}" if len(self.li_at_cookie) > 4 else "…"
+
+
+class AccountPool:
+    def __init__(self, li_at_cookies: List[str], rate_per_minute: float = 0.0, burst: int = 5,
+                 quarantine_seconds: float = 1800.0, max_quarantine_seconds: float = 6 * 3600.0):
+        """
+        Jadwalkan scrape ke beberapa akun LinkedIn
+
+        Akun dipilih yang punya token terbanyak (seri: paling lama tidak
+        dipakai), sehingga beban tersebar rata. Akun yang mendarat di
+        login wall/checkpoint di-quarantine dengan backoff eksponensial dan
+        otomatis kembali ke rotasi setelah quarantine habis.
+
+        Args:
+            li_at_cookies: Daftar session cookie li_at
+            rate_per_minute: Scrape per menit per akun (0: tanpa limit)
+            burst: Kapasitas token bucket per akun
+            quarantine_seconds: Lama quarantine pertama setelah login wall
+            max_quarantine_seconds: Batas atas quarantine setelah backoff
+        """
+        self.quarantine_seconds = quarantine_seconds
+        self.max_quarantine_seconds = max_quarantine_seconds
+        self.accounts = [
+            Account(f"account-{i}", cookie, rate_per_minute, burst)
+            for i, cookie in enumerate(li_at_cookies, start=1)
+        ]
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def _pick(self, now: float) -> Optional[Account]:
+        candidates = []
+        for account in self.accounts:
+            account.refill(now)
+            if account.wait_time(now) == 0:
+                candidates.append(account)
+        if not candidates:
+            return None
+        return max(candidates, key=lambda a: (float("inf") if a.unlimited else a.tokens, -a.last_used))
+
+    def _retry_after(self, now: float) -> float:
+        return min((account.wait_time(now) for account in self.accounts), default=60.0)
+
+    def acquire(self, timeout: float = 30.0) -> Account:
+        """
+        Ambil akun untuk satu scrape (mengurangi satu token)
+
+        Raises:
+            NoAccountAvailable: jika tidak ada akun yang bisa dipakai sebelum timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._available:
+            while True:
+                now = time.monotonic()
+                account = self._pick(now)
+                if account:
+                    if not account.unlimited:
+                        account.tokens -= 1
+                    account.scrapes += 1
+                    account.last_used = now
+                    return account
+
+                wait = self._retry_after(now)
+                remaining = deadline - now
+                if not self.accounts or wait > remaining:
+                    raise NoAccountAvailable(max(1, int(wait + 0.999)) if self.accounts else 60)
+                self._available.wait(timeout=min(wait, remaining))
+
+    def report(self, account: Account, success: bool, login_wall: Optional[str] = None):
+        """Catat hasil scrape; login wall memicu quarantine"""
+        with self._available:
+            if login_wall:
+                account.login_walls += 1
+                account.strikes += 1
+                duration = min(self.quarantine_seconds * 2 ** (account.strikes - 1), self.max_quarantine_seconds)
+                account.quarantined_until = time.monotonic() + duration
+                account.quarantine_reason = login_wall
+                print(f"[ACCOUNTS] ✗ {account.account_id} ({account.masked_cookie()}) hit login wall "
+                      f"{login_wall}, quarantined for {duration:.0f}s")
+            elif success:
+                account.successes += 1
+                account.strikes = 0
+            else:
+                account.failures += 1
+            self._available.notify_all()
+
+    def quarantine(self, account: Account, reason: str):
+        """Quarantine manual, misal saat cek session startup gagal"""
+        self.report(account, success=False, login_wall=reason)
+
+    def available_count(self) -> int:
+        with self._lock:
+            now = time.monotonic()
+            return sum(1 for account in self.accounts if not account.is_quarantined(now))
+
+    def stats(self) -> Dict:
+        """Statistik per akun untuk health endpoint (cookie disamarkan)"""
+        with self._lock:
+            now = time.monotonic()
+            accounts = []
+            for account in self.accounts:
+                account.refill(now)
+                quarantined = account.is_quarantined(now)
+                accounts.append({
+                    "account_id": account.account_id,
+                    "li_at": account.masked_cookie(),
+                    "state": "quarantined" if quarantined else "active",
+                    "tokens": None if account.unlimited else round(account.tokens, 2),
+                    "scrapes": account.scrapes,
+                    "successes": account.successes,
+                    "failures": account.failures,
+                    "login_walls": account.login_walls,
+                    "quarantine_remaining_seconds": round(account.quarantined_until - now) if quarantined else 0,
+                    "quarantine_reason": account.quarantine_reason if quarantined else None
+                })
+            return {
+                "total": len(accounts),
+                "active": sum(1 for a in accounts if a["state"] == "active"),
+                "quarantined": sum(1 for a in accounts if a["state"] == "quarantined"),
+                "accounts": accounts
+            }
@@ -0,0 +1,176 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import google.generativeai as genai
+
+
+def build_skills_prompt(headline: str, about: str, experiences: List[Dict]) -> str:
+    """Prompt Gemini untuk generate skills dari headline, about dan experience"""
+    # Siapkan context dari experiences
+    experience_text = ""
+    if experiences:
+        for exp in experiences[:5]:  # Ambil 5 experience terakhir
+            exp_text = f"- {exp.get('title', '')}"
+            if exp.get('company'):
+                exp_text += f" di {exp['company']}"
+            if exp.get('description'):
+                exp_text += f": {exp['description'][:100]}"
+            experience_text += exp_text + "\n"
+
+    return f"""Based on the following LinkedIn profile information, generate a list of relevant skills.
+
+Headline: {headline}
+
+About: {about}
+
+Experience:
+{experience_text}
+
+Provide the response in the format: skill1|skill2|skill3|skill4|skill5
+
+Only include relevant and specific skills, with no additional explanation. Maximum 10 skills."""
+
+
+class SkillsGenerator:
+    def __init__(self, model_name: str = "gemini-2.5-flash", cache_ttl: float = 7 * 86400,
+                 max_cache_entries: int = 1024, max_workers: int = 2):
+        """
+        Fallback skills via Gemini dengan client yang dipakai ulang dan cache
+        content-addressed (hash dari prompt), sehingga input yang sama tidak
+        pernah memanggil API dua kali selama TTL
+
+        Args:
+            model_name: Nama model Gemini
+            cache_ttl: Umur (detik) hasil di cache
+            max_cache_entries: Jumlah maksimal entry cache (LRU)
+            max_workers: Jumlah panggilan Gemini yang berjalan bersamaan
+        """
+        self.model_name = model_name
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gemini")
+        self._lock = threading.Lock()
+        self._model = None
+        self._api_key = None
+        self._cache = OrderedDict()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.api_calls = 0
+        self.api_errors = 0
+
+    def _get_model(self):
+        """GenerativeModel dibuat sekali; dibuat ulang hanya jika GEMINI_API_KEY berubah"""
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key:
+            return None
+        with self._lock:
+            if self._model is None or api_key != self._api_key:
+                genai.configure(api_key=api_key)
+                self._model = genai.GenerativeModel(self.model_name)
+                self._api_key = api_key
+            return self._model
+
+    def _cache_key(self, prompt: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            skills, stored_at = entry
+            if time.time() - stored_at > self.cache_ttl:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return skills
+
+    def _cache_set(self, key: str, skills: str):
+        with self._lock:
+            self._cache[key] = (skills, time.time())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_cache_entries:
+                self._cache.popitem(last=False)
+
+    def _call(self, key: str, prompt: str) -> str:
+        model = self._get_model()
+        if model is None:
+            print("⚠ GEMINI_API_KEY tidak diset, skip AI generation")
+            return ""
+
+        print("[AI] Generating skills dengan Gemini...")
+        with self._lock:
+            self.api_calls += 1
+        try:
+            response = model.generate_content(prompt)
+        except Exception:
+            with self._lock:
+                self.api_errors += 1
+            raise
+
+        if not response.text:
+            print("[AI] Gemini response kosong")
+            return ""
+
+        skills_text = response.text.strip()
+        print(f"[AI] Generated skills: {skills_text}")
+        self._cache_set(key, skills_text)
+        return skills_text
+
+    def submit(self, headline: str, about: str, experiences: List[Dict]) -> Future:
+        """
+        Mulai generate skills di background
+
+        Returns:
+            Future berisi string "skill1|skill2|..." ("" jika gagal/kosong);
+            langsung selesai jika hasil sudah ada di cache
+        """
+        prompt = build_skills_prompt(headline, about, experiences)
+        key = self._cache_key(prompt)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            with self._lock:
+                self.cache_hits += 1
+            print("[AI] Skills diambil dari cache")
+            future = Future()
+            future.set_result(cached)
+            return future
+
+        with self._lock:
+            self.cache_misses += 1
+        return self._executor.submit(self._call, key, prompt)
+
+    def stats(self) -> Dict:
+        """Statistik untuk health/metrics endpoint"""
+        with self._lock:
+            return {
+                "cache_entries": len(self._cache),
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "api_calls": self.api_calls,
+                "api_errors": self.api_errors
+            }
+
+
+_default_generator = None
+_default_lock = threading.Lock()
+
+
+def get_skills_generator() -> SkillsGenerator:
+    """SkillsGenerator bersama untuk semua LinkedInScraper dalam satu proses"""
+    global _default_generator
+    with _default_lock:
+        if _default_generator is None:
+            _default_generator = SkillsGenerator(
+                cache_ttl=float(os.getenv("AI_SKILLS_CACHE_TTL", str(7 * 86400))),
+                max_cache_entries=int(os.getenv("AI_SKILLS_CACHE_ENTRIES", "1024"))
+            )
+        return _default_generator
@@ -0,0 +1,354 @@
+import asyncio
+import json
+import time
+import traceback
+import uuid
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+
+from cdp_browser import CDPBrowser, CDPContext, CDPError, CDPPage
+from extraction_script import (EXPAND_ABOUT_JS, LOAD_SKILLS_JS, PAGE_SIGNALS_JS, PROFILE_EXTRACTION_JS,
+                               SECTION_SUMMARY_JS, WAIT_FOR_SECTIONS_JS)
+from linkedin_scraper_v2 import LINKEDIN_BASE_URL, is_login_wall, is_profile_missing, li_at_cookie_params
+from profile_parsing import SECTION_KEYWORDS, about_candidates, index_sections, skills_from_texts
+from scrape_state import ABOUT_EXPAND_SECONDS, DEADLINE_EXTRACT_SECONDS, LAZY_SECTION_KINDS, ScrapeState
+
+SECTIONS_CONDITION = ("document.evaluate(\"count(//*[@id='profile-content']/div/div[2]/div/div/main/section)\", "
+                      "document, null, XPathResult.NUMBER_TYPE, null).numberValue > 0")
+SKILLS_LIST_CONDITION = ("document.evaluate(\"//div[contains(@class, 'pvs-list__container')]\", document, null, "
+                         "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue")
+VISIBLE_SKILLS_JS = r"""
+const result = document.evaluate("//div[contains(@class, 'pvs-list__container')]//li//span[@aria-hidden='true']",
+    document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const texts = [];
+for (let i = 0; i < result.snapshotLength; i++) {
+    texts.push(result.snapshotItem(i).innerText || '');
+}
+return texts;
+"""
+
+
+class AsyncLinkedInScraper(ScrapeState):
+    def __init__(self, li_at_cookie: str, browser: CDPBrowser, load_budget: float = 10.0, settle_ms: int = 300,
+                 base_url: str = LINKEDIN_BASE_URL, skills_generator=None, ai_prefetch: bool = False,
+                 ai_timeout: float = 20.0, parallel_skills: bool = True, page_archive=None,
+                 page_load_timeout: float = 30.0, deadline: Optional[float] = None):
+        """
+        Versi asyncio LinkedInScraper di atas CDPBrowser: satu scrape memakai
+        browser context sendiri di Chrome yang dipakai bersama, jadi puluhan
+        scrape bisa berjalan bersamaan di satu event loop tanpa Chrome per
+        scrape. scrape_profile di-await dan menghasilkan bentuk data yang sama.
+
+        Bukan subclass LinkedInScraper: parsing field, fields=, refresh
+        incremental dan instrumentasi (timings, errors, skills_source, network,
+        signals) dipakai bersama lewat ScrapeState; method yang menyentuh
+        browser ditulis di sini sebagai coroutine. Extraction selalu mode js
+        (satu Runtime.evaluate per halaman).
+
+        Args:
+            browser: CDPBrowser yang dipakai bersama semua scrape
+            parallel_skills: Load halaman skills di tab kedua bersamaan dengan
+                halaman profil
+            page_load_timeout: Detik maksimal menunggu load event halaman
+            (argumen lain sama dengan LinkedInScraper)
+        """
+        self._init_state(li_at_cookie, load_budget, settle_ms, base_url, skills_generator, ai_prefetch,
+                         ai_timeout, parallel_skills, page_archive, deadline)
+        self.browser = browser
+        self.blocked_url_patterns = browser.blocked_url_patterns
+        self.context: Optional[CDPContext] = None
+        self.page: Optional[CDPPage] = None
+        self.skills_page: Optional[CDPPage] = None
+        self.page_load_timeout = page_load_timeout
+        self.engine = "cdp"
+
+    async def scrape_profile(self, vanity_name: str, previous=None, fields: Optional[List[str]] = None) -> Dict:
+        """
+        Scrape profil LinkedIn berdasarkan vanity name (bentuk hasil sama dengan LinkedInScraper.scrape_profile)
+
+        Returns:
+            Dictionary berisi data profil
+        """
+        self.started_at = time.perf_counter()
+        self._select_fields(fields)
+        if fields is not None:
+            previous = None
+        context = None
+        try:
+            print(f"\n{'='*60}")
+            print(f"[CDP_SCRAPER] Starting profile scrape for: {vanity_name}")
+            print(f"{'='*60}\n")
+
+            self.vanity_name = vanity_name
+            self.scrape_id = uuid.uuid4().hex[:12]
+            async with AsyncExitStack() as stack:
+                try:
+                    context = await asyncio.wait_for(
+                        stack.enter_async_context(
+                            self.browser.context(li_at_cookie_params(self.li_at_cookie, self.base_url))
+                        ),
+                        self._context_budget()
+                    )
+                except asyncio.TimeoutError:
+                    return self._context_timeout_result()
+                finally:
+                    # Seperti driver_checkout di DriverPool: waktu menunggu slot tidak masuk total
+                    self.timings["context_checkout"] = time.perf_counter() - self.started_at
+                    self.started_at = time.perf_counter()
+                return await self._scrape_in_context(context, vanity_name, previous)
+
+        except Exception as e:
+            self._record_error("scrape")
+            print(f"\n[CDP_SCRAPER ERROR] Error scraping profile: {str(e)}")
+            print(f"[CDP_SCRAPER TRACEBACK]\n{traceback.format_exc()}\n")
+            return {
+                "data": {},
+                "message": f"Error: {str(e)}"
+            }
+        finally:
+            if context is not None:
+                self.network = context.network_stats()
+                self.pages_loaded = sum(page.pages_loaded for page in context.pages)
+            self.context = self.page = self.skills_page = None
+            self.timings["total"] = time.perf_counter() - self.started_at
+
+    def _context_budget(self) -> Optional[float]:
+        """Detik maksimal menunggu slot browser context (None: tanpa deadline, tunggu sampai dapat)"""
+        remaining = self._remaining()
+        if remaining is None:
+            return None
+        return max(remaining - DEADLINE_EXTRACT_SECONDS, 0.0)
+
+    def _context_timeout_result(self) -> Dict:
+        """Deadline habis sebelum dapat browser context: semua section dilewati (hasil parsial)"""
+        print("[DEADLINE] Tidak dapat browser context sebelum deadline")
+        for section in self.sections:
+            self._skip_section(section)
+        return self._result({})
+
+    async def _scrape_in_context(self, context: CDPContext, vanity_name: str, previous) -> Dict:
+        profile_url = f"{self.base_url}/in/{vanity_name}/"
+        print(f"[CDP_SCRAPER] Loading URL: {profile_url}")
+        self.context = context
+        with self._span("navigation"):
+            self.page = await context.new_page()
+            navigations = [self.page.navigate(profile_url)]
+            # Halaman skills di-load di tab kedua bersamaan dengan halaman profil
+            if self.parallel_skills and previous is None and "skills" in self.sections:
+                self.skills_page = await context.new_page()
+                navigations.append(self.skills_page.navigate(f"{profile_url}details/skills/"))
+            await asyncio.gather(*navigations)
+
+            # Script lazy loading halaman harus sudah terpasang sebelum di-scroll
+            if not await self.page.wait_loaded(self._wait_budget(self.page_load_timeout)):
+                print("⚠ Timeout waiting for page load, continuing anyway...")
+            if await self.page.wait_for("document.getElementById('profile-content')", self._wait_budget(20)):
+                print("✓ Profile content loaded")
+            else:
+                print("⚠ Timeout waiting for profile-content, continuing anyway...")
+
+        # Session ditolak: jangan extract halaman login sebagai profil
+        url = await self.page.url()
+        if is_login_wall(url):
+            self.login_wall = url
+            raise RuntimeError(f"Session LinkedIn diarahkan ke {self.login_wall}")
+        if is_profile_missing(url):
+            return self._not_found_result(url)
+
+        lazy_kinds = [kind for section, kind in LAZY_SECTION_KINDS.items() if section in self.sections]
+        if lazy_kinds:
+            with self._span("scroll"):
+                await self._load_sections(lazy_kinds)
+
+        profile_data = await self._extract_profile_data(previous)
+        print("\n[CDP_SCRAPER] Profile extraction completed")
+        print(f"[CDP_SCRAPER] Response: {json.dumps(profile_data, indent=2, ensure_ascii=False)}\n")
+        return profile_data
+
+    async def _load_sections(self, kinds: List[str]) -> Dict:
+        """Adaptive scroll (WAIT_FOR_SECTIONS_JS) sampai section kinds ada atau load_budget habis"""
+        budget = self._wait_budget(self.load_budget, reserve=DEADLINE_EXTRACT_SECONDS)
+        result = {}
+        if budget > 0:
+            try:
+                result = await self.page.evaluate_async(
+                    WAIT_FOR_SECTIONS_JS, int(budget * 1000), self.settle_ms, 600,
+                    {kind: SECTION_KEYWORDS[kind] for kind in kinds}, timeout=budget + 5
+                ) or {}
+            except CDPError as e:
+                print(f"[CDP_SCRAPER] ⚠ Adaptive loading failed: {str(e)}")
+                return {}
+            print(f"[CDP_SCRAPER] Sections loaded ({result.get('reason')}) after {result.get('steps')} scroll(s) "
+                  f"in {result.get('elapsed_ms')}ms: {result.get('found')}")
+        self._note_lazy_cut_short(kinds, result, budget)
+        return result
+
+    async def _build_section_index(self) -> Dict[str, int]:
+        """Scan section sekali per page load (lihat LinkedInScraper._build_section_index)"""
+        if not await self.page.wait_for(SECTIONS_CONDITION, self._wait_budget(10)):
+            print("[SECTIONS] ⚠ Timeout waiting for sections")
+        try:
+            sections = await self.page.evaluate(SECTION_SUMMARY_JS) or []
+        except CDPError as e:
+            print(f"[SECTIONS] Error reading sections: {str(e)}")
+            sections = []
+        self.section_index = index_sections(sections)
+        print(f"[SECTIONS] Found {len(sections)} total sections, index: {self.section_index}")
+        return self.section_index
+
+    async def _page_signals(self) -> Dict[str, Dict]:
+        """Sinyal murah per section untuk refresh incremental (lihat LinkedInScraper._page_signals)"""
+        try:
+            raw = await self.page.evaluate(PAGE_SIGNALS_JS, self.section_index, about_candidates(self.section_index)) or {}
+        except CDPError as e:
+            self._record_error("signals")
+            print(f"[REFRESH] ⚠ Gagal membaca sinyal halaman: {str(e)}")
+            return {}
+        return self._signals_from_raw(raw)
+
+    async def _extract_profile_data(self, previous=None) -> Dict:
+        """Extract data halaman profil (lihat LinkedInScraper._extract_profile_data)"""
+        data = {
+            "data": {},
+            "message": "ok"
+        }
+
+        try:
+            with self._span("section_index"):
+                await self._build_section_index()
+            if self.fields is None:
+                with self._span("signals"):
+                    self.signals = await self._page_signals()
+
+            page_sections = self._page_sections(previous)
+
+            profile_data = {}
+            if page_sections:
+                with self._span("extract_main_js"):
+                    if "about" in page_sections:
+                        await self._expand_about()
+                    raw = await self.page.evaluate(
+                        PROFILE_EXTRACTION_JS, self.section_index, about_candidates(self.section_index), page_sections
+                    ) or {}
+                    profile_data = self._parse_main_page(raw, page_sections)
+            await self._archive_page("profile", self.page)
+            profile_data = self._merge_reused(profile_data, previous)
+
+            skills = self._reused_skills(profile_data, previous)
+            if self._needs_skills(skills):
+                ai_future = self._submit_ai_skills(profile_data) if self.ai_prefetch else None
+                with self._span("skills"):
+                    skills = await self._extract_skills()
+                if skills:
+                    self.skills_source = "page"
+                elif self._optional_sections(["skills"]):
+                    skills = await self._fallback_skills(profile_data, future=ai_future)
+
+            profile_data["skills"] = skills
+
+            return self._result(profile_data)
+
+        except Exception as e:
+            self._record_error("profile_data")
+            print(f"Error extracting profile data: {str(e)}")
+            return data
+
+    async def _expand_about(self):
+        """Klik "see more" About dan tunggu teks lengkapnya (lihat LinkedInScraper._expand_about_js)"""
+        budget = self._wait_budget(ABOUT_EXPAND_SECONDS)
+        try:
+            result = await self.page.evaluate_async(
+                EXPAND_ABOUT_JS, about_candidates(self.section_index), int(budget * 1000), timeout=budget + 5
+            ) or {}
+        except CDPError as e:
+            print(f"[CDP_SCRAPER] ⚠ Expand About gagal: {str(e)}")
+            return
+        if result.get("clicked") and not result.get("expanded"):
+            print(f"[CDP_SCRAPER] ⚠ About belum terbuka setelah {result.get('elapsed_ms')}ms")
+
+    async def _archive_page(self, kind: str, page: CDPPage):
+        """Simpan DOM tab ke page_archive (lihat LinkedInScraper._archive_page)"""
+        if not self._archive_enabled():
+            return
+        try:
+            with self._span("archive"):
+                html, url = await page.content(), await page.url()
+                # Tulis gzip di thread supaya scrape lain di event loop tidak tertahan
+                await asyncio.to_thread(
+                    self.page_archive.save, self.vanity_name, self.scrape_id, kind, html, url,
+                    self._archive_metadata(kind)
+                )
+        except Exception as e:
+            self._record_error("archive")
+            print(f"[ARCHIVE] ⚠ Gagal menyimpan halaman {kind}: {str(e)}")
+
+    async def _extract_skills(self) -> str:
+        """Extract skills dari tab /details/skills/ (dibuka sekarang jika belum di-load paralel)"""
+        try:
+            page = self.skills_page
+            if page is None:
+                # Refresh incremental: skills baru di-load setelah sinyalnya terbukti berubah
+                page = self.skills_page = await self.context.new_page()
+                await page.navigate(f"{self.base_url}/in/{self.vanity_name}/details/skills/")
+
+            await page.wait_loaded(self._wait_budget(self.page_load_timeout))
+            if not await page.wait_for(SKILLS_LIST_CONDITION, self._wait_budget(10)):
+                print("⚠ Timeout waiting for skills list")
+
+            budget = self._wait_budget(self.load_budget, reserve=DEADLINE_EXTRACT_SECONDS)
+            try:
+                result = await page.evaluate_async(
+                    LOAD_SKILLS_JS, int(budget * 1000), self.settle_ms, timeout=budget + 5
+                ) or {}
+                print(f"[SKILLS] List loaded ({result.get('reason')}) with {result.get('items')} item(s), "
+                      f"{result.get('pages')} page(s) in {result.get('elapsed_ms')}ms")
+                self._note_cut_short(["skills"], result, budget, {"skills": "skills"})
+                texts = result.get("skills") or []
+            except CDPError as e:
+                print(f"[SKILLS] ⚠ Adaptive loading failed, reading visible skills only: {str(e)}")
+                texts = await page.evaluate(VISIBLE_SKILLS_JS) or []
+
+            skills = skills_from_texts(texts)
+            await self._archive_page("skills", page)
+
+            print(f"Extracted {len(skills)} skills")
+            return "|".join(skills) if skills else ""
+
+        except Exception as e:
+            self._record_error("skills")
+            print(f"Error extracting skills: {str(e)}")
+            return ""
+
+    async def _fallback_skills(self, profile_data: Dict, future=None) -> str:
+        """Generate skills dengan AI tanpa memblok event loop (lihat LinkedInScraper._fallback_skills)"""
+        print("[SKILLS] Ekstraksi skills gagal, mencoba generate dengan AI...")
+        with self._span("ai_fallback"):
+            if future is None:
+                future = self._submit_ai_skills(profile_data)
+            timeout = self._wait_budget(self.ai_timeout)
+            try:
+                skills = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+            except asyncio.TimeoutError:
+                self._record_error("ai_fallback")
+                print(f"[AI ERROR] Gemini tidak merespon dalam {timeout:.1f}s")
+                skills = ""
+            except Exception as e:
+                self._record_error("ai_fallback")
+                print(f"[AI ERROR] Error generating skills: {str(e)}")
+                skills = ""
+        return self._ai_skills_result(skills)
+
+
+async def check_session_cdp(browser: CDPBrowser, li_at_cookie: str, base_url: str = LINKEDIN_BASE_URL,
+                            timeout: float = 15.0) -> Dict:
+    """Versi CDP linkedin_scraper_v2.check_session: buka /feed/ di context baru"""
+    checked_at = time.time()
+    try:
+        async with browser.context(li_at_cookie_params(li_at_cookie, base_url)) as context:
+            page = await context.new_page()
+            await page.navigate(f"{base_url.rstrip('/')}/feed/")
+            await page.wait_loaded(timeout)
+            url = await page.url()
+    except Exception as e:
+        return {"valid": False, "url": None, "error": str(e), "checked_at": checked_at}
+    return {"valid": not is_login_wall(url), "url": url, "checked_at": checked_at}
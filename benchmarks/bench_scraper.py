@@ -0,0 +1,356 @@
+"""
+Benchmark offline LinkedInScraper terhadap stand-in lokal
+
+Mengukur wall-clock per fase (driver init, cookie, navigasi, scroll,
+extract, skills) selama N run dan melaporkan p50/p95, lalu membandingkan
+mode sequential (browser baru per scrape) dengan mode pooled/concurrent
+(DriverPool + thread pool). Dengan --resource-blocking both, setiap mode
+dijalankan dengan dan tanpa blocking CDP untuk mengukur request/byte yang dihemat.
+Dengan --engine http, scrape memakai fast path JSON (VoyagerClient) dan browser
+hanya dipakai jika fast path gagal. Dengan --engine cdp, scrape berjalan
+sebagai coroutine (AsyncLinkedInScraper) di satu Chrome; mode pooled menjalankan
+--concurrency scrape bersamaan sebagai browser context di Chrome itu. Dengan
+--fields, hanya field tersebut yang di-extract (lookup ringan, misal full_name,headline).
+
+Usage:
+    python benchmarks/bench_scraper.py --runs 10 --concurrency 2
+    python benchmarks/bench_scraper.py --mode pooled --output bench.json --max-total-p95 8
+    python benchmarks/bench_scraper.py --mode sequential --resource-blocking both
+    python benchmarks/bench_scraper.py --engine http --runs 50
+    python benchmarks/bench_scraper.py --engine cdp --mode pooled --runs 64 --concurrency 32
+    python benchmarks/bench_scraper.py --mode pooled --fields full_name,headline
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_scraper_v2 import LinkedInScraper  # noqa: E402
+from async_scraper import AsyncLinkedInScraper  # noqa: E402
+from cdp_browser import CDPBrowser  # noqa: E402
+from driver_pool import DriverPool  # noqa: E402
+from resource_blocking import DEFAULT_BLOCKED_URL_PATTERNS  # noqa: E402
+from voyager_client import VoyagerClient  # noqa: E402
+from profile_snapshots import parse_fields  # noqa: E402
+from stand_in_server import start_server  # noqa: E402
+
+# Isi fixture yang diharapkan, untuk mendeteksi regresi hasil extract
+EXPECTED_COUNTS = {"experiences": 3, "educations": 1, "certifications": 2}
+EXPECTED_SKILLS = 8
+# Kalimat terakhir About; hanya ada setelah "see more" selesai di-expand
+EXPECTED_ABOUT_ENDING = "serves search and recommendations."
+
+
+def validate(result: Dict, fields: List[str] = None) -> List[str]:
+    """Bandingkan hasil scrape dengan isi fixture (hanya fields jika diisi)"""
+    def wanted(field: str) -> bool:
+        return fields is None or field in fields
+
+    problems = []
+    data = result.get("data") or {}
+    if wanted("full_name") and not data.get("full_name"):
+        problems.append("full_name kosong")
+    if wanted("about") and not (data.get("about") or "").endswith(EXPECTED_ABOUT_ENDING):
+        problems.append(f"about terpotong: {data.get('about')!r}")
+    for field, expected in EXPECTED_COUNTS.items():
+        actual = len(data.get(field) or [])
+        if wanted(field) and actual != expected:
+            problems.append(f"{field}: {actual} != {expected}")
+    skills = [s for s in (data.get("skills") or "").split("|") if s]
+    if wanted("skills") and len(skills) != EXPECTED_SKILLS:
+        problems.append(f"skills: {len(skills)} != {EXPECTED_SKILLS}")
+    if fields is not None and set(data) - set(fields):
+        problems.append(f"field tidak diminta ikut dikembalikan: {sorted(set(data) - set(fields))}")
+    return problems
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Percentile nearest-rank"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Ringkas durasi per fase menjadi p50/p95/mean (ms)"""
+    phases = sorted({phase for sample in samples for phase in sample})
+    summary = {}
+    for phase in phases:
+        values = [sample[phase] for sample in samples if phase in sample]
+        summary[phase] = {
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "mean_ms": round(sum(values) / len(values) * 1000, 1),
+            "runs": len(values),
+        }
+    return summary
+
+
+def summarize_network(samples: List[Dict]) -> Dict[str, float]:
+    """Rata-rata request, request diblok dan KiB per scrape"""
+    samples = [sample for sample in samples if sample]
+    if not samples:
+        return {}
+    return {
+        "requests_per_scrape": round(sum(s["requests"] for s in samples) / len(samples), 1),
+        "blocked_per_scrape": round(sum(s["blocked"] for s in samples) / len(samples), 1),
+        "kib_per_scrape": round(sum(s["bytes"] for s in samples) / len(samples) / 1024, 1),
+    }
+
+
+def scrape_once(vanity_name: str, base_url: str, extraction_mode: str, blocked_url_patterns: List[str],
+                pool: DriverPool = None, http_client: VoyagerClient = None, fields: List[str] = None) -> Dict:
+    """Satu scrape terukur; kembalikan timing per fase (LinkedInScraper.timings) dan masalah validasi"""
+    scraper = LinkedInScraper(
+        li_at_cookie="benchmark",
+        extraction_mode=extraction_mode,
+        base_url=base_url,
+        blocked_url_patterns=blocked_url_patterns,
+        http_client=http_client
+    )
+    # Sama seperti main.run_scrape: fast path dulu, browser dari pool hanya jika gagal
+    result = scraper.scrape_profile_http(vanity_name, fields=fields) if http_client else None
+
+    checkout = None
+    if result is None:
+        started = time.perf_counter()
+        pooled = pool.checkout() if pool else None
+        checkout = time.perf_counter() - started
+        if pooled:
+            scraper.attach_driver(pooled.driver)
+        try:
+            result = scraper.scrape_profile(vanity_name, fields=fields)
+        finally:
+            if pooled:
+                pool.checkin(pooled, pages_loaded=scraper.pages_loaded)
+
+    timings = dict(scraper.timings)
+    if pool and checkout is not None:
+        timings["driver_checkout"] = checkout
+    return {"timings": timings, "network": scraper.network, "engine": scraper.engine,
+            "problems": validate(result, fields)}
+
+
+async def scrape_once_cdp(vanity_name: str, base_url: str, browser: CDPBrowser, fields: List[str] = None) -> Dict:
+    """Satu scrape terukur dengan engine cdp (lihat scrape_once)"""
+    scraper = AsyncLinkedInScraper(li_at_cookie="benchmark", browser=browser, base_url=base_url)
+    result = await scraper.scrape_profile(vanity_name, fields=fields)
+    return {"timings": dict(scraper.timings), "network": scraper.network, "engine": scraper.engine,
+            "problems": validate(result, fields)}
+
+
+def run_cdp(args, base_url: str, blocked_url_patterns: List[str], concurrency: int) -> Tuple[List[Dict], float, float]:
+    """
+    Jalankan semua run di satu CDPBrowser, maksimal concurrency bersamaan
+
+    Returns:
+        (runs, wall clock detik, waktu launch Chrome detik)
+    """
+    async def run():
+        browser = CDPBrowser(chrome_path=args.chrome_binary, max_tabs=concurrency,
+                             blocked_url_patterns=blocked_url_patterns)
+        warmup_started = time.perf_counter()
+        await browser.start()
+        warmup = time.perf_counter() - warmup_started
+
+        started = time.perf_counter()
+        try:
+            runs = await asyncio.gather(*(scrape_once_cdp(f"bench-{i}", base_url, browser, args.fields)
+                                          for i in range(args.runs)))
+        finally:
+            await browser.close()
+        return list(runs), time.perf_counter() - started, warmup
+
+    return asyncio.run(run())
+
+
+def run_sequential(args, base_url: str, blocked_url_patterns: List[str], http_client: VoyagerClient = None) -> Dict:
+    """Mode lama: browser baru per scrape, satu per satu"""
+    if args.engine == "cdp":
+        runs, wall, _ = run_cdp(args, base_url, blocked_url_patterns, concurrency=1)
+        return report("sequential", runs, wall, {})
+    started = time.perf_counter()
+    runs = [scrape_once(f"bench-{i}", base_url, args.extraction_mode, blocked_url_patterns,
+                        http_client=http_client, fields=args.fields)
+            for i in range(args.runs)]
+    return report("sequential", runs, time.perf_counter() - started, {})
+
+
+def run_pooled(args, base_url: str, blocked_url_patterns: List[str], http_client: VoyagerClient = None) -> Dict:
+    """Mode pool: driver warm di-share, scrape berjalan paralel"""
+    if args.engine == "cdp":
+        runs, wall, warmup = run_cdp(args, base_url, blocked_url_patterns, concurrency=args.concurrency)
+        return report("pooled", runs, wall, {
+            "concurrency": args.concurrency,
+            "pool_warmup_ms": round(warmup * 1000, 1)
+        })
+    pool = DriverPool(li_at_cookie="benchmark", size=args.concurrency, base_url=base_url,
+                      blocked_url_patterns=blocked_url_patterns)
+    warmup_started = time.perf_counter()
+    pool.start()
+    warmup = time.perf_counter() - warmup_started
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [
+                executor.submit(scrape_once, f"bench-{i}", base_url, args.extraction_mode,
+                                blocked_url_patterns, pool, http_client, args.fields)
+                for i in range(args.runs)
+            ]
+            runs = [future.result() for future in futures]
+    finally:
+        pool.shutdown()
+    return report("pooled", runs, time.perf_counter() - started, {
+        "concurrency": args.concurrency,
+        "pool_warmup_ms": round(warmup * 1000, 1)
+    })
+
+
+def report(mode: str, runs: List[Dict], wall: float, extra: Dict) -> Dict:
+    """Gabungkan hasil semua run satu mode menjadi satu laporan"""
+    problems = [problem for run in runs for problem in run["problems"]]
+    return {
+        "mode": mode,
+        "runs": len(runs),
+        "wall_clock_ms": round(wall * 1000, 1),
+        "throughput_per_min": round(len(runs) / wall * 60, 2) if wall else 0.0,
+        "validation_errors": problems,
+        "phases": summarize([run["timings"] for run in runs]),
+        "network": summarize_network([run["network"] for run in runs]),
+        "engines": {engine: sum(1 for run in runs if (run["engine"] or "none") == engine)
+                    for engine in sorted({run["engine"] or "none" for run in runs})},
+        **extra
+    }
+
+
+def print_report(result: Dict):
+    """Tampilkan tabel p50/p95 per fase"""
+    problems = result["validation_errors"]
+    blocking = "on" if result["resource_blocking"] else "off"
+    print(f"\n[BENCH] Mode: {result['mode']}, blocking {blocking} ({result['runs']} runs, "
+          f"wall {result['wall_clock_ms']}ms, {result['throughput_per_min']} profiles/min)")
+    print(f"{'phase':<26}{'p50_ms':>10}{'p95_ms':>10}{'mean_ms':>10}")
+    for phase, stats in result["phases"].items():
+        print(f"{phase:<26}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['mean_ms']:>10}")
+    network = result["network"]
+    if network:
+        print(f"[BENCH] Network: {network['requests_per_scrape']} request(s), "
+              f"{network['blocked_per_scrape']} blocked, {network['kib_per_scrape']} KiB per scrape")
+    if problems:
+        print(f"[BENCH] ⚠ {len(problems)} validation error(s): {problems[:5]}")
+
+
+def network_savings(results: List[Dict]) -> List[Dict]:
+    """Selisih request dan KiB per scrape antara blocking off dan on, per mode"""
+    savings = []
+    for mode in sorted({result["mode"] for result in results}):
+        by_blocking = {result["resource_blocking"]: result["network"] for result in results
+                       if result["mode"] == mode}
+        off, on = by_blocking.get(False), by_blocking.get(True)
+        if off and on:
+            savings.append({
+                "mode": mode,
+                "requests_saved_per_scrape": round(off["requests_per_scrape"] - on["requests_per_scrape"]
+                                                   + on["blocked_per_scrape"], 1),
+                "kib_saved_per_scrape": round(off["kib_per_scrape"] - on["kib_per_scrape"], 1),
+            })
+    return savings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline LinkedInScraper")
+    parser.add_argument("--runs", type=int, default=5, help="Jumlah scrape per mode")
+    parser.add_argument("--concurrency", type=int, default=2, help="Ukuran pool dan thread untuk mode pooled")
+    parser.add_argument("--mode", choices=["sequential", "pooled", "both"], default="both")
+    parser.add_argument("--extraction-mode", choices=["js", "webdriver"], default="js")
+    parser.add_argument("--engine", choices=["selenium", "http", "cdp"], default="selenium",
+                        help="http: fast path JSON dengan fallback Selenium, cdp: asyncio di satu Chrome")
+    parser.add_argument("--chrome-binary", help="Binary Chrome untuk --engine cdp (default: cari di PATH)")
+    parser.add_argument("--base-url", help="Pakai stand-in yang sudah berjalan (default: start sendiri)")
+    parser.add_argument("--lazy-delay-ms", type=int, default=300)
+    parser.add_argument("--resource-blocking", choices=["on", "off", "both"], default="on",
+                        help="Blok gambar/font/analytics via CDP (both: ukur penghematannya)")
+    parser.add_argument("--fields", type=parse_fields,
+                        help="Hanya extract field ini, dipisah koma (default: semua)")
+    parser.add_argument("--output", help="Tulis hasil JSON ke file ini")
+    parser.add_argument("--max-total-p95", type=float,
+                        help="Exit code 1 jika p95 total (detik) melebihi nilai ini di mode mana pun")
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        server, base_url = start_server(lazy_delay_ms=args.lazy_delay_ms)
+        print(f"[BENCH] Stand-in running at {base_url}")
+
+    http_client = None
+    if args.engine == "http":
+        http_client = VoyagerClient(li_at_cookie="benchmark", base_url=base_url, pool_size=args.concurrency)
+
+    # Log scraper sangat verbose; benchmark hanya butuh ringkasan
+    real_stdout = sys.stdout
+    results = []
+    try:
+        for mode, runner in (("sequential", run_sequential), ("pooled", run_pooled)):
+            if args.mode not in (mode, "both"):
+                continue
+            for blocking in (False, True):
+                if args.resource_blocking not in ("on" if blocking else "off", "both"):
+                    continue
+                patterns = DEFAULT_BLOCKED_URL_PATTERNS if blocking else []
+                sys.stdout = open(os.devnull, "w")
+                try:
+                    result = runner(args, base_url, patterns, http_client)
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = real_stdout
+                result["resource_blocking"] = blocking
+                results.append(result)
+    finally:
+        sys.stdout = real_stdout
+        if server:
+            server.shutdown()
+
+    for result in results:
+        print_report(result)
+
+    savings = network_savings(results)
+    for saving in savings:
+        print(f"[BENCH] Blocking saves {saving['requests_saved_per_scrape']} request(s) and "
+              f"{saving['kib_saved_per_scrape']} KiB per scrape ({saving['mode']})")
+
+    output = {
+        "engine": args.engine,
+        "extraction_mode": args.extraction_mode,
+        "fields": args.fields,
+        "base_url": base_url,
+        "results": results,
+        "network_savings": savings
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        print(f"[BENCH] Results written to {args.output}")
+
+    failed = any(result["validation_errors"] for result in results)
+    if args.max_total_p95 is not None:
+        for result in results:
+            p95 = result["phases"].get("total", {}).get("p95_ms", 0) / 1000
+            if p95 > args.max_total_p95:
+                print(f"[BENCH] ✗ {result['mode']} total p95 {p95:.2f}s > {args.max_total_p95}s")
+                failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,455 @@
+"""
+Load test offline endpoint /profile terhadap stand-in lokal
+
+Menjalankan service (uvicorn main:app) sebagai subprocess yang diarahkan ke
+stand-in LinkedIn, lalu membanjirinya dengan N client bersamaan (closed loop:
+setiap client langsung mengirim request berikutnya) untuk setiap level
+--concurrency. Campuran request diatur lewat --mix:
+
+    hit       profil "panas" yang sudah di-cache (di-warm sebelum load test)
+    distinct  profil baru yang belum pernah diminta (scrape penuh)
+    burst     --burst-size request berturut-turut untuk profil baru yang sama
+              (menguji single-flight)
+
+Per level dilaporkan throughput, latency p50/p95/p99 (total dan per jenis),
+rate error/429/503, X-Cache, serta puncak jumlah proses Chrome dan RSS
+(service + browser) yang di-sampling dengan psutil. Hasil ditulis sebagai
+JSON (--output) supaya bisa dibandingkan antar rilis lewat --baseline.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 10,50,200 --duration 30 --output load.json
+    python benchmarks/load_test.py --mix hit=0.8,distinct=0.1,burst=0.1 --burst-size 20
+    python benchmarks/load_test.py --service-env SCRAPE_ENGINE=cdp --service-env CDP_MAX_TABS=32
+    python benchmarks/load_test.py --target-url http://127.0.0.1:8000 --requests 500
+    python benchmarks/load_test.py --baseline load-v1.json --max-p95-ms 20000
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import psutil
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from browser_watchdog import BROWSER_PROCESS_NAMES, process_tree, tree_rss  # noqa: E402
+from bench_scraper import percentile  # noqa: E402
+from stand_in_server import start_server  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REQUEST_KINDS = ("hit", "distinct", "burst")
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Baca --mix (misal hit=0.6,distinct=0.3,burst=0.1) menjadi bobot ternormalisasi"""
+    weights = {}
+    for part in (part.strip() for part in value.split(",")):
+        if not part:
+            continue
+        kind, _, weight = part.partition("=")
+        if kind not in REQUEST_KINDS:
+            raise argparse.ArgumentTypeError(f"Jenis request tidak dikenal: {kind} (pilihan: {', '.join(REQUEST_KINDS)})")
+        weights[kind] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("--mix harus punya bobot > 0")
+    return {kind: weight / total for kind, weight in weights.items() if weight > 0}
+
+
+def parse_levels(value: str) -> List[int]:
+    """Baca --concurrency (misal 10,50,200)"""
+    return [int(level) for level in value.split(",") if level.strip()]
+
+
+class RequestPicker:
+    """Pilih vanity name berikutnya sesuai campuran --mix (thread-safe)"""
+
+    def __init__(self, mix: Dict[str, float], hot_profiles: List[str], burst_size: int, run_id: str, seed: int):
+        self.kinds = list(mix)
+        self.weights = [mix[kind] for kind in self.kinds]
+        self.hot_profiles = hot_profiles
+        self.burst_size = max(burst_size, 1)
+        self.run_id = run_id
+        self._random = random.Random(seed)
+        self._distinct = itertools.count()
+        self._burst_requests = itertools.count()
+        self._lock = threading.Lock()
+
+    def next(self):
+        with self._lock:
+            kind = self._random.choices(self.kinds, self.weights)[0]
+            if kind == "hit":
+                return kind, self._random.choice(self.hot_profiles)
+            if kind == "distinct":
+                return kind, f"load-{self.run_id}-{next(self._distinct)}"
+            # burst_size request burst berturut-turut memakai profil baru yang sama
+            return kind, f"burst-{self.run_id}-{next(self._burst_requests) // self.burst_size}"
+
+
+class ResourceSampler:
+    def __init__(self, service_pid: Optional[int], interval: float = 0.5):
+        """
+        Sampling jumlah proses Chrome dan RSS selama load test
+
+        Args:
+            service_pid: PID service (uvicorn); None = semua proses browser milik user ini
+            interval: Detik antar sampling
+        """
+        self.service_pid = service_pid
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self.reset()
+
+    def reset(self):
+        self.peak_chrome_processes = 0
+        self.peak_chrome_rss_bytes = 0
+        self.peak_service_rss_bytes = 0
+
+    def sample(self):
+        if self.service_pid:
+            processes = process_tree(self.service_pid)
+        else:
+            uid = os.getuid()
+            processes = [process for process in psutil.process_iter(["name", "uids"])
+                         if process.info["uids"] and process.info["uids"].real == uid]
+        browsers = []
+        for process in processes:
+            try:
+                name = process.name().lower()
+            except psutil.Error:
+                continue
+            if any(browser in name for browser in BROWSER_PROCESS_NAMES) and "chromedriver" not in name:
+                browsers.append(process)
+        self.peak_chrome_processes = max(self.peak_chrome_processes, len(browsers))
+        self.peak_chrome_rss_bytes = max(self.peak_chrome_rss_bytes, tree_rss(browsers))
+        if self.service_pid:
+            self.peak_service_rss_bytes = max(self.peak_service_rss_bytes, tree_rss(processes))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def peaks(self) -> Dict:
+        return {
+            "peak_chrome_processes": self.peak_chrome_processes,
+            "peak_chrome_rss_mb": round(self.peak_chrome_rss_bytes / (1024 * 1024), 1),
+            "peak_service_rss_mb": round(self.peak_service_rss_bytes / (1024 * 1024), 1) if self.service_pid else None
+        }
+
+
+def start_service(base_url: str, port: int, env_overrides: Dict[str, str], work_dir: str, log_path: Optional[str]):
+    """
+    Jalankan uvicorn main:app yang diarahkan ke stand-in
+
+    Cache, snapshot dan job queue SQLite ditulis ke work_dir supaya setiap
+    load test mulai dari cache kosong.
+    """
+    env = dict(os.environ)
+    env.update({
+        "LINKEDIN_BASE_URL": base_url,
+        "LINKEDIN_LI_AT": "loadtest",
+        "LINKEDIN_LI_AT_LIST": "",
+        "GEMINI_API_KEY": "",
+        "PYTHONPATH": REPO_ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+    })
+    env.update(env_overrides)
+    log = open(log_path, "w") if log_path else subprocess.DEVNULL
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=work_dir, env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+
+
+def wait_ready(target_url: str, process: Optional[subprocess.Popen], timeout: float):
+    """Tunggu /health merespon (startup service me-warm driver pool dan cek session)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"[LOAD] Service berhenti saat startup (exit code {process.returncode})")
+        try:
+            if requests.get(f"{target_url}/health", timeout=5).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise SystemExit(f"[LOAD] Service tidak siap dalam {timeout}s")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def fetch(session: requests.Session, target_url: str, kind: str, vanity_name: str, timeout: float) -> Dict:
+    """Satu GET /profile; status 0 untuk error koneksi/timeout"""
+    started = time.perf_counter()
+    try:
+        response = session.get(f"{target_url}/profile", params={"vanity_name": vanity_name}, timeout=timeout)
+        status, cache = response.status_code, response.headers.get("X-Cache", "NONE")
+    except requests.RequestException:
+        status, cache = 0, "NONE"
+    return {"kind": kind, "status": status, "cache": cache, "latency": time.perf_counter() - started}
+
+
+def warm_hot_profiles(target_url: str, hot_profiles: List[str], timeout: float) -> List[str]:
+    """Scrape profil panas sekali supaya request "hit" benar-benar dilayani cache"""
+    problems = []
+    with requests.Session() as session:
+        for vanity_name in hot_profiles:
+            result = fetch(session, target_url, "hit", vanity_name, timeout)
+            if result["status"] != 200:
+                problems.append(f"{vanity_name}: HTTP {result['status']}")
+    return problems
+
+
+def run_level(target_url: str, concurrency: int, picker: RequestPicker, duration: float,
+              total_requests: Optional[int], timeout: float) -> Dict:
+    """Jalankan satu level concurrency; berhenti setelah duration detik atau total_requests request"""
+    results = []
+    results_lock = threading.Lock()
+    budget = itertools.count()
+    deadline = time.monotonic() + duration
+
+    def client():
+        with requests.Session() as session:
+            while True:
+                if total_requests is not None:
+                    if next(budget) >= total_requests:
+                        return
+                elif time.monotonic() >= deadline:
+                    return
+                kind, vanity_name = picker.next()
+                result = fetch(session, target_url, kind, vanity_name, timeout)
+                with results_lock:
+                    results.append(result)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(client) for _ in range(concurrency)]:
+            future.result()
+    return summarize_level(concurrency, results, time.perf_counter() - started)
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies, default=0) * 1000, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0
+    }
+
+
+def summarize_level(concurrency: int, results: List[Dict], wall: float) -> Dict:
+    """Ringkas hasil satu level concurrency"""
+    total = len(results)
+
+    def rate(predicate) -> float:
+        return round(sum(1 for result in results if predicate(result["status"])) / total, 4) if total else 0.0
+
+    statuses, caches = {}, {}
+    for result in results:
+        statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+        caches[result["cache"]] = caches.get(result["cache"], 0) + 1
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "wall_clock_s": round(wall, 2),
+        "throughput_rps": round(total / wall, 2) if wall else 0.0,
+        "ok_throughput_rps": round(statuses.get("200", 0) / wall, 2) if wall else 0.0,
+        "latency": latency_stats([result["latency"] for result in results]),
+        "latency_by_kind": {
+            kind: latency_stats([result["latency"] for result in results if result["kind"] == kind])
+            for kind in REQUEST_KINDS if any(result["kind"] == kind for result in results)
+        },
+        "error_rate": rate(lambda status: status != 200),
+        "rate_429": rate(lambda status: status == 429),
+        "rate_503": rate(lambda status: status == 503),
+        "connection_errors": statuses.get("0", 0),
+        "status": dict(sorted(statuses.items())),
+        "cache": dict(sorted(caches.items()))
+    }
+
+
+def print_level(level: Dict):
+    latency = level["latency"]
+    resources = level["resources"]
+    print(f"\n[LOAD] Concurrency {level['concurrency']}: {level['requests']} request(s) in "
+          f"{level['wall_clock_s']}s, {level['throughput_rps']} req/s ({level['ok_throughput_rps']} ok/s)")
+    print(f"{'kind':<12}{'count':>8}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}")
+    for kind, stats in [("all", latency)] + list(level["latency_by_kind"].items()):
+        print(f"{kind:<12}{stats['count']:>8}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+    print(f"[LOAD] Errors {level['error_rate']:.1%} (429 {level['rate_429']:.1%}, 503 {level['rate_503']:.1%}, "
+          f"connection {level['connection_errors']}), status {level['status']}, cache {level['cache']}")
+    print(f"[LOAD] Peak Chrome processes {resources['peak_chrome_processes']}, Chrome RSS "
+          f"{resources['peak_chrome_rss_mb']} MB, service RSS {resources['peak_service_rss_mb']} MB")
+
+
+def compare_with_baseline(levels: List[Dict], baseline_path: str) -> List[Dict]:
+    """Selisih throughput dan latency terhadap hasil load test sebelumnya, per level concurrency"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {level["concurrency"]: level for level in json.load(f)["levels"]}
+
+    def delta(new: float, old: float) -> Optional[float]:
+        return round((new - old) / old * 100, 1) if old else None
+
+    comparisons = []
+    for level in levels:
+        old = baseline.get(level["concurrency"])
+        if old is None:
+            continue
+        comparisons.append({
+            "concurrency": level["concurrency"],
+            "throughput_rps_delta_pct": delta(level["throughput_rps"], old["throughput_rps"]),
+            "p95_ms_delta_pct": delta(level["latency"]["p95_ms"], old["latency"]["p95_ms"]),
+            "p99_ms_delta_pct": delta(level["latency"]["p99_ms"], old["latency"]["p99_ms"]),
+            "error_rate_delta": round(level["error_rate"] - old["error_rate"], 4),
+            "peak_chrome_rss_mb_delta": round(level["resources"]["peak_chrome_rss_mb"]
+                                              - old["resources"]["peak_chrome_rss_mb"], 1)
+        })
+    return comparisons
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test offline endpoint /profile")
+    parser.add_argument("--concurrency", type=parse_levels, default=[10, 50, 200],
+                        help="Level jumlah client bersamaan, dipisah koma (default: 10,50,200)")
+    parser.add_argument("--duration", type=float, default=30, help="Detik per level concurrency")
+    parser.add_argument("--requests", type=int, help="Jumlah request per level (menggantikan --duration)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("hit=0.6,distinct=0.3,burst=0.1"),
+                        help="Bobot jenis request hit/distinct/burst (default: hit=0.6,distinct=0.3,burst=0.1)")
+    parser.add_argument("--hot-profiles", type=int, default=20, help="Jumlah profil panas untuk request hit")
+    parser.add_argument("--burst-size", type=int, default=10, help="Request per profil untuk request burst")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout per request (detik)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--target-url", help="Pakai service yang sudah berjalan (default: start sendiri)")
+    parser.add_argument("--base-url", help="Pakai stand-in yang sudah berjalan (default: start sendiri)")
+    parser.add_argument("--lazy-delay-ms", type=int, default=300)
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay tambahan per response stand-in")
+    parser.add_argument("--service-env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Env tambahan untuk service (misal SCRAPE_ENGINE=cdp), bisa berulang")
+    parser.add_argument("--service-log", help="Tulis stdout/stderr service ke file ini")
+    parser.add_argument("--startup-timeout", type=float, default=180)
+    parser.add_argument("--output", help="Tulis hasil JSON ke file ini")
+    parser.add_argument("--baseline", help="Bandingkan dengan hasil JSON load test sebelumnya")
+    parser.add_argument("--max-p95-ms", type=float,
+                        help="Exit code 1 jika p95 latency (ms) melebihi nilai ini di level mana pun")
+    args = parser.parse_args()
+    env_overrides = dict(item.split("=", 1) for item in args.service_env)
+
+    server = service = None
+    work_dir = tempfile.mkdtemp(prefix="load-test-")
+    base_url = args.base_url
+    target_url = args.target_url
+    try:
+        if not target_url:
+            if not base_url:
+                server, base_url = start_server(lazy_delay_ms=args.lazy_delay_ms, latency_ms=args.latency_ms)
+                print(f"[LOAD] Stand-in running at {base_url}")
+            port = free_port()
+            target_url = f"http://127.0.0.1:{port}"
+            service = start_service(base_url, port, env_overrides, work_dir, args.service_log)
+            print(f"[LOAD] Starting service at {target_url} (pid {service.pid})...")
+        wait_ready(target_url, service, args.startup_timeout)
+
+        run_id = uuid.uuid4().hex[:8]
+        hot_profiles = [f"hot-{run_id}-{i}" for i in range(max(args.hot_profiles, 1))]
+        if "hit" in args.mix:
+            print(f"[LOAD] Warming {len(hot_profiles)} hot profile(s)...")
+            problems = warm_hot_profiles(target_url, hot_profiles, args.timeout)
+            if problems:
+                print(f"[LOAD] ⚠ {len(problems)} hot profile(s) gagal di-warm: {problems[:5]}")
+
+        sampler = ResourceSampler(service.pid if service else None)
+        sampler.start()
+        levels = []
+        try:
+            for concurrency in args.concurrency:
+                picker = RequestPicker(args.mix, hot_profiles, args.burst_size, f"{run_id}-c{concurrency}",
+                                       args.seed)
+                sampler.reset()
+                level = run_level(target_url, concurrency, picker, args.duration, args.requests, args.timeout)
+                sampler.sample()
+                level["resources"] = sampler.peaks()
+                levels.append(level)
+                print_level(level)
+        finally:
+            sampler.stop()
+    finally:
+        if service is not None:
+            service.terminate()
+            try:
+                service.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                service.kill()
+        if server:
+            server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = {
+        "timestamp": time.time(),
+        "git_revision": git_revision(),
+        "target_url": args.target_url,
+        "service_env": env_overrides,
+        "mix": args.mix,
+        "hot_profiles": len(hot_profiles),
+        "burst_size": args.burst_size,
+        "duration_s": None if args.requests else args.duration,
+        "requests_per_level": args.requests,
+        "levels": levels
+    }
+    if args.baseline:
+        output["baseline"] = args.baseline
+        output["comparison"] = compare_with_baseline(levels, args.baseline)
+        for comparison in output["comparison"]:
+            print(f"[LOAD] vs baseline @ {comparison['concurrency']}: throughput "
+                  f"{comparison['throughput_rps_delta_pct']}%, p95 {comparison['p95_ms_delta_pct']}%, "
+                  f"p99 {comparison['p99_ms_delta_pct']}%, error rate {comparison['error_rate_delta']:+.2%}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, indent=2, ensure_ascii=False)
+        print(f"[LOAD] Results written to {args.output}")
+
+    if args.max_p95_ms is not None:
+        slow = [level for level in levels if level["latency"]["p95_ms"] > args.max_p95_ms]
+        if slow:
+            print(f"[LOAD] ✗ p95 melebihi {args.max_p95_ms}ms di concurrency "
+                  f"{[level['concurrency'] for level in slow]}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Stand-in LinkedIn lokal untuk benchmark offline
+
+Menyajikan rekaman halaman profil dan halaman skills dari benchmarks/fixtures
+supaya LinkedInScraper bisa diukur tanpa akun dan tanpa jaringan. Rekaman
+response JSON Voyager (profileView, skills) disajikan untuk engine HTTP
+(voyager_client.VoyagerClient). Vanity name berawalan "missing-" meniru profil
+yang tidak ada: halaman diarahkan ke /404/ dan profileView menjawab 404.
+
+Usage:
+    python benchmarks/stand_in_server.py --port 8765
+    LINKEDIN_BASE_URL=http://127.0.0.1:8765 uvicorn main:app
+"""
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+HOME_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>LinkedIn</title></head>
+<body><main id="feed">LinkedIn stand-in</main></body></html>
+"""
+
+AUTHWALL_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Sign Up | LinkedIn</title></head>
+<body><main id="authwall">Join LinkedIn</main></body></html>
+"""
+
+NOT_FOUND_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Page not found | LinkedIn</title></head>
+<body><main id="not-found">This page doesn't exist</main></body></html>
+"""
+MISSING_PREFIX = "missing-"
+
+PROFILE_PATH = re.compile(r"^/in/(?P<vanity>[^/]+)/?$")
+STATIC_PATH = re.compile(r"^/static/[\w.-]+\.(?P<ext>png|jpg|woff2)$")
+
+# Ukuran dan content type aset dummy /static/* (meniru foto profil, banner, font)
+STATIC_ASSETS = {
+    "png": (120 * 1024, "image/png"),
+    "jpg": (250 * 1024, "image/jpeg"),
+    "woff2": (60 * 1024, "font/woff2"),
+}
+SKILLS_PATH = re.compile(r"^/in/(?P<vanity>[^/]+)/details/skills/?$")
+VOYAGER_PROFILE_PATH = re.compile(r"^/voyager/api/identity/profiles/(?P<vanity>[^/]+)/profileView$")
+VOYAGER_SKILLS_PATH = re.compile(r"^/voyager/api/identity/profiles/(?P<vanity>[^/]+)/skills$")
+
+# JSESSIONID yang diset stand-in; Voyager mewajibkan header csrf-token yang sama
+JSESSIONID = "ajax:4242424242424242424"
+
+
+def load_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    # Diisi oleh make_handler
+    lazy_delay_ms = 300
+    latency_ms = 0
+    fixtures = {}
+
+    def _send(self, status: int, body, content_type: str = "text/html; charset=utf-8"):
+        payload = body.encode("utf-8") if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _cookies(self) -> dict:
+        cookie = SimpleCookie()
+        cookie.load(self.headers.get("Cookie") or "")
+        return {name: morsel.value for name, morsel in cookie.items()}
+
+    def _send_voyager(self, path: str, query: dict):
+        """Endpoint JSON Voyager: wajib csrf-token == JSESSIONID"""
+        jsessionid = self._cookies().get("JSESSIONID", "").strip('"')
+        if not jsessionid or self.headers.get("csrf-token") != jsessionid:
+            return self._send(403, json.dumps({"status": 403, "message": "CSRF check failed"}), "application/json")
+
+        match = VOYAGER_PROFILE_PATH.match(path)
+        if match and match.group("vanity").startswith(MISSING_PREFIX):
+            return self._send(404, json.dumps({"status": 404}), "application/json")
+        if match:
+            body = self.fixtures["profile_view"].replace("{{vanity_name}}", match.group("vanity"))
+            return self._send(200, body, "application/json")
+
+        match = VOYAGER_SKILLS_PATH.match(path)
+        if match:
+            skills = json.loads(self.fixtures["skills_json"])
+            start = int(query.get("start", ["0"])[0])
+            count = int(query.get("count", ["100"])[0])
+            skills["elements"] = skills["elements"][start:start + count]
+            skills["paging"].update({"start": start, "count": count})
+            return self._send(200, json.dumps(skills), "application/json")
+
+        return self._send(404, json.dumps({"status": 404}), "application/json")
+
+    def do_GET(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        path, _, query_string = self.path.partition("?")
+
+        if path.startswith("/authwall"):
+            return self._send(200, AUTHWALL_HTML)
+        if path.startswith("/404"):
+            return self._send(404, NOT_FOUND_HTML)
+
+        # Seperti LinkedIn: tanpa cookie li_at semua halaman diarahkan ke authwall
+        if not STATIC_PATH.match(path) and "li_at=" not in (self.headers.get("Cookie") or ""):
+            self.send_response(302)
+            self.send_header("Location", "/authwall")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if path.startswith("/voyager/api/"):
+            return self._send_voyager(path, parse_qs(query_string))
+
+        if path in ("/", "/feed", "/feed/"):
+            payload = HOME_HTML.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Set-Cookie", f'JSESSIONID="{JSESSIONID}"; Path=/')
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        match = STATIC_PATH.match(path)
+        if match:
+            size, content_type = STATIC_ASSETS[match.group("ext")]
+            return self._send(200, b"\0" * size, content_type)
+
+        match = SKILLS_PATH.match(path)
+        if match:
+            body = self.fixtures["skills"]
+            body = body.replace("{{vanity_name}}", match.group("vanity"))
+            body = body.replace("{{lazy_delay_ms}}", str(self.lazy_delay_ms))
+            return self._send(200, body)
+
+        match = PROFILE_PATH.match(path)
+        if match and match.group("vanity").startswith(MISSING_PREFIX):
+            self.send_response(302)
+            self.send_header("Location", "/404/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if match:
+            body = self.fixtures["profile"]
+            body = body.replace("{{vanity_name}}", match.group("vanity"))
+            body = body.replace("{{lazy_delay_ms}}", str(self.lazy_delay_ms))
+            return self._send(200, body)
+
+        return self._send(404, "Not found", "text/plain; charset=utf-8")
+
+    def log_message(self, format, *args):
+        # Jangan banjiri output benchmark dengan access log
+        pass
+
+
+def make_handler(lazy_delay_ms: int = 300, latency_ms: int = 0):
+    """Buat handler class dengan konfigurasi dan fixture yang sudah di-load"""
+    return type("ConfiguredStandInHandler", (StandInHandler,), {
+        "lazy_delay_ms": lazy_delay_ms,
+        "latency_ms": latency_ms,
+        "fixtures": {
+            "profile": load_fixture("profile.html"),
+            "skills": load_fixture("skills.html"),
+            "profile_view": load_fixture("profile_view.json"),
+            "skills_json": load_fixture("skills.json"),
+        },
+    })
+
+
+def start_server(port: int = 0, lazy_delay_ms: int = 300, latency_ms: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Jalankan stand-in di background thread
+
+    Returns:
+        (server, base_url); panggil server.shutdown() untuk berhenti
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(lazy_delay_ms, latency_ms))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LinkedIn stand-in lokal untuk benchmark")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--lazy-delay-ms", type=int, default=300,
+                        help="Delay sebelum section lazy muncul setelah scroll pertama")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Delay tambahan per response")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.lazy_delay_ms, args.latency_ms))
+    print(f"[STAND-IN] Serving on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+# Proses yang dianggap milik browser otomatisasi (Chrome, Chromium, chromedriver, headless shell)
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "chromedriver", "headless_shell")
+# Flag yang hanya dipakai Chrome yang dikendalikan chromedriver/CDP, bukan Chrome milik user
+AUTOMATION_FLAGS = ("--remote-debugging-port", "--remote-debugging-pipe")
+
+MB = 1024 * 1024
+
+# PID root (chromedriver, atau Chrome untuk engine cdp) yang masih dipakai proses ini;
+# proses browser di luar tree ini dianggap yatim oleh BrowserWatchdog.kill_orphans
+_tracked_lock = threading.Lock()
+_tracked_pids = set()
+
+
+def track_process(pid: Optional[int]):
+    """Tandai tree proses pid sebagai browser yang masih dipakai"""
+    if pid:
+        with _tracked_lock:
+            _tracked_pids.add(pid)
+
+
+def untrack_process(pid: Optional[int]):
+    with _tracked_lock:
+        _tracked_pids.discard(pid)
+
+
+def process_tree(pid: Optional[int]) -> List[psutil.Process]:
+    """Proses pid beserta semua turunannya ([] jika sudah tidak ada)"""
+    if not pid:
+        return []
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def tree_rss(processes: List[psutil.Process]) -> int:
+    """Total RSS (byte) sekumpulan proses; proses yang sudah berhenti dilewati"""
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def driver_pid(driver) -> Optional[int]:
+    """PID chromedriver milik WebDriver Selenium"""
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def js_heap_used(driver) -> Optional[int]:
+    """JS heap terpakai (byte) tab aktif lewat CDP Runtime.getHeapUsage"""
+    try:
+        return int(driver.execute_cdp_cmd("Runtime.getHeapUsage", {})["usedSize"])
+    except Exception:
+        return None
+
+
+def kill_processes(processes: List[psutil.Process], timeout: float = 3.0) -> int:
+    """
+    Terminate (lalu kill jika perlu) proses yang masih hidup
+
+    Returns:
+        Jumlah proses yang harus dimatikan
+    """
+    alive = []
+    for process in processes:
+        try:
+            # is_running membandingkan create_time, jadi PID yang sudah dipakai ulang tidak ikut
+            if process.is_running() and process.status() != psutil.STATUS_ZOMBIE:
+                process.terminate()
+                alive.append(process)
+        except psutil.Error:
+            pass
+    _, still_alive = psutil.wait_procs(alive, timeout=timeout)
+    for process in still_alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+    return len(alive)
+
+
+def quit_driver(driver) -> int:
+    """
+    driver.quit() lalu matikan chromedriver/Chrome yang tertinggal (quit gagal
+    atau Chrome tidak ikut berhenti)
+
+    Returns:
+        Jumlah proses yatim yang dimatikan
+    """
+    pid = driver_pid(driver)
+    processes = process_tree(pid)
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"[WATCHDOG] ⚠ driver.quit() gagal: {str(e)}")
+    finally:
+        untrack_process(pid)
+    killed = kill_processes(processes)
+    if killed:
+        print(f"[WATCHDOG] Killed {killed} leftover browser process(es) after quit")
+    return killed
+
+
+def _is_automation_browser(info: Dict) -> bool:
+    name = (info.get("name") or "").lower()
+    if not any(browser in name for browser in BROWSER_PROCESS_NAMES):
+        return False
+    if "chromedriver" in name:
+        return True
+    cmdline = info.get("cmdline") or []
+    return any(arg.startswith(flag) for arg in cmdline for flag in AUTOMATION_FLAGS)
+
+
+class BrowserWatchdog:
+    def __init__(self, max_rss_mb: float = 0, max_js_heap_mb: float = 0, interval: float = 30.0,
+                 kill_orphans: bool = True, orphan_grace: float = 60.0):
+        """
+        Awasi memori browser dan bersihkan proses Chrome yatim
+
+        Setiap interval detik, semua target yang didaftarkan lewat watch()
+        (DriverPool, CDPBrowser) diminta mengukur RSS tree prosesnya
+        (sample_memory) dan browser yang melewati batas ditandai untuk
+        di-retire. Proses chromedriver/Chrome otomatisasi yang tidak lagi
+        dimiliki driver mana pun (lihat track_process) dimatikan.
+
+        Args:
+            max_rss_mb: Batas RSS satu tree chromedriver + Chrome (0 = tanpa batas)
+            max_js_heap_mb: Batas JS heap terpakai satu tab (0 = tanpa batas)
+            interval: Detik antar sampling
+            kill_orphans: Matikan proses browser yatim setiap sampling
+            orphan_grace: Detik sejak proses pertama kali terlihat yatim sebelum
+                dimatikan, supaya browser yang baru di-launch dan belum di-track tidak ikut
+        """
+        self.max_rss_bytes = int(max_rss_mb * MB)
+        self.max_js_heap_bytes = int(max_js_heap_mb * MB)
+        self.interval = interval
+        self.kill_orphans_enabled = kill_orphans
+        self.orphan_grace = orphan_grace
+
+        self._targets = []
+        self._stop = threading.Event()
+        self._thread = None
+        # create_time psutil dihitung dari boot time, jadi dibandingkan dengan
+        # create_time proses ini (bukan time.time()) supaya clock-nya sama
+        self._started_at = psutil.Process().create_time()
+        # {(pid, create_time): time.monotonic() saat pertama terlihat yatim}
+        self._suspects = {}
+
+        self.total_samples = 0
+        self.total_orphans_killed = 0
+        self.last_sample_at = None
+
+    def watch(self, target):
+        """Daftarkan target dengan method sample_memory() (misal DriverPool, CDPBrowser)"""
+        self._targets.append(target)
+
+    def retire_reason(self, rss_bytes: Optional[int] = None, js_heap_bytes: Optional[int] = None) -> Optional[str]:
+        """Alasan browser harus di-retire ("rss" atau "js_heap"), atau None jika masih di bawah batas"""
+        if self.max_rss_bytes and rss_bytes and rss_bytes > self.max_rss_bytes:
+            return "rss"
+        if self.max_js_heap_bytes and js_heap_bytes and js_heap_bytes > self.max_js_heap_bytes:
+            return "js_heap"
+        return None
+
+    def kill_orphans(self) -> int:
+        """
+        Matikan chromedriver/Chrome otomatisasi milik user yang sama yang
+        induknya sudah hilang (di-reparent ke init atau ke proses ini) dan
+        tidak di-track oleh driver mana pun
+
+        Returns:
+            Jumlah proses yang dimatikan
+        """
+        with _tracked_lock:
+            tracked = set(_tracked_pids)
+        live = {process.pid for pid in tracked for process in process_tree(pid)}
+        own_pid, uid = os.getpid(), os.getuid()
+        now = time.monotonic()
+
+        suspects, orphans = {}, []
+        for process in psutil.process_iter(["pid", "ppid", "name", "cmdline", "uids", "create_time"]):
+            info = process.info
+            if info["pid"] in live or info["ppid"] not in (1, own_pid):
+                continue
+            if not info.get("uids") or info["uids"].real != uid:
+                continue
+            # Hanya browser yang di-launch setelah service start
+            if (info.get("create_time") or 0) < self._started_at or not _is_automation_browser(info):
+                continue
+            key = (info["pid"], info["create_time"])
+            suspects[key] = self._suspects.get(key, now)
+            if now - suspects[key] >= self.orphan_grace:
+                orphans.extend(process_tree(info["pid"]))
+        self._suspects = suspects
+
+        killed = kill_processes(orphans) if orphans else 0
+        if killed:
+            self.total_orphans_killed += killed
+            print(f"[WATCHDOG] Killed {killed} orphaned browser process(es)")
+        return killed
+
+    def sample(self):
+        """Satu putaran: ukur memori semua target lalu bersihkan proses yatim"""
+        for target in self._targets:
+            try:
+                target.sample_memory()
+            except Exception as e:
+                print(f"[WATCHDOG] ⚠ Sampling gagal: {str(e)}")
+        if self.kill_orphans_enabled:
+            try:
+                self.kill_orphans()
+            except Exception as e:
+                print(f"[WATCHDOG] ⚠ Orphan sweep gagal: {str(e)}")
+        self.total_samples += 1
+        self.last_sample_at = time.time()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        if self._thread is None and self.interval > 0:
+            self._thread = threading.Thread(target=self._run, name="browser-watchdog", daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self) -> Dict:
+        """Statistik watchdog untuk health endpoint"""
+        return {
+            "max_rss_mb": round(self.max_rss_bytes / MB, 1),
+            "max_js_heap_mb": round(self.max_js_heap_bytes / MB, 1),
+            "interval_seconds": self.interval,
+            "tracked_browsers": len(_tracked_pids),
+            "total_samples": self.total_samples,
+            "total_orphans_killed": self.total_orphans_killed,
+            "last_sample_at": self.last_sample_at
+        }
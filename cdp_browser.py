@@ -0,0 +1,532 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+import websockets
+
+from browser_watchdog import kill_processes, process_tree, track_process, tree_rss, untrack_process
+from resource_blocking import DEFAULT_BLOCKED_URL_PATTERNS
+
+# Binary yang dicari di PATH jika chrome_path tidak diisi
+CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+# Sama dengan build_chrome_options, ditambah flag supaya tab yang tidak aktif
+# tidak di-throttle (semua tab di-scroll dan di-extract bersamaan)
+CHROME_ARGS = [
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-plugins",
+    "--disable-extensions",
+    "--log-level=3",
+    "--silent",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+
+
+class CDPError(Exception):
+    """Command CDP gagal, timeout, atau koneksi ke browser terputus"""
+
+
+def find_chrome(chrome_path: Optional[str] = None) -> str:
+    """Path binary Chrome: chrome_path jika diisi, atau CHROME_CANDIDATES pertama di PATH"""
+    if chrome_path:
+        return chrome_path
+    for name in CHROME_CANDIDATES:
+        found = shutil.which(name)
+        if found:
+            return found
+    raise CDPError(f"Chrome tidak ditemukan (isi chrome_path atau install salah satu dari {CHROME_CANDIDATES})")
+
+
+def wrap_script(script: str, args: List, is_async: bool = False) -> str:
+    """
+    Bungkus script gaya execute_script (arguments[n], return) menjadi
+    expression Runtime.evaluate; script async (execute_async_script)
+    menerima callback sebagai argumen terakhir dan menjadi Promise
+    """
+    args_json = json.dumps(args, ensure_ascii=False)
+    if is_async:
+        return (f"new Promise((resolve) => {{ (function() {{\n{script}\n}})"
+                f".apply(null, {args_json}.concat([resolve])); }})")
+    return f"(function() {{\n{script}\n}}).apply(null, {args_json})"
+
+
+class CDPPage:
+    """Satu tab (target CDP) yang di-attach lewat session flatten"""
+
+    def __init__(self, browser: "CDPBrowser", target_id: str, session_id: str):
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+        self.pages_loaded = 0
+        # Sama dengan resource_blocking.collect_network_stats, dihitung dari event Network.*
+        self.network = {"requests": 0, "blocked": 0, "bytes": 0, "blocked_by_type": {}}
+        self.crashed = False
+
+    async def send(self, method: str, params: Optional[Dict] = None, timeout: Optional[float] = None) -> Dict:
+        return await self.browser.send(method, params, session_id=self.session_id, timeout=timeout)
+
+    def _on_event(self, method: str, params: Dict):
+        if method == "Network.requestWillBeSent":
+            self.network["requests"] += 1
+        elif method == "Network.loadingFinished":
+            self.network["bytes"] += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            self.network["blocked"] += 1
+            resource_type = params.get("type") or "Other"
+            blocked_by_type = self.network["blocked_by_type"]
+            blocked_by_type[resource_type] = blocked_by_type.get(resource_type, 0) + 1
+        elif method == "Inspector.targetCrashed":
+            self.crashed = True
+
+    async def navigate(self, url: str):
+        """Mulai load url; selesai begitu navigasi commit (response pertama diterima)"""
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise CDPError(f"Navigasi ke {url} gagal: {result['errorText']}")
+        self.pages_loaded += 1
+
+    async def evaluate(self, script: str, *args, timeout: Optional[float] = None):
+        """Jalankan script gaya execute_script di tab ini dan kembalikan hasilnya"""
+        return await self._evaluate(wrap_script(script, list(args)), timeout)
+
+    async def evaluate_async(self, script: str, *args, timeout: Optional[float] = None):
+        """Jalankan script gaya execute_async_script (callback = argumen terakhir)"""
+        return await self._evaluate(wrap_script(script, list(args), is_async=True), timeout)
+
+    async def _evaluate(self, expression: str, timeout: Optional[float]):
+        result = await self.send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": True,
+            "awaitPromise": True
+        }, timeout=timeout)
+        if result.get("exceptionDetails"):
+            details = result["exceptionDetails"]
+            message = (details.get("exception") or {}).get("description") or details.get("text")
+            raise CDPError(f"Script error: {message}")
+        return result.get("result", {}).get("value")
+
+    async def wait_for(self, condition: str, timeout: float, interval: float = 0.1) -> bool:
+        """
+        Poll expression JS condition sampai truthy (pengganti WebDriverWait)
+
+        Returns:
+            False jika timeout habis
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if await self._evaluate(f"!!({condition})", timeout=max(deadline - time.monotonic(), 1)):
+                    return True
+            except CDPError:
+                # Dokumen sedang berganti (navigasi) atau belum siap
+                if self.crashed:
+                    raise
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+
+    async def wait_loaded(self, timeout: float) -> bool:
+        """
+        Tunggu load event dokumen (seperti driver.get); Page.navigate sudah
+        selesai saat navigasi commit, sebelum script halaman berjalan
+        """
+        return await self.wait_for("document.readyState === 'complete'", timeout)
+
+    async def url(self) -> str:
+        return await self.evaluate("return location.href;")
+
+    async def content(self) -> str:
+        """HTML DOM saat ini (pengganti driver.page_source)"""
+        return await self.evaluate("return document.documentElement.outerHTML;")
+
+
+class CDPContext:
+    """Browser context (profil incognito) milik satu scrape: cookie terisolasi dari scrape lain"""
+
+    def __init__(self, browser: "CDPBrowser", context_id: str, li_at_cookie: Optional[Dict],
+                 blocked_url_patterns: List[str]):
+        self.browser = browser
+        self.context_id = context_id
+        self.li_at_cookie = li_at_cookie
+        self.blocked_url_patterns = blocked_url_patterns
+        self.pages: List[CDPPage] = []
+
+    async def new_page(self) -> CDPPage:
+        """Buka tab kosong di context ini dengan resource blocking dan cookie li_at terpasang"""
+        target = await self.browser.send("Target.createTarget", {
+            "url": "about:blank", "browserContextId": self.context_id
+        })
+        attached = await self.browser.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True})
+        page = CDPPage(self.browser, target["targetId"], attached["sessionId"])
+        self.browser._sessions[page.session_id] = page
+        self.pages.append(page)
+
+        # Fokus diemulasikan supaya tab di belakang tetap menjalankan timer dan lazy loading
+        await asyncio.gather(
+            page.send("Inspector.enable"),
+            page.send("Network.enable"),
+            page.send("Emulation.setFocusEmulationEnabled", {"enabled": True})
+        )
+        if self.blocked_url_patterns:
+            await page.send("Network.setBlockedURLs", {"urls": self.blocked_url_patterns})
+        if self.li_at_cookie and len(self.pages) == 1:
+            # Cookie disimpan per browser context: cukup dipasang sekali
+            await page.send("Network.setCookie", self.li_at_cookie)
+        return page
+
+    def network_stats(self) -> Dict:
+        """Gabungan statistik network semua tab di context ini"""
+        stats = {"requests": 0, "blocked": 0, "bytes": 0, "blocked_by_type": {}}
+        for page in self.pages:
+            for key in ("requests", "blocked", "bytes"):
+                stats[key] += page.network[key]
+            for resource_type, count in page.network["blocked_by_type"].items():
+                stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + count
+        return stats
+
+
+class CDPBrowser:
+    def __init__(self, chrome_path: Optional[str] = None, max_tabs: int = 16, max_pages: int = 500,
+                 blocked_url_patterns: Optional[List[str]] = None, command_timeout: float = 30.0,
+                 launch_timeout: float = 20.0, watchdog=None):
+        """
+        Satu proses Chrome yang dikendalikan langsung lewat CDP (websocket,
+        asyncio) dan dipakai bersama oleh banyak scrape: setiap scrape
+        mendapat browser context sendiri (cookie terisolasi, jadi akun
+        berbeda bisa berjalan bersamaan) dengan satu atau beberapa tab.
+
+        Args:
+            chrome_path: Binary Chrome (default: dicari di PATH, lihat CHROME_CANDIDATES)
+            max_tabs: Jumlah context (scrape) yang boleh terbuka bersamaan
+            max_pages: Chrome di-restart setelah memuat sebanyak ini halaman,
+                saat tidak ada scrape yang berjalan
+            blocked_url_patterns: Pola URL yang diblok di setiap tab
+                (None: DEFAULT_BLOCKED_URL_PATTERNS, []: tanpa blocking)
+            command_timeout: Detik maksimal menunggu balasan satu command CDP
+            launch_timeout: Detik maksimal menunggu Chrome siap menerima koneksi
+            watchdog: BrowserWatchdog; Chrome yang RSS-nya, atau JS heap tab
+                yang tersisa setelah semua context ditutup, melewati batas
+                di-recycle seperti max_pages
+        """
+        self.chrome_path = chrome_path
+        self.max_tabs = max_tabs
+        self.max_pages = max_pages
+        self.blocked_url_patterns = (DEFAULT_BLOCKED_URL_PATTERNS if blocked_url_patterns is None
+                                     else blocked_url_patterns)
+        self.command_timeout = command_timeout
+        self.launch_timeout = launch_timeout
+        self.watchdog = watchdog
+
+        self._process = None
+        self._user_data_dir = None
+        self._ws = None
+        self._reader = None
+        self._next_id = 1
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._sessions: Dict[str, CDPPage] = {}
+        self._slots = asyncio.Semaphore(max_tabs)
+        self._launch_lock = asyncio.Lock()
+        self._closed = False
+        self._active = 0
+        self._pages_loaded = 0
+        # Di-set saat tidak ada context yang terbuka (Chrome boleh di-recycle)
+        self._drained = asyncio.Event()
+        self._drained.set()
+        # Diisi sample_memory saat RSS Chrome atau JS heap melewati batas watchdog
+        self._retire_reason = None
+        # Semua context baru saja ditutup: JS heap target yang tersisa perlu diukur ulang
+        self._heap_stale = False
+
+        self.rss_bytes = 0
+        self.js_heap_bytes = 0
+        self.total_launched = 0
+        self.total_contexts = 0
+        self.total_retired = {"pages": 0, "rss": 0, "js_heap": 0}
+        self.total_orphans_killed = 0
+
+    @property
+    def connected(self) -> bool:
+        return (self._ws is not None and self._reader is not None and not self._reader.done()
+                and self._process is not None and self._process.returncode is None)
+
+    async def start(self):
+        """Launch Chrome dan buka koneksi CDP (dipanggil otomatis saat context pertama)"""
+        async with self._launch_lock:
+            if not self.connected:
+                await self._launch()
+
+    async def _launch(self):
+        await self._terminate()
+        chrome = find_chrome(self.chrome_path)
+        self._user_data_dir = tempfile.mkdtemp(prefix="cdp-chrome-")
+        print(f"[CDP] Launching {chrome}...")
+        self._process = await asyncio.create_subprocess_exec(
+            chrome, *CHROME_ARGS, "--remote-debugging-port=0", f"--user-data-dir={self._user_data_dir}",
+            "about:blank",
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+        )
+
+        # Chrome menulis port (baris 1) dan path websocket browser (baris 2) ke DevToolsActivePort
+        port_file = os.path.join(self._user_data_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + self.launch_timeout
+        while True:
+            if self._process.returncode is not None:
+                raise CDPError(f"Chrome berhenti saat startup (exit code {self._process.returncode})")
+            try:
+                with open(port_file, encoding="utf-8") as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    break
+            except FileNotFoundError:
+                pass
+            if time.monotonic() > deadline:
+                await self._terminate()
+                raise CDPError(f"Chrome tidak siap dalam {self.launch_timeout}s")
+            await asyncio.sleep(0.05)
+
+        # Page HTML (archive) bisa berukuran beberapa MB: tanpa batas ukuran pesan
+        self._ws = await websockets.connect(f"ws://127.0.0.1:{lines[0]}{lines[1]}", max_size=None,
+                                            ping_interval=None)
+        self._reader = asyncio.ensure_future(self._read_loop())
+        self._pages_loaded = 0
+        self._retire_reason = None
+        self._heap_stale = False
+        self.rss_bytes = 0
+        self.js_heap_bytes = 0
+        track_process(self._process.pid)
+        self.total_launched += 1
+        print(f"[CDP] ✓ Chrome ready (pid {self._process.pid})")
+
+    async def _read_loop(self):
+        """Teruskan balasan command ke future-nya dan event ke tab (session) pemiliknya"""
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                if "id" in message:
+                    future = self._pending.pop(message["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in message:
+                        future.set_exception(CDPError(message["error"].get("message", "CDP error")))
+                    else:
+                        future.set_result(message.get("result", {}))
+                else:
+                    page = self._sessions.get(message.get("sessionId"))
+                    if page is not None:
+                        page._on_event(message.get("method"), message.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("Koneksi CDP ke Chrome terputus"))
+            self._pending.clear()
+
+    async def send(self, method: str, params: Optional[Dict] = None, session_id: Optional[str] = None,
+                   timeout: Optional[float] = None) -> Dict:
+        """
+        Kirim satu command CDP dan tunggu balasannya
+
+        Raises:
+            CDPError: jika command gagal, timeout, atau koneksi terputus
+        """
+        if not self.connected:
+            raise CDPError("Chrome tidak terhubung")
+        message_id = self._next_id
+        self._next_id += 1
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            await self._ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, timeout or self.command_timeout)
+        except asyncio.TimeoutError:
+            raise CDPError(f"{method} tidak dibalas dalam {timeout or self.command_timeout}s")
+        except websockets.ConnectionClosed:
+            raise CDPError("Koneksi CDP ke Chrome terputus")
+        finally:
+            self._pending.pop(message_id, None)
+
+    def _recycle_reason(self) -> Optional[str]:
+        if self._pages_loaded >= self.max_pages:
+            return "pages"
+        if self._retire_reason is None and self.watchdog:
+            # JS heap diukur setelah drain (_sample_idle_heap); tidak perlu menunggu sampling berikutnya
+            return self.watchdog.retire_reason(rss_bytes=self.rss_bytes, js_heap_bytes=self.js_heap_bytes)
+        return self._retire_reason
+
+    async def _ensure_browser(self):
+        """
+        Launch ulang Chrome yang crash, atau recycle setelah max_pages / batas
+        RSS / batas JS heap; context baru menunggu scrape yang sedang berjalan selesai dulu
+        """
+        while True:
+            async with self._launch_lock:
+                if self._closed:
+                    raise CDPError("CDPBrowser sudah ditutup")
+                if not self.connected:
+                    if self.total_launched:
+                        print("[CDP] ✗ Chrome tidak merespon, launching ulang")
+                    await self._launch()
+                    return
+                if self._active == 0 and self._heap_stale:
+                    await self._sample_idle_heap()
+                reason = self._recycle_reason()
+                if reason is None:
+                    return
+                if self._active == 0:
+                    print(f"[CDP] Recycling Chrome ({reason}) after {self._pages_loaded} pages, "
+                          f"RSS {self.rss_bytes // (1024 * 1024)} MB, JS heap {self.js_heap_bytes // (1024 * 1024)} MB")
+                    self.total_retired[reason] += 1
+                    await self._launch()
+                    return
+            await self._drained.wait()
+
+    @asynccontextmanager
+    async def context(self, li_at_cookie: Optional[Dict] = None):
+        """
+        Pinjam browser context baru; ditutup (beserta semua tab-nya) saat keluar
+
+        Args:
+            li_at_cookie: Parameter Network.setCookie (lihat linkedin_scraper_v2.li_at_cookie_params)
+        """
+        async with self._slots:
+            await self._ensure_browser()
+            self._active += 1
+            self._drained.clear()
+            context = None
+            try:
+                created = await self.send("Target.createBrowserContext", {"disposeOnDetach": True})
+                context = CDPContext(self, created["browserContextId"], li_at_cookie, self.blocked_url_patterns)
+                self.total_contexts += 1
+                yield context
+            finally:
+                try:
+                    if context is not None:
+                        await self._dispose_context(context)
+                finally:
+                    # Baru dianggap selesai setelah context ditutup: recycle tidak
+                    # boleh mematikan Chrome di tengah disposeBrowserContext
+                    self._active -= 1
+                    if self._active == 0:
+                        self._heap_stale = bool(self.watchdog and self.watchdog.max_js_heap_bytes)
+                        self._drained.set()
+
+    async def _dispose_context(self, context: CDPContext):
+        """Catat halaman context, lalu tutup context beserta tab-nya"""
+        self._pages_loaded += sum(page.pages_loaded for page in context.pages)
+        for page in context.pages:
+            self._sessions.pop(page.session_id, None)
+        try:
+            await self.send("Target.disposeBrowserContext", {"browserContextId": context.context_id})
+        except CDPError as e:
+            print(f"[CDP] ⚠ Gagal menutup browser context: {str(e)}")
+
+    async def _sample_idle_heap(self):
+        """
+        Ukur total JS heap tab yang masih hidup setelah semua context ditutup
+
+        Heap tab milik context yang sudah di-dispose ikut dibebaskan; yang
+        menentukan recycle adalah heap yang tertinggal (tab default, tab yang
+        gagal ditutup). Dipanggil dengan _launch_lock dipegang dan _active == 0.
+        """
+        self._heap_stale = False
+        try:
+            targets = (await self.send("Target.getTargets", timeout=2))["targetInfos"]
+        except CDPError:
+            return
+        total = 0
+        for target in targets:
+            if target["type"] != "page":
+                continue
+            try:
+                attached = await self.send("Target.attachToTarget", {"targetId": target["targetId"], "flatten": True},
+                                           timeout=2)
+                try:
+                    usage = await self.send("Runtime.getHeapUsage", session_id=attached["sessionId"], timeout=2)
+                    total += int(usage["usedSize"])
+                finally:
+                    await self.send("Target.detachFromTarget", {"sessionId": attached["sessionId"]}, timeout=2)
+            except CDPError:
+                continue
+        self.js_heap_bytes = total
+
+    async def _terminate(self):
+        if self._ws is not None:
+            try:
+                await self._ws.close()
+            except Exception:
+                pass
+        if self._reader is not None:
+            self._reader.cancel()
+        if self._process is not None:
+            # Renderer/GPU process bisa tertinggal jika proses utama Chrome crash
+            processes = process_tree(self._process.pid)[1:]
+            if self._process.returncode is None:
+                self._process.terminate()
+                try:
+                    await asyncio.wait_for(self._process.wait(), 5)
+                except asyncio.TimeoutError:
+                    self._process.kill()
+                    await self._process.wait()
+            untrack_process(self._process.pid)
+            killed = await asyncio.to_thread(kill_processes, processes)
+            if killed:
+                self.total_orphans_killed += killed
+                print(f"[CDP] Killed {killed} leftover Chrome process(es)")
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+        self._ws = self._reader = self._process = self._user_data_dir = None
+        self._sessions.clear()
+
+    async def close(self):
+        """Tutup koneksi dan matikan Chrome"""
+        self._closed = True
+        async with self._launch_lock:
+            await self._terminate()
+        print("[CDP] Shutdown completed")
+
+    def sample_memory(self):
+        """Ukur RSS tree proses Chrome dan cek batas watchdog (dipanggil BrowserWatchdog dari thread-nya)"""
+        process = self._process
+        if process is None:
+            return
+        self.rss_bytes = tree_rss(process_tree(process.pid))
+        if self.watchdog and not self._retire_reason:
+            reason = self.watchdog.retire_reason(rss_bytes=self.rss_bytes, js_heap_bytes=self.js_heap_bytes)
+            if reason:
+                print(f"[CDP] Chrome over memory limit ({reason}), recycling when idle")
+                self._retire_reason = reason
+
+    def stats(self) -> Dict:
+        """Statistik browser untuk health/metrics endpoint"""
+        return {
+            "connected": self.connected,
+            "pid": self._process.pid if self._process else None,
+            "max_tabs": self.max_tabs,
+            "active_contexts": self._active,
+            "open_tabs": len(self._sessions),
+            "pages_loaded": self._pages_loaded,
+            "max_pages": self.max_pages,
+            "total_launched": self.total_launched,
+            "total_contexts": self.total_contexts,
+            "total_retired": dict(self.total_retired),
+            "total_orphans_killed": self.total_orphans_killed,
+            "rss_bytes": self.rss_bytes,
+            "js_heap_bytes": self.js_heap_bytes
+        }
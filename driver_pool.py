@@ -0,0 +1,279 @@
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+from browser_watchdog import driver_pid, js_heap_used, process_tree, quit_driver, tree_rss
+from linkedin_scraper_v2 import LINKEDIN_BASE_URL, apply_li_at_cookie, create_driver
+
+
+class PooledDriver:
+    """WebDriver yang dikelola DriverPool beserta statistik pemakaiannya"""
+
+    def __init__(self, driver, driver_id: int):
+        self.driver = driver
+        self.driver_id = driver_id
+        self.created_at = time.time()
+        self.pages_loaded = 0
+        self.checkouts = 0
+        # Akun (AccountPool) yang cookie li_at-nya sedang terpasang; None = belum diketahui
+        self.account_id = None
+        # Memori terakhir yang diukur (lihat DriverPool.sample_memory dan checkin)
+        self.rss_bytes = 0
+        self.js_heap_bytes = 0
+        # Diisi watchdog saat driver melewati batas memori; driver dibuang saat checkin/checkout
+        self.retire_reason = None
+
+
+class DriverPoolExhausted(Exception):
+    """Tidak ada driver yang tersedia sebelum timeout checkout habis"""
+
+
+class DriverPool:
+    def __init__(self, li_at_cookie: str, size: int = 2, max_pages_per_driver: int = 50,
+                 checkout_timeout: float = 60.0, base_url: str = LINKEDIN_BASE_URL,
+                 blocked_url_patterns: Optional[List[str]] = None, watchdog=None):
+        """
+        Pool Chrome WebDriver yang sudah di-launch dan ter-autentikasi
+
+        Args:
+            li_at_cookie: LinkedIn session cookie (li_at value)
+            size: Jumlah maksimal driver yang hidup bersamaan
+            max_pages_per_driver: Driver di-recycle setelah memuat sebanyak ini halaman
+            checkout_timeout: Detik maksimal menunggu driver kosong saat checkout
+            base_url: Origin LinkedIn tempat cookie dipasang
+            blocked_url_patterns: Pola URL yang diblok via CDP di setiap driver
+                (None: default create_driver, []: tanpa blocking)
+            watchdog: BrowserWatchdog untuk batas RSS/JS heap per driver (None = hanya
+                batas jumlah halaman)
+        """
+        self.li_at_cookie = li_at_cookie
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.checkout_timeout = checkout_timeout
+        self.base_url = base_url
+        self.blocked_url_patterns = blocked_url_patterns
+        self.watchdog = watchdog
+
+        # Semua driver yang hidup (idle maupun dipinjam) untuk sampling memori
+        self._drivers = {}
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._alive = 0
+        self._next_id = 1
+        self._closed = False
+
+        self.total_created = 0
+        self.total_recycled = 0
+        self.total_retired = {"pages": 0, "rss": 0, "js_heap": 0}
+        self.total_orphans_killed = 0
+
+    def _launch(self) -> PooledDriver:
+        """Launch driver baru dan pasang cookie li_at"""
+        with self._lock:
+            driver_id = self._next_id
+            self._next_id += 1
+
+        print(f"[POOL] Launching driver #{driver_id}...")
+        driver = create_driver(self.blocked_url_patterns)
+        try:
+            apply_li_at_cookie(driver, self.li_at_cookie, self.base_url)
+        except Exception:
+            quit_driver(driver)
+            raise
+
+        pooled = PooledDriver(driver, driver_id)
+        with self._lock:
+            self.total_created += 1
+            self._drivers[driver_id] = pooled
+        print(f"[POOL] ✓ Driver #{driver_id} ready")
+        return pooled
+
+    def _destroy(self, pooled: PooledDriver):
+        """Quit driver (proses yang tertinggal dimatikan) dan kurangi jumlah driver yang hidup"""
+        killed = quit_driver(pooled.driver)
+        with self._lock:
+            self._alive -= 1
+            self.total_orphans_killed += killed
+            self._drivers.pop(pooled.driver_id, None)
+
+    def _is_healthy(self, pooled: PooledDriver) -> bool:
+        """Health check ringan: browser masih merespon dan masih punya window"""
+        try:
+            return pooled.driver.execute_script("return 1;") == 1 and len(pooled.driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def _reset(self, pooled: PooledDriver):
+        """Tutup tab tambahan dan kembali ke tab pertama"""
+        handles = pooled.driver.window_handles
+        for handle in handles[1:]:
+            pooled.driver.switch_to.window(handle)
+            pooled.driver.close()
+        pooled.driver.switch_to.window(handles[0])
+
+    def _retire_reason(self, pooled: PooledDriver) -> Optional[str]:
+        """Alasan driver harus di-recycle saat checkin: jumlah halaman, RSS atau JS heap"""
+        if pooled.pages_loaded >= self.max_pages_per_driver:
+            return "pages"
+        if pooled.retire_reason or self.watchdog is None:
+            return pooled.retire_reason
+        pooled.rss_bytes = tree_rss(process_tree(driver_pid(pooled.driver)))
+        if self.watchdog.max_js_heap_bytes:
+            pooled.js_heap_bytes = js_heap_used(pooled.driver) or 0
+        return self.watchdog.retire_reason(pooled.rss_bytes, pooled.js_heap_bytes)
+
+    def _retire(self, pooled: PooledDriver, reason: str):
+        """Buang driver yang melewati batas halaman/memori"""
+        print(f"[POOL] Recycling driver #{pooled.driver_id} ({reason}): {pooled.pages_loaded} pages, "
+              f"RSS {pooled.rss_bytes // (1024 * 1024)} MB, JS heap {pooled.js_heap_bytes // (1024 * 1024)} MB")
+        with self._lock:
+            self.total_recycled += 1
+            self.total_retired[reason] += 1
+        self._destroy(pooled)
+
+    def sample_memory(self):
+        """
+        Ukur RSS tree chromedriver + Chrome setiap driver (dipanggil BrowserWatchdog)
+
+        Hanya lewat psutil, jadi aman untuk driver yang sedang dipinjam; driver
+        yang melewati batas ditandai dan dibuang saat checkin/checkout berikutnya.
+        """
+        with self._lock:
+            drivers = list(self._drivers.values())
+        for pooled in drivers:
+            pooled.rss_bytes = tree_rss(process_tree(driver_pid(pooled.driver)))
+            if self.watchdog and not pooled.retire_reason:
+                reason = self.watchdog.retire_reason(rss_bytes=pooled.rss_bytes)
+                if reason:
+                    print(f"[POOL] Driver #{pooled.driver_id} over memory limit ({reason}), retiring")
+                    pooled.retire_reason = reason
+
+    def start(self):
+        """Pre-launch semua driver supaya request pertama tidak menunggu startup Chrome"""
+        print(f"[POOL] Warming up {self.size} driver(s)...")
+        for _ in range(self.size):
+            with self._lock:
+                if self._alive >= self.size:
+                    break
+                self._alive += 1
+            try:
+                self._idle.put(self._launch())
+            except Exception as e:
+                with self._lock:
+                    self._alive -= 1
+                print(f"[POOL] ⚠ Failed to launch driver: {str(e)}")
+
+    def checkout(self, timeout: Optional[float] = None) -> PooledDriver:
+        """
+        Pinjam driver dari pool
+
+        Driver idle di-health-check dulu, yang mati diganti baru. Jika pool
+        belum penuh dan tidak ada yang idle, driver baru di-launch.
+
+        Raises:
+            DriverPoolExhausted: jika tidak ada driver sampai timeout habis
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool sudah di-shutdown")
+
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_launch = self._alive < self.size
+                    if can_launch:
+                        self._alive += 1
+
+                if can_launch:
+                    try:
+                        pooled = self._launch()
+                    except Exception:
+                        with self._lock:
+                            self._alive -= 1
+                        raise
+                    pooled.checkouts += 1
+                    return pooled
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise DriverPoolExhausted(f"Tidak ada driver tersedia setelah {timeout}s")
+                # Poll berkala: slot bisa kosong karena driver lain dibuang
+                try:
+                    pooled = self._idle.get(timeout=min(remaining, 1.0))
+                except queue.Empty:
+                    continue
+
+            if pooled.retire_reason:
+                self._retire(pooled, pooled.retire_reason)
+                continue
+            if self._is_healthy(pooled):
+                pooled.checkouts += 1
+                return pooled
+            print(f"[POOL] ✗ Driver #{pooled.driver_id} failed health check, replacing")
+            self._destroy(pooled)
+
+    def checkin(self, pooled: PooledDriver, pages_loaded: int = 0, healthy: bool = True):
+        """
+        Kembalikan driver ke pool
+
+        Args:
+            pooled: Driver yang dipinjam lewat checkout()
+            pages_loaded: Jumlah halaman yang dimuat selama dipinjam
+            healthy: False untuk memaksa driver dibuang
+        """
+        pooled.pages_loaded += pages_loaded
+
+        if self._closed or not healthy or not self._is_healthy(pooled):
+            self._destroy(pooled)
+            return
+
+        reason = self._retire_reason(pooled)
+        if reason:
+            self._retire(pooled, reason)
+            return
+
+        try:
+            self._reset(pooled)
+        except Exception:
+            self._destroy(pooled)
+            return
+
+        self._idle.put(pooled)
+
+    def shutdown(self):
+        """Quit semua driver idle; driver yang sedang dipinjam di-quit saat checkin"""
+        self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._destroy(pooled)
+        print("[POOL] Shutdown completed")
+
+    def stats(self) -> Dict:
+        """Statistik pool untuk health/metrics endpoint"""
+        with self._lock:
+            alive = self._alive
+            drivers = list(self._drivers.values())
+            retired = dict(self.total_retired)
+        idle = self._idle.qsize()
+        return {
+            "size": self.size,
+            "alive": alive,
+            "idle": idle,
+            "in_use": alive - idle,
+            "total_created": self.total_created,
+            "total_recycled": self.total_recycled,
+            "total_retired": retired,
+            "total_orphans_killed": self.total_orphans_killed,
+            "max_pages_per_driver": self.max_pages_per_driver,
+            "rss_bytes": sum(pooled.rss_bytes for pooled in drivers),
+            "max_driver_rss_bytes": max((pooled.rss_bytes for pooled in drivers), default=0),
+            "js_heap_bytes": sum(pooled.js_heap_bytes for pooled in drivers)
+        }
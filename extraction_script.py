@@ -0,0 +1,392 @@
+# JavaScript yang di-inject lewat execute_script untuk extract seluruh
+# halaman profil dalam satu round-trip ke chromedriver.
+#
+# Section yang dibaca berasal dari section index yang dibangun Python
+# (lihat SECTION_SUMMARY_JS), jadi section tidak di-scan ulang di sini.
+# Selector dan aturan dedup mengikuti LinkedInScraper._extract_* versi
+# WebDriver: span aria-hidden='true' dipakai untuk menghindari text
+# accessibility yang dirender 2x. Parsing field (title/company, dst) tetap
+# dilakukan di Python supaya kedua mode menghasilkan output yang sama.
+# Tombol "see more" About harus sudah di-expand lebih dulu (EXPAND_ABOUT_JS).
+
+PROFILE_EXTRACTION_JS = r"""
+const SECTIONS_XPATH = "//*[@id='profile-content']/div/div[2]/div/div/main/section";
+
+function xpathFirst(xpath, context) {
+    return document.evaluate(xpath, context || document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function xpathAll(xpath, context) {
+    const result = document.evaluate(xpath, context || document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const nodes = [];
+    for (let i = 0; i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+}
+
+// Sama dengan profile_parsing.clean_text
+function cleanText(text) {
+    if (!text) return null;
+    const cleaned = [];
+    let prev = null;
+    for (let line of text.split('\n')) {
+        line = line.trim();
+        if (line && line !== prev) {
+            cleaned.push(line);
+            prev = line;
+        }
+    }
+    const result = cleaned.join('\n').trim();
+    return result ? result : null;
+}
+
+function textOf(xpath, context) {
+    const elem = xpathFirst(xpath, context);
+    return elem ? cleanText(elem.innerText) : null;
+}
+
+function extractAbout(candidates) {
+    for (const sectionNumber of candidates) {
+        const about = textOf("//*[@id='profile-content']/div/div[2]/div/div/main/section[" + sectionNumber +
+            "]/div[3]/div/div/div/span[1]");
+        if (about) return about;
+    }
+    return null;
+}
+
+function sectionItems(idx) {
+    if (!idx) return [];
+    return xpathAll(SECTIONS_XPATH + "[" + idx + "]/div[3]/ul/li");
+}
+
+function visibleTexts(item) {
+    const texts = [];
+    for (const span of xpathAll(".//span[@aria-hidden='true']", item)) {
+        const text = cleanText(span.innerText);
+        if (text && !texts.includes(text)) texts.push(text);
+    }
+    return texts;
+}
+
+function certificationFields(item) {
+    const nameElem = xpathFirst(".//div/div[2]/div[1]/a/div/div/div/div/span[1]", item);
+    const name = nameElem ? cleanText(nameElem.innerText) : textOf(".//span[@aria-hidden='true']", item);
+    return {
+        name: name,
+        authority: textOf(".//div/div[2]/div[1]/a/span[1]/span[1]", item),
+        issued: textOf(".//div/div[2]/div[1]/a/span[2]/span[1]", item),
+        credential_id: textOf(".//div/div[2]/div[1]/a/span[3]/span[1]", item)
+    };
+}
+
+// arguments[0]: section index dari LinkedInScraper._build_section_index
+// arguments[1]: urutan nomor section yang dicoba untuk About
+// arguments[2]: section yang di-extract (top_card, about, experiences,
+//               educations, certifications); null = semua
+const index = arguments[0] || {};
+const aboutCandidates = arguments[1] || [3, 2];
+const wanted = arguments[2] || null;
+const want = (section) => !wanted || wanted.includes(section);
+const expIdx = want('experiences') ? (index.experience || null) : null;
+const eduIdx = want('educations') ? (index.education || null) : null;
+const certIdx = want('certifications') ? (index.certifications || null) : null;
+
+const result = {
+    experience_found: expIdx !== null,
+    education_found: eduIdx !== null,
+    certifications_found: certIdx !== null,
+    experience_items: sectionItems(expIdx).map(visibleTexts),
+    education_items: sectionItems(eduIdx).map(visibleTexts),
+    certification_items: sectionItems(certIdx).map(certificationFields)
+};
+if (want('top_card')) {
+    result.full_name = textOf("/html/body/div[6]/div[3]/div/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[1]/span[1]/a/h1");
+    result.headline = textOf("//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[2]");
+    result.location = textOf("//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[2]/span[1]");
+}
+if (want('about')) {
+    result.about = extractAbout(aboutCandidates);
+}
+return result;
+"""
+
+
+
+# Async script: klik "see more" About lalu tunggu teks lengkapnya dirender
+# (tombol hilang) sebelum PROFILE_EXTRACTION_JS membaca About, sama dengan
+# klik + _wait_expanded di mode webdriver. Berhenti di section pertama yang
+# punya teks About, maksimal max_ms.
+#
+# arguments: [about_candidates, max_ms, callback]
+EXPAND_ABOUT_JS = r"""
+const candidates = arguments[0] || [3, 2];
+const maxMs = arguments[1];
+const done = arguments[arguments.length - 1];
+
+function xpathFirst(xpath) {
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function hidden(elem) {
+    return !elem.isConnected || elem.getClientRects().length === 0;
+}
+
+const start = performance.now();
+const clicked = [];
+for (const sectionNumber of candidates) {
+    const section = "//*[@id='profile-content']/div/div[2]/div/div/main/section[" + sectionNumber + "]";
+    const button = xpathFirst(section + "/div[3]//button[contains(text(), 'lihat lebih banyak') or " +
+        "contains(text(), 'see more')]");
+    if (button) {
+        button.click();
+        clicked.push(button);
+    }
+    if (xpathFirst(section + "/div[3]/div/div/div/span[1]")) break;
+}
+
+function finish(expanded) {
+    done({clicked: clicked.length, expanded: expanded, elapsed_ms: Math.round(performance.now() - start)});
+}
+
+function step() {
+    if (clicked.every(hidden)) return finish(true);
+    if (performance.now() - start > maxMs) return finish(false);
+    setTimeout(step, 50);
+}
+
+step();
+"""
+
+# Sinyal murah untuk refresh incremental: jumlah item dan textContent per
+# section tanpa klik "see more" atau parsing field. textContent (bukan
+# innerText) ikut membaca teks yang terpotong/tersembunyi, jadi perubahan
+# About di balik "see more" tetap terdeteksi. Hash dihitung di Python.
+#
+# arguments: [section_index, about_candidates]
+PAGE_SIGNALS_JS = r"""
+const SECTIONS_XPATH = "//*[@id='profile-content']/div/div[2]/div/div/main/section";
+
+function xpathFirst(xpath, context) {
+    return document.evaluate(xpath, context || document, null,
+        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+
+function normalized(elem) {
+    return elem ? elem.textContent.replace(/\s+/g, ' ').trim() : null;
+}
+
+function listSignal(idx) {
+    const section = idx ? xpathFirst(SECTIONS_XPATH + "[" + idx + "]") : null;
+    if (!section) return {count: 0, text: null};
+    const items = document.evaluate("./div[3]/ul/li", section, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    return {count: items.snapshotLength, text: normalized(section)};
+}
+
+const index = arguments[0] || {};
+const aboutCandidates = arguments[1] || [3, 2];
+
+let about = null;
+for (const sectionNumber of aboutCandidates) {
+    about = normalized(xpathFirst(SECTIONS_XPATH + "[" + sectionNumber + "]/div[3]/div/div/div/span[1]"));
+    if (about) break;
+}
+const topCard = normalized(xpathFirst(SECTIONS_XPATH + "[1]/div[2]/div[2]"));
+
+return {
+    top_card: {count: topCard ? 1 : 0, text: topCard},
+    about: {count: about ? 1 : 0, text: about},
+    experiences: listSignal(index.experience),
+    educations: listSignal(index.education),
+    certifications: listSignal(index.certifications),
+    skills: listSignal(index.skills)
+};
+"""
+
+# Ringkasan semua section di #profile-content (id + heading h2) dalam satu
+# round-trip, dipakai LinkedInScraper._build_section_index.
+SECTION_SUMMARY_JS = r"""
+const result = document.evaluate("//*[@id='profile-content']/div/div[2]/div/div/main/section", document, null,
+    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const sections = [];
+for (let i = 0; i < result.snapshotLength; i++) {
+    const section = result.snapshotItem(i);
+    const h2 = section.querySelector('h2');
+    sections.push({id: section.id || '', heading: h2 ? h2.innerText : ''});
+}
+return sections;
+"""
+
+
+# Async script (execute_async_script) untuk adaptive loading: scroll
+# bertahap hanya sampai section experience, education dan certification
+# muncul. Setiap langkah menunggu DOM "tenang" (tidak ada mutation selama
+# settle_ms) supaya lazy loading sempat jalan, dibatasi budget total.
+#
+# arguments: [max_ms, settle_ms, step_px, kinds, callback]
+WAIT_FOR_SECTIONS_JS = r"""
+const maxMs = arguments[0];
+const settleMs = arguments[1];
+const stepPx = arguments[2];
+const done = arguments[arguments.length - 1];
+
+const SECTIONS_XPATH = "//*[@id='profile-content']/div/div[2]/div/div/main/section";
+// {kind: [id_keywords, heading_keywords]} dari SECTION_KEYWORDS di Python
+const KINDS = arguments[3];
+
+function foundSections() {
+    const result = document.evaluate(SECTIONS_XPATH, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const found = {};
+    for (const kind in KINDS) found[kind] = false;
+    for (let i = 0; i < result.snapshotLength; i++) {
+        const section = result.snapshotItem(i);
+        const id = (section.id || '').toLowerCase();
+        const h2 = section.querySelector('h2');
+        const heading = h2 ? h2.innerText.toLowerCase() : '';
+        for (const kind in KINDS) {
+            const [idKeywords, headingKeywords] = KINDS[kind];
+            if ((id && idKeywords.some(k => id.includes(k))) ||
+                headingKeywords.some(k => heading.includes(k))) {
+                found[kind] = true;
+            }
+        }
+    }
+    return found;
+}
+
+const start = performance.now();
+let lastActivity = performance.now();
+let lastHeight = -1;
+let stableAtBottom = 0;
+let steps = 0;
+
+const observer = new MutationObserver(() => { lastActivity = performance.now(); });
+observer.observe(document.body, {childList: true, subtree: true});
+
+function finish(reason) {
+    observer.disconnect();
+    window.scrollTo(0, 0);
+    done({reason: reason, found: foundSections(), steps: steps,
+          elapsed_ms: Math.round(performance.now() - start)});
+}
+
+function step() {
+    const now = performance.now();
+    const found = foundSections();
+    if (Object.values(found).every(Boolean)) return finish('sections_ready');
+    if (now - start > maxMs) return finish('budget_exhausted');
+    // Tunggu sampai tidak ada mutation/scroll baru selama settleMs
+    if (now - lastActivity < settleMs) return setTimeout(step, 50);
+
+    const height = document.body.scrollHeight;
+    const atBottom = window.innerHeight + window.scrollY >= height - 2;
+    if (atBottom && height === lastHeight) {
+        stableAtBottom += 1;
+        // Halaman sudah mentok dan tidak bertambah: section yang belum ada memang tidak ada
+        if (stableAtBottom >= 2) return finish('page_end');
+    } else {
+        stableAtBottom = 0;
+    }
+    lastHeight = height;
+
+    window.scrollBy(0, stepPx);
+    steps += 1;
+    lastActivity = performance.now();
+    setTimeout(step, 50);
+}
+
+step();
+"""
+
+# Halaman /details/skills/ memuat list bertahap (infinite scroll dan tombol
+# "Show more results"). Scroll/klik sampai jumlah item berhenti bertambah, lalu
+# kembalikan semua teks skill sekaligus.
+#
+# arguments: [max_ms, settle_ms, callback]
+LOAD_SKILLS_JS = r"""
+const maxMs = arguments[0];
+const settleMs = arguments[1];
+const done = arguments[arguments.length - 1];
+
+const LIST_XPATH = "//div[contains(@class, 'pvs-list__container')]";
+const SKILL_XPATH = LIST_XPATH + "//li//span[@aria-hidden='true']";
+const MORE_LABELS = ['show more results', 'tampilkan hasil lainnya', 'tampilkan lebih banyak'];
+
+function countItems() {
+    return document.evaluate("count(" + LIST_XPATH + "//li)", document, null,
+        XPathResult.NUMBER_TYPE, null).numberValue;
+}
+
+function loadMoreButton() {
+    const buttons = document.querySelectorAll('button.scaffold-finite-scroll__load-button, main button');
+    for (const button of buttons) {
+        const label = (button.innerText || button.getAttribute('aria-label') || '').trim().toLowerCase();
+        if (button.offsetParent !== null &&
+            (button.classList.contains('scaffold-finite-scroll__load-button') ||
+             MORE_LABELS.some(l => label.includes(l)))) {
+            return button;
+        }
+    }
+    return null;
+}
+
+function skillTexts() {
+    const result = document.evaluate(SKILL_XPATH, document, null,
+        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const texts = [];
+    for (let i = 0; i < result.snapshotLength; i++) {
+        texts.push(result.snapshotItem(i).innerText || '');
+    }
+    return texts;
+}
+
+const start = performance.now();
+let lastActivity = performance.now();
+let lastCount = -1;
+let idleRounds = 0;
+let steps = 0;
+let pages = 0;
+
+const observer = new MutationObserver(() => { lastActivity = performance.now(); });
+observer.observe(document.body, {childList: true, subtree: true});
+
+function finish(reason) {
+    observer.disconnect();
+    done({reason: reason, items: countItems(), steps: steps, pages: pages,
+          elapsed_ms: Math.round(performance.now() - start), skills: skillTexts()});
+}
+
+function step() {
+    const now = performance.now();
+    if (now - start > maxMs) return finish('budget_exhausted');
+    if (now - lastActivity < settleMs) return setTimeout(step, 50);
+
+    const count = countItems();
+    const button = loadMoreButton();
+    if (button && !button.disabled) {
+        button.click();
+        pages += 1;
+    } else if (button) {
+        // Tombol disabled: halaman berikutnya masih di-fetch
+        idleRounds = 0;
+    } else if (count === lastCount) {
+        idleRounds += 1;
+        // Tidak ada tombol dan scroll tidak menambah item: list sudah lengkap
+        if (idleRounds >= 2) return finish('list_end');
+    } else {
+        idleRounds = 0;
+    }
+    lastCount = count;
+
+    window.scrollTo(0, document.body.scrollHeight);
+    steps += 1;
+    lastActivity = performance.now();
+    setTimeout(step, 50);
+}
+
+step();
+"""
@@ -0,0 +1,264 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class Job:
+    """Satu scrape job beserta status, percobaan dan hasilnya"""
+
+    def __init__(self, job_id: str, vanity_name: str, status: str, attempts: int, max_attempts: int,
+                 result: Optional[Dict], error: Optional[str], created_at: float, updated_at: float,
+                 visible_at: float, worker_id: Optional[str]):
+        self.job_id = job_id
+        self.vanity_name = vanity_name
+        self.status = status
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+        self.result = result
+        self.error = error
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.visible_at = visible_at
+        self.worker_id = worker_id
+
+    def to_dict(self) -> Dict:
+        """Representasi untuk GET /jobs/{id}"""
+        return {
+            "job_id": self.job_id,
+            "vanity_name": self.vanity_name,
+            "status": self.status,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "result": self.result
+        }
+
+
+class JobQueue(ABC):
+    """
+    Interface antrian scrape job yang durable
+
+    Job yang di-claim worker tidak terlihat worker lain selama visibility
+    timeout; jika worker mati tanpa complete/fail, job muncul lagi setelah
+    timeout habis dan dihitung sebagai satu percobaan.
+    """
+
+    @abstractmethod
+    def enqueue(self, vanity_names: List[str], max_attempts: Optional[int] = None) -> List[Job]:
+        """Antrikan satu job per vanity name"""
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        """Job dengan id ini, atau None jika tidak ada"""
+
+    @abstractmethod
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        """Ambil job berikutnya yang siap dikerjakan, atau None jika antrian kosong"""
+
+    @abstractmethod
+    def extend(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        """Perpanjang lease job yang sedang dikerjakan; False jika lease sudah hilang"""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Dict) -> bool:
+        """Simpan hasil job; False jika lease worker ini sudah hilang"""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: float = 0.0,
+             count_attempt: bool = True, retry: bool = True) -> Optional[Job]:
+        """
+        Catat kegagalan; job di-antrikan ulang setelah retry_delay jika masih
+        ada sisa percobaan, selain itu berstatus failed
+
+        Args:
+            count_attempt: False untuk kegagalan yang bukan salah job (misal
+                semua akun sedang di-rate-limit)
+            retry: False untuk kegagalan permanen (misal profil tidak ada):
+                langsung failed tanpa menghabiskan sisa percobaan
+        """
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Jumlah job per status untuk health endpoint"""
+
+    def close(self):
+        pass
+
+
+class SQLiteJobQueue(JobQueue):
+    def __init__(self, db_path: str = "jobs.sqlite3", max_attempts: int = 3):
+        """
+        JobQueue di atas SQLite (WAL); bisa dipakai beberapa proses API dan
+        worker sekaligus selama file database-nya bisa diakses semuanya
+
+        Args:
+            db_path: Lokasi file SQLite
+            max_attempts: Default jumlah percobaan per job
+        """
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                vanity_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                visible_at REAL NOT NULL,
+                worker_id TEXT
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, visible_at, created_at)")
+
+    def _row_to_job(self, row) -> Job:
+        return Job(
+            job_id=row[0], vanity_name=row[1], status=row[2], attempts=row[3], max_attempts=row[4],
+            result=json.loads(row[5]) if row[5] else None, error=row[6], created_at=row[7],
+            updated_at=row[8], visible_at=row[9], worker_id=row[10]
+        )
+
+    def _select(self, job_id: str) -> Optional[Job]:
+        row = self._conn.execute(
+            "SELECT job_id, vanity_name, status, attempts, max_attempts, result, error, "
+            "created_at, updated_at, visible_at, worker_id FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def enqueue(self, vanity_names: List[str], max_attempts: Optional[int] = None) -> List[Job]:
+        now = time.time()
+        max_attempts = max_attempts or self.max_attempts
+        rows = [(uuid.uuid4().hex, name, JOB_QUEUED, max_attempts, now, now, now) for name in vanity_names]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO jobs (job_id, vanity_name, status, max_attempts, created_at, updated_at, visible_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [Job(row[0], row[1], JOB_QUEUED, 0, max_attempts, None, None, now, now, now, None) for row in rows]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._select(job_id)
+
+    def claim(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            # BEGIN IMMEDIATE: hanya satu proses yang bisa claim pada satu waktu
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Lease habis di percobaan terakhir: job gagal permanen
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, updated_at = ?, worker_id = NULL "
+                    "WHERE status = ? AND visible_at <= ? AND attempts >= max_attempts",
+                    (JOB_FAILED, "visibility timeout habis di percobaan terakhir", now, JOB_RUNNING, now)
+                )
+                row = self._conn.execute(
+                    "SELECT job_id FROM jobs WHERE status IN (?, ?) AND visible_at <= ? "
+                    "ORDER BY created_at LIMIT 1",
+                    (JOB_QUEUED, JOB_RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, worker_id = ?, "
+                    "visible_at = ?, updated_at = ? WHERE job_id = ?",
+                    (JOB_RUNNING, worker_id, now + visibility_timeout, now, row[0])
+                )
+                job = self._select(row[0])
+                self._conn.execute("COMMIT")
+                return job
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def extend(self, job_id: str, worker_id: str, visibility_timeout: float) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET visible_at = ?, updated_at = ? WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (now + visibility_timeout, now, job_id, worker_id, JOB_RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict) -> bool:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, updated_at = ?, worker_id = NULL "
+                "WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (JOB_DONE, json.dumps(result, ensure_ascii=False), now, job_id, worker_id, JOB_RUNNING)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str, retry_delay: float = 0.0,
+             count_attempt: bool = True, retry: bool = True) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                job = self._select(job_id)
+                if job is None or job.status != JOB_RUNNING or job.worker_id != worker_id:
+                    # Lease sudah diambil worker lain
+                    self._conn.execute("COMMIT")
+                    return job
+                attempts = job.attempts if count_attempt else job.attempts - 1
+                status = JOB_QUEUED if retry and attempts < job.max_attempts else JOB_FAILED
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = ?, error = ?, visible_at = ?, updated_at = ?, "
+                    "worker_id = NULL WHERE job_id = ?",
+                    (status, attempts, error, now + retry_delay, now, job_id)
+                )
+                job = self._select(job_id)
+                self._conn.execute("COMMIT")
+                return job
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED)}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_job_queue(url: str, max_attempts: int = 3) -> JobQueue:
+    """
+    Buat JobQueue dari URL backend
+
+    Saat ini hanya "sqlite:///path/ke/jobs.sqlite3"; backend lain cukup
+    mengimplementasikan JobQueue dan ditambahkan di sini.
+    """
+    if url.startswith("sqlite:///"):
+        return SQLiteJobQueue(url[len("sqlite:///"):], max_attempts=max_attempts)
+    raise ValueError(f"Backend job queue tidak dikenal: {url}")
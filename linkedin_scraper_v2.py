@@ -1,81 +1,300 @@
 import json
 import time
-import os
+import uuid
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from typing import Dict, Optional, List
-import google.generativeai as genai
+from urllib.parse import urlparse
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
+from browser_watchdog import driver_pid, quit_driver, track_process
+from resource_blocking import (DEFAULT_BLOCKED_URL_PATTERNS, apply_resource_blocking,
+                               collect_network_stats, drain_network_log)
 
-class LinkedInScraper:
-    def __init__(self, li_at_cookie: str):
+from extraction_script import (EXPAND_ABOUT_JS, LOAD_SKILLS_JS, PAGE_SIGNALS_JS, PROFILE_EXTRACTION_JS,
+                               SECTION_SUMMARY_JS, WAIT_FOR_SECTIONS_JS)
+from profile_parsing import (SECTION_KEYWORDS, about_candidates, accept_certification, clean_text, index_sections,
+                             parse_education_texts, parse_experience_texts, skills_from_texts)
+from profile_snapshots import PROFILE_SECTIONS
+from scrape_state import ABOUT_EXPAND_SECONDS, DEADLINE_EXTRACT_SECONDS, LAZY_SECTION_KINDS, ScrapeState
+
+
+LINKEDIN_BASE_URL = "https://www.linkedin.com"
+
+# Path tujuan redirect LinkedIn jika session li_at tidak valid / diblok
+LOGIN_WALL_PATHS = ("/authwall", "/login", "/checkpoint", "/uas/login")
+
+# Path tujuan redirect LinkedIn untuk profil yang tidak ada / tidak tersedia
+PROFILE_MISSING_PATHS = ("/404", "/in/unavailable")
+
+def build_chrome_options() -> Options:
+    """Bangun Chrome options standar untuk scraping headless"""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument("--disable-plugins")
+    chrome_options.add_argument("--disable-extensions")
+    
+    # Suppress Chrome logging
+    chrome_options.add_argument("--log-level=3")
+    chrome_options.add_argument("--silent")
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    
+    # Performance log (event Network.*) untuk menghitung request/byte per scrape
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+
+def create_driver(blocked_url_patterns: Optional[List[str]] = None) -> webdriver.Chrome:
+    """
+    Launch Chrome headless baru dengan resource blocking via CDP
+    
+    Args:
+        blocked_url_patterns: Pola URL yang diblok (default DEFAULT_BLOCKED_URL_PATTERNS,
+            [] untuk tanpa blocking)
+    """
+    driver = webdriver.Chrome(options=build_chrome_options())
+    if blocked_url_patterns is None:
+        blocked_url_patterns = DEFAULT_BLOCKED_URL_PATTERNS
+    # Tree chromedriver + Chrome ini tidak dianggap yatim oleh BrowserWatchdog sampai quit_driver
+    track_process(driver_pid(driver))
+    try:
+        apply_resource_blocking(driver, blocked_url_patterns)
+    except Exception:
+        quit_driver(driver)
+        raise
+    return driver
+
+
+def cookie_domain(base_url: str) -> Optional[str]:
+    """Domain cookie li_at: .linkedin.com, atau None (host saat ini) untuk stand-in lokal"""
+    host = urlparse(base_url).hostname or ""
+    return ".linkedin.com" if host.endswith("linkedin.com") else None
+
+
+def li_at_cookie_params(li_at_cookie: str, base_url: str = LINKEDIN_BASE_URL) -> Dict:
+    """Parameter CDP Network.setCookie untuk li_at di origin base_url"""
+    cookie = {
+        "name": "li_at",
+        "value": li_at_cookie,
+        "path": "/",
+        "httpOnly": True
+    }
+    domain = cookie_domain(base_url)
+    if domain:
+        cookie.update({"domain": domain, "secure": True, "sameSite": "None"})
+    else:
+        # Stand-in lokal: cookie host-only untuk origin base_url
+        cookie["url"] = base_url
+    return cookie
+
+
+def apply_li_at_cookie(driver, li_at_cookie: str, base_url: str = LINKEDIN_BASE_URL,
+                       clear_existing: bool = False):
+    """
+    Set li_at cookie ke browser lewat CDP Network.setCookie, tanpa page load,
+    sehingga navigasi pertama bisa langsung ke halaman profil
+    
+    Args:
+        clear_existing: Hapus semua cookie dulu (ganti akun di driver yang sama,
+            supaya JSESSIONID dkk. milik akun lama tidak ikut terkirim)
+    """
+    if clear_existing:
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            driver.delete_all_cookies()
+    
+    try:
+        driver.execute_cdp_cmd("Network.setCookie", li_at_cookie_params(li_at_cookie, base_url))
+        return
+    except Exception as e:
+        print(f"⚠ CDP Network.setCookie gagal, fallback ke add_cookie: {str(e)}")
+    
+    # Fallback: add_cookie hanya boleh untuk domain halaman yang sedang terbuka
+    driver.get(base_url)
+    fallback_cookie = {"name": "li_at", "value": li_at_cookie}
+    domain = cookie_domain(base_url)
+    if domain:
+        fallback_cookie["domain"] = domain
+    driver.add_cookie(fallback_cookie)
+
+
+def is_login_wall(url: str) -> bool:
+    """True jika URL adalah halaman login/authwall/checkpoint LinkedIn"""
+    path = urlparse(url or "").path
+    return any(path.startswith(login_path) for login_path in LOGIN_WALL_PATHS)
+
+
+def is_profile_missing(url: str) -> bool:
+    """True jika URL adalah halaman 404 / profil tidak tersedia LinkedIn"""
+    path = urlparse(url or "").path
+    return any(path.startswith(missing_path) for missing_path in PROFILE_MISSING_PATHS)
+
+
+def check_session(driver, base_url: str = LINKEDIN_BASE_URL, timeout: float = 15.0) -> Dict:
+    """
+    Cek apakah session li_at di driver masih login dengan membuka /feed/
+    
+    Returns:
+        {"valid": bool, "url": URL akhir setelah redirect, "checked_at": epoch}
+    """
+    checked_at = time.time()
+    try:
+        driver.set_page_load_timeout(timeout)
+        driver.get(f"{base_url.rstrip('/')}/feed/")
+        url = driver.current_url
+    except Exception as e:
+        return {"valid": False, "url": None, "error": str(e), "checked_at": checked_at}
+    return {"valid": not is_login_wall(url), "url": url, "checked_at": checked_at}
+
+
+class LinkedInScraper(ScrapeState):
+    def __init__(self, li_at_cookie: str, driver=None, extraction_mode: str = "webdriver",
+                 load_budget: float = 10.0, settle_ms: int = 300, section_wait: float = 2.0,
+                 base_url: str = LINKEDIN_BASE_URL, skills_generator=None,
+                 ai_prefetch: bool = False, ai_timeout: float = 20.0, parallel_skills: bool = True,
+                 blocked_url_patterns: Optional[List[str]] = None, http_client=None, page_archive=None,
+                 deadline: Optional[float] = None):
         """
         Inisialisasi LinkedIn Scraper dengan li_at cookie
         
         Args:
             li_at_cookie: LinkedIn session cookie (li_at value)
+            driver: WebDriver pinjaman (misal dari DriverPool) yang sudah
+                ter-autentikasi. Jika diisi, scraper tidak launch browser
+                sendiri, tidak set cookie ulang, dan tidak quit driver.
+            extraction_mode: "webdriver" (find_elements per field) atau
+                "js" (satu execute_script per halaman)
+            load_budget: Detik maksimal adaptive scroll untuk memuat section
+            settle_ms: Lama DOM harus tenang (tanpa mutation) sebelum scroll berikutnya
+            section_wait: Detik maksimal menunggu item list section setelah scrollIntoView
+            base_url: Origin LinkedIn; bisa diarahkan ke stand-in lokal untuk benchmark
+            skills_generator: SkillsGenerator untuk fallback AI (default: instance bersama)
+            ai_prefetch: Kirim request Gemini begitu halaman utama selesai di-extract,
+                paralel dengan halaman skills (hasil dipakai hanya jika skills gagal)
+            ai_timeout: Detik maksimal menunggu hasil Gemini
+            parallel_skills: Load halaman skills di tab kedua selama halaman
+                profil di-scroll dan di-extract (False: navigasi serial seperti dulu)
+            blocked_url_patterns: Pola URL yang diblok via CDP (default
+                DEFAULT_BLOCKED_URL_PATTERNS, [] untuk tanpa blocking)
+            http_client: VoyagerClient untuk fast path JSON tanpa browser; jika
+                gagal, scrape dilanjutkan dengan Selenium
+            page_archive: PageArchive untuk menyimpan HTML halaman profil dan
+                skills yang sudah di-render (extract ulang offline)
+            deadline: Batas waktu scrape (nilai time.monotonic()). Setiap wait
+                dipersingkat supaya tidak melewatinya; section opsional
+                (OPTIONAL_SECTIONS) dan AI fallback dilewati jika sisa waktu kurang
+                dari DEADLINE_RESERVE_SECONDS; scroll section lazy menyisakan
+                DEADLINE_EXTRACT_SECONDS untuk extract. None = tanpa deadline.
         """
-        self.li_at_cookie = li_at_cookie
-        self.driver = None
-        
+        self._init_state(li_at_cookie, load_budget, settle_ms, base_url, skills_generator, ai_prefetch,
+                         ai_timeout, parallel_skills, page_archive, deadline)
+        self.driver = driver
+        self.owns_driver = driver is None
+        self.extraction_mode = extraction_mode
+        self.section_wait = section_wait
+        self.main_tab = None
+        self.skills_tab = None
+        self.blocked_url_patterns = (DEFAULT_BLOCKED_URL_PATTERNS if blocked_url_patterns is None
+                                     else blocked_url_patterns)
+        self.http_client = http_client
+        self.http_attempted = False
+    
+    def attach_driver(self, driver):
+        """Pakai driver pinjaman (misal dari DriverPool) untuk scrape berikutnya"""
+        self.driver = driver
+        self.owns_driver = False
+    
     def _init_driver(self):
         """Inisialisasi Selenium WebDriver"""
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--disable-images")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-extensions")
-        
-        # Suppress Chrome logging
-        chrome_options.add_argument("--log-level=3")
-        chrome_options.add_argument("--silent")
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
+        self.driver = create_driver(self.blocked_url_patterns)
         
     def _set_cookie(self):
         """Set li_at cookie ke browser"""
-        self.driver.get("https://www.linkedin.com")
-        time.sleep(2)
-        
-        self.driver.add_cookie({
-            "name": "li_at",
-            "value": self.li_at_cookie,
-            "domain": ".linkedin.com"
-        })
-        
-        time.sleep(1)
+        apply_li_at_cookie(self.driver, self.li_at_cookie, self.base_url)
     
-    def _scroll_and_wait(self, pixels: int = 500, wait_time: float = 1.5):
-        """Scroll dan tunggu untuk trigger lazy loading"""
-        self.driver.execute_script(f"window.scrollBy(0, {pixels});")
-        time.sleep(wait_time)
+    def _navigate(self, url: str):
+        """Buka URL di driver dan hitung jumlah page load"""
+        self.driver.get(url)
+        self.pages_loaded += 1
     
-    def _clean_text(self, text: str) -> Optional[str]:
-        """Bersihkan text dari duplikasi dan whitespace"""
-        if not text:
-            return None
+    def _report_network(self):
+        """Kumpulkan jumlah request, request yang diblok dan byte yang ditransfer"""
+        self.network = collect_network_stats(self.driver)
+        if self.network:
+            print(f"[NETWORK] {self.network['requests']} request(s), {self.network['blocked']} blocked "
+                  f"{self.network['blocked_by_type']}, {self.network['bytes'] / 1024:.1f} KiB transferred")
+    
+    def _load_sections(self, kinds: List[str]) -> Dict:
+        """
+        Adaptive scroll untuk trigger lazy loading: berhenti begitu section
+        kinds (misal experience, education, certifications) ada, halaman
+        mentok, atau load_budget habis (lihat WAIT_FOR_SECTIONS_JS)
+        """
+        budget = self._wait_budget(self.load_budget, reserve=DEADLINE_EXTRACT_SECONDS)
+        result = {}
+        if budget > 0:
+            self.driver.set_script_timeout(budget + 5)
+            try:
+                result = self.driver.execute_async_script(
+                    WAIT_FOR_SECTIONS_JS, int(budget * 1000), self.settle_ms, 600,
+                    {kind: SECTION_KEYWORDS[kind] for kind in kinds}
+                )
+                print(f"[SCRAPER] Sections loaded ({result.get('reason')}) after {result.get('steps')} scroll(s) "
+                      f"in {result.get('elapsed_ms')}ms: {result.get('found')}")
+            except Exception as e:
+                print(f"[SCRAPER] ⚠ Adaptive loading failed: {str(e)}")
+                return {}
+        self._note_lazy_cut_short(kinds, result, budget)
+        return result
+    
+    def _build_section_index(self) -> Dict[str, int]:
+        """
+        Scan semua section sekali per page load dan petakan jenis section
+        (experience, education, certifications, skills, about) ke nomor
+        section (1-based, sesuai XPath section[n])
         
-        lines = text.split('\n')
-        cleaned_lines = []
-        prev_line = None
+        Id section dicek lebih dulu di semua section, baru fallback ke heading
+        (lihat index_sections).
+        """
+        try:
+            WebDriverWait(self.driver, self._wait_budget(10)).until(
+                EC.presence_of_all_elements_located((By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section"))
+            )
+        except Exception as wait_err:
+            print(f"[SECTIONS] ⚠ Timeout waiting for sections: {str(wait_err)}")
         
-        for line in lines:
-            line = line.strip()
-            if line and line != prev_line:
-                cleaned_lines.append(line)
-                prev_line = line
+        try:
+            sections = self.driver.execute_script(SECTION_SUMMARY_JS) or []
+        except Exception as e:
+            print(f"[SECTIONS] Error reading sections: {str(e)}")
+            sections = []
+        print(f"[SECTIONS] Found {len(sections)} total sections")
         
-        result = '\n'.join(cleaned_lines).strip()
-        return result if result else None
+        index = index_sections(sections)
+        print(f"[SECTIONS] Section index: {index}")
+        self.section_index = index
+        return index
+    
+    def _scroll_section_into_view(self, section_idx: int):
+        """Scroll ke section dan tunggu item list-nya ter-render (maks section_wait detik)"""
+        section_xpath = f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{section_idx}]"
+        try:
+            section = self.driver.find_element(By.XPATH, section_xpath)
+            self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", section)
+            WebDriverWait(self.driver, self._wait_budget(self.section_wait)).until(
+                EC.presence_of_element_located((By.XPATH, f"{section_xpath}/div[3]/ul/li"))
+            )
+        except:
+            pass
     
     def _get_unique_text(self, element) -> Optional[str]:
         """
@@ -85,62 +304,101 @@ class LinkedInScraper:
         try:
             # Cari span dengan aria-hidden="true" (yang visible)
             visible_span = element.find_element(By.XPATH, ".//span[@aria-hidden='true']")
-            text = self._clean_text(visible_span.text)
+            text = clean_text(visible_span.text)
             return text
         except:
             # Fallback ke text biasa
-            return self._clean_text(element.text)
+            return clean_text(element.text)
     
-    def scrape_profile(self, vanity_name: str) -> Dict:
+    def scrape_profile(self, vanity_name: str, previous=None, fields: Optional[List[str]] = None) -> Dict:
         """
         Scrape profil LinkedIn berdasarkan vanity name
         
         Args:
             vanity_name: Vanity name LinkedIn (contoh: naufal-arga-a5b22b2aa)
+            previous: ProfileSnapshot terakhir (lihat profile_snapshots) untuk
+                refresh incremental: hanya section yang berubah yang di-extract ulang
+            fields: Field yang dibutuhkan (lihat profile_snapshots.PROFILE_FIELDS);
+                section lain tidak di-scroll/di-extract, halaman skills dan AI
+                fallback hanya jika skills diminta. None = semua field.
             
         Returns:
             Dictionary berisi data profil
         """
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        started = self.started_at
+        self._select_fields(fields)
+        if fields is not None:
+            # Hasil parsial tidak bisa dibandingkan dengan snapshot penuh
+            previous = None
         try:
             print(f"\n{'='*60}")
             print(f"[SCRAPER] Starting profile scrape for: {vanity_name}")
             print(f"{'='*60}\n")
             
-            self._init_driver()
-            self._set_cookie()
-            
-            profile_url = f"https://www.linkedin.com/in/{vanity_name}/"
+            # Fast path JSON tanpa browser; Selenium hanya jika gagal
+            if self.http_client and not self.http_attempted:
+                result = self.scrape_profile_http(vanity_name, previous, fields)
+                if result is not None:
+                    return result
+            
+            self.engine = "selenium"
+            self.vanity_name = vanity_name
+            self.scrape_id = uuid.uuid4().hex[:12]
+            if self.owns_driver:
+                with self._span("driver_init"):
+                    self._init_driver()
+                with self._span("cookie_set"):
+                    self._set_cookie()
+            
+            # Hanya hitung traffic scrape ini
+            drain_network_log(self.driver)
+            
+            profile_url = f"{self.base_url}/in/{vanity_name}/"
             print(f"[SCRAPER] Loading URL: {profile_url}")
-            self.driver.get(profile_url)
-            
-            # Wait for profile content to load
-            try:
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.ID, "profile-content"))
-                )
-                print("✓ Profile content loaded")
-            except:
-                print("⚠ Timeout waiting for profile-content, continuing anyway...")
-                time.sleep(3)
-            
-            # Progressive scroll untuk trigger lazy loading semua section
-            print("[SCRAPER] Scrolling to load all sections...")
-            for i in range(5):
-                self._scroll_and_wait(600, 1.0)
-                print(f"[SCRAPER] Scroll iteration {i+1}/5 completed")
-            
-            # Scroll back to top
-            self.driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
+            with self._span("navigation"):
+                self._navigate(profile_url)
+                
+                # Halaman skills mulai di-load di tab kedua, paralel dengan scroll + extract.
+                # Saat refresh, skills baru di-load jika sinyalnya berubah
+                if self.parallel_skills and previous is None and "skills" in self.sections:
+                    self._open_skills_tab(vanity_name)
+                
+                # Wait for profile content to load
+                try:
+                    WebDriverWait(self.driver, self._wait_budget(20)).until(
+                        EC.presence_of_element_located((By.ID, "profile-content"))
+                    )
+                    print("✓ Profile content loaded")
+                except:
+                    print("⚠ Timeout waiting for profile-content, continuing anyway...")
+            
+            # Session ditolak: jangan extract halaman login sebagai profil
+            if is_login_wall(self.driver.current_url):
+                self.login_wall = self.driver.current_url
+                raise RuntimeError(f"Session LinkedIn diarahkan ke {self.login_wall}")
+            if is_profile_missing(self.driver.current_url):
+                return self._not_found_result(self.driver.current_url)
+            
+            # Adaptive scroll untuk trigger lazy loading section (kembali ke atas setelahnya)
+            lazy_kinds = [kind for section, kind in LAZY_SECTION_KINDS.items() if section in self.sections]
+            if lazy_kinds:
+                print("[SCRAPER] Scrolling to load all sections...")
+                with self._span("scroll"):
+                    self._load_sections(lazy_kinds)
+            else:
+                print("[SCRAPER] Skipping scroll, no lazy section requested")
             
-            profile_data = self._extract_profile_data()
+            profile_data = self._extract_profile_data(previous)
             
-            print(f"\n[SCRAPER] Profile extraction completed")
+            print("\n[SCRAPER] Profile extraction completed")
             print(f"[SCRAPER] Response: {json.dumps(profile_data, indent=2, ensure_ascii=False)}\n")
             
             return profile_data
             
         except Exception as e:
+            self._record_error("scrape")
             error_msg = f"Error scraping profile: {str(e)}"
             print(f"\n[SCRAPER ERROR] {error_msg}")
             import traceback
@@ -151,149 +409,301 @@ class LinkedInScraper:
             }
         finally:
             if self.driver:
-                self.driver.quit()
+                self._report_network()
+            # Driver pinjaman dikembalikan ke pool oleh pemiliknya
+            if self.driver and not self.owns_driver:
+                self._close_skills_tab()
+            if self.driver and self.owns_driver:
+                with self._span("driver_quit"):
+                    quit_driver(self.driver)
+            self.timings["total"] = time.perf_counter() - started
     
-    def _extract_profile_data(self) -> Dict:
-        """Extract data dari halaman profil LinkedIn"""
+    def scrape_profile_http(self, vanity_name: str, previous=None, fields: Optional[List[str]] = None) -> Optional[Dict]:
+        """
+        Scrape lewat endpoint JSON LinkedIn (lihat voyager_client.VoyagerClient)
+        
+        Args:
+            previous: ProfileSnapshot terakhir; skills hasil AI di snapshot
+                dipakai ulang jika input prompt-nya tidak berubah
+            fields: Field yang dibutuhkan; endpoint skills dan AI fallback
+                hanya dipanggil jika skills diminta
+        
+        Returns:
+            Dictionary berisi data profil (bentuk sama dengan scrape_profile),
+            atau None jika fast path gagal dan caller perlu fallback ke Selenium
+        """
+        if self.started_at is None:
+            self.started_at = time.perf_counter()
+        self.http_attempted = True
+        self._select_fields(fields)
+        if self._remaining() == 0:
+            print("[HTTP] Deadline habis, fast path dilewati")
+            return None
+        
+        include_skills = "skills" in self.sections
+        if include_skills and not self._has_time():
+            self._skip_section("skills")
+            include_skills = False
+        try:
+            with self._span("http_fetch"):
+                profile_data = self.http_client.fetch_profile(vanity_name, include_skills=include_skills,
+                                                              deadline=self.deadline)
+        except Exception as e:
+            self._record_error("http_fast_path")
+            # VoyagerAuthError: session ditolak, bukan sekadar endpoint gagal
+            if getattr(e, "session_rejected", False):
+                self.login_wall = str(e)
+            # Profil memang tidak ada: Selenium juga tidak akan menemukannya
+            if getattr(e, "profile_missing", False):
+                self.engine = "http"
+                return self._not_found_result(str(e))
+            print(f"[HTTP] ⚠ Fast path gagal, fallback ke Selenium: {str(e)}")
+            return None
+        
+        self.engine = "http"
+        if "skills" not in self.sections or "skills" in self.skipped_sections:
+            pass
+        elif profile_data.get("skills"):
+            self.skills_source = "api"
+        elif previous is not None and previous.skills_source == "ai" and self._reusable_skills(profile_data, previous):
+            profile_data["skills"] = previous.data["skills"]
+            self.skills_source = "ai"
+            self.reused_sections = ["skills"]
+        elif not self._has_time():
+            self._skip_section("skills")
+        else:
+            profile_data["skills"] = self._fallback_skills(profile_data)
+        
+        self.timings["total"] = time.perf_counter() - self.started_at
+        print(f"[HTTP] ✓ Profile fetched via JSON endpoints in {self.timings['http_fetch'] * 1000:.0f}ms")
+        return self._result(profile_data)
+    
+    def _fallback_skills(self, profile_data: Dict, future=None) -> str:
+        """Generate skills dengan AI jika skills dari LinkedIn kosong"""
+        print("[SKILLS] Ekstraksi skills gagal, mencoba generate dengan AI...")
+        with self._span("ai_fallback"):
+            skills = self._generate_skills_with_ai(
+                headline=profile_data.get("headline", ""),
+                about=profile_data.get("about", ""),
+                experiences=profile_data.get("experiences", []),
+                future=future
+            )
+        return self._ai_skills_result(skills)
+    
+    def _extract_profile_data(self, previous=None) -> Dict:
+        """
+        Extract data dari halaman profil LinkedIn
+        
+        Args:
+            previous: ProfileSnapshot terakhir; jika diisi, section yang sinyal
+                halamannya sama dengan snapshot tidak di-extract ulang
+        """
         data = {
             "data": {},
             "message": "ok"
         }
         
         try:
-            profile_data = {}
+            # Section di-scan sekali, semua extractor memakai index yang sama
+            with self._span("section_index"):
+                self._build_section_index()
+            # Sinyal hanya berarti untuk scrape penuh (disimpan ke snapshot)
+            if self.fields is None:
+                with self._span("signals"):
+                    self.signals = self._page_signals()
+            
+            page_sections = self._page_sections(previous)
+            if not page_sections:
+                profile_data = {}
+            elif self.extraction_mode == "js":
+                with self._span("extract_main_js"):
+                    profile_data = self._extract_main_page_js(page_sections)
+            else:
+                profile_data = self._extract_main_page_webdriver(page_sections)
+            self._archive_page("profile")
+            profile_data = self._merge_reused(profile_data, previous)
+            
+            skills = self._reused_skills(profile_data, previous)
+            if self._needs_skills(skills):
+                # Prefetch: request Gemini berjalan paralel dengan load halaman skills
+                ai_future = self._submit_ai_skills(profile_data) if self.ai_prefetch else None
+                
+                # Extract skills dengan fallback ke AI generation
+                with self._span("skills"):
+                    skills = self._extract_skills()
+                if skills:
+                    self.skills_source = "page"
+                elif self._optional_sections(["skills"]):
+                    skills = self._fallback_skills(profile_data, future=ai_future)
             
-            # Full Name - dengan aria-hidden handling
-            # Full Name - XPath: /html/body/div[7]/div[3]/div/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[1]/span[1]/a/h1
-            try:
-                name_elem = self.driver.find_element(By.XPATH, "/html/body/div[6]/div[3]/div/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[1]/span[1]/a/h1")
-                full_name = self._clean_text(name_elem.text)
-                profile_data["full_name"] = full_name
-            except:
-                profile_data["full_name"] = None
+            profile_data["skills"] = skills
             
-            # Headline
-            try:
-                headline_elem = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[2]")
-                profile_data["headline"] = self._clean_text(headline_elem.text)
-            except:
-                profile_data["headline"] = None
+            return self._result(profile_data)
             
-            # Location
-            try:
-                location_elem = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[2]/span[1]")
-                profile_data["location"] = self._clean_text(location_elem.text)
-            except:
-                profile_data["location"] = None
+        except Exception as e:
+            self._record_error("profile_data")
+            print(f"Error extracting profile data: {str(e)}")
+            return data
+    
+    def _archive_page(self, kind: str):
+        """Simpan DOM tab aktif ke page_archive (jika diaktifkan); gagal tidak menggagalkan scrape"""
+        if not self._archive_enabled():
+            return
+        try:
+            with self._span("archive"):
+                self.page_archive.save(
+                    self.vanity_name, self.scrape_id, kind, self.driver.page_source, self.driver.current_url,
+                    metadata=self._archive_metadata(kind)
+                )
+        except Exception as e:
+            self._record_error("archive")
+            print(f"[ARCHIVE] ⚠ Gagal menyimpan halaman {kind}: {str(e)}")
+    
+    def _page_signals(self) -> Dict[str, Dict]:
+        """
+        Sinyal murah per section (jumlah item + hash textContent, lihat
+        PAGE_SIGNALS_JS) untuk mendeteksi perubahan tanpa extract ulang
+        
+        Returns:
+            {section: {"count", "hash"}}, atau {} jika gagal (refresh jadi full)
+        """
+        try:
+            raw = self.driver.execute_script(PAGE_SIGNALS_JS, self.section_index, about_candidates(self.section_index)) or {}
+        except Exception as e:
+            self._record_error("signals")
+            print(f"[REFRESH] ⚠ Gagal membaca sinyal halaman: {str(e)}")
+            return {}
+        return self._signals_from_raw(raw)
+    
+    def _extract_main_page_webdriver(self, sections: Optional[List[str]] = None) -> Dict:
+        """
+        Extract top card, about dan section list dengan WebDriver call per element
+        
+        Args:
+            sections: Section yang di-extract (default semua, lihat PROFILE_SECTIONS)
+        """
+        sections = PROFILE_SECTIONS if sections is None else sections
+        profile_data = {}
+        with self._span("extract_top_card"):
+            if "top_card" in sections:
+                self._extract_top_card_webdriver(profile_data)
+            if "about" in sections:
+                self._extract_about_webdriver(profile_data)
+        
+        # Extract sections (sudah di-scroll sebelumnya)
+        if "experiences" in sections:
+            with self._span("extract_experiences"):
+                profile_data["experiences"] = self._extract_experiences()
+        if "educations" in sections:
+            with self._span("extract_education"):
+                profile_data["educations"] = self._extract_education()
+        if "certifications" in sections and self._optional_sections(["certifications"]):
+            with self._span("extract_certifications"):
+                profile_data["certifications"] = self._extract_certifications()
+        
+        return profile_data
+    
+    def _extract_top_card_webdriver(self, profile_data: Dict):
+        """Extract full name, headline dan location ke profile_data"""
+        # Full Name - dengan aria-hidden handling
+        # Full Name - XPath: /html/body/div[7]/div[3]/div/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[1]/span[1]/a/h1
+        try:
+            name_elem = self.driver.find_element(By.XPATH, "/html/body/div[6]/div[3]/div/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[1]/span[1]/a/h1")
+            full_name = clean_text(name_elem.text)
+            profile_data["full_name"] = full_name
+        except:
+            profile_data["full_name"] = None
+        
+        # Headline
+        try:
+            headline_elem = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[2]")
+            profile_data["headline"] = clean_text(headline_elem.text)
+        except:
+            profile_data["headline"] = None
+        
+        # Location
+        try:
+            location_elem = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[2]/span[1]")
+            profile_data["location"] = clean_text(location_elem.text)
+        except:
+            profile_data["location"] = None
+    
+    def _extract_about_webdriver(self, profile_data: Dict):
+        """Extract About (klik "see more" dulu) ke profile_data"""
+        try:
+            about_text = None
             
-            # About
-            try:
-                about_text = None
+            # Coba section About dari index dulu, lalu section[3] dan section[2]
+            for section_number in about_candidates(self.section_index):
+                section_xpath = f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{section_number}]"
                 
-                # Coba klik tombol "lihat lebih banyak" untuk section[3]
+                # Klik tombol "lihat lebih banyak" kalau ada
                 try:
-                    see_more_btn = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[3]/div[3]//button[contains(text(), 'lihat lebih banyak') or contains(text(), 'see more')]")
+                    see_more_btn = self.driver.find_element(By.XPATH, f"{section_xpath}/div[3]//button[contains(text(), 'lihat lebih banyak') or contains(text(), 'see more')]")
                     self.driver.execute_script("arguments[0].click();", see_more_btn)
-                    time.sleep(1)
+                    self._wait_expanded(see_more_btn)
                 except:
                     pass
                 
-                # Coba extract dari section[3] terlebih dahulu
                 try:
-                    about_elem = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[3]/div[3]/div/div/div/span[1]")
-                    about_text = self._clean_text(about_elem.text)
+                    about_elem = self.driver.find_element(By.XPATH, f"{section_xpath}/div[3]/div/div/div/span[1]")
+                    about_text = clean_text(about_elem.text)
                 except:
                     pass
                 
-                # Jika section[3] tidak ada, coba klik tombol "lihat lebih banyak" untuk section[2]
-                if not about_text:
-                    try:
-                        see_more_btn = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[2]/div[3]//button[contains(text(), 'lihat lebih banyak') or contains(text(), 'see more')]")
-                        self.driver.execute_script("arguments[0].click();", see_more_btn)
-                        time.sleep(1)
-                    except:
-                        pass
-                    
-                    # Extract dari section[2]
-                    try:
-                        about_elem = self.driver.find_element(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section[2]/div[3]/div/div/div/span[1]")
-                        about_text = self._clean_text(about_elem.text)
-                    except:
-                        pass
-                
-                profile_data["about"] = about_text if about_text else None
-            except:
-                profile_data["about"] = None
-            
-            # Extract sections (sudah di-scroll sebelumnya)
-            profile_data["experiences"] = self._extract_experiences()
-            profile_data["educations"] = self._extract_education()
-            profile_data["certifications"] = self._extract_certifications()
-            
-            # Extract skills dengan fallback ke AI generation
-            skills = self._extract_skills()
-            if not skills:
-                print("[SKILLS] Ekstraksi skills gagal, mencoba generate dengan AI...")
-                skills = self._generate_skills_with_ai(
-                    headline=profile_data.get("headline", ""),
-                    about=profile_data.get("about", ""),
-                    experiences=profile_data.get("experiences", [])
-                )
-                if skills:
-                    print(f"[SKILLS] AI generation berhasil: {skills}")
-                else:
-                    print("[SKILLS] AI generation juga gagal")
-            
-            profile_data["skills"] = skills
-            
-            data["data"] = profile_data
-            return data
+                if about_text:
+                    break
             
+            profile_data["about"] = about_text if about_text else None
+        except:
+            self._record_error("about")
+            profile_data["about"] = None
+    
+    def _wait_expanded(self, see_more_btn):
+        """Tunggu tombol "see more" hilang setelah diklik (maks ABOUT_EXPAND_SECONDS)"""
+        try:
+            WebDriverWait(self.driver, self._wait_budget(ABOUT_EXPAND_SECONDS)).until(EC.invisibility_of_element(see_more_btn))
+        except:
+            pass
+    
+    def _extract_main_page_js(self, sections: Optional[List[str]] = None) -> Dict:
+        """
+        Extract top card, about, experiences, educations dan certifications
+        dengan satu execute_script (lihat extraction_script.py)
+        
+        Args:
+            sections: Section yang di-extract (default semua, lihat PROFILE_SECTIONS)
+        """
+        sections = PROFILE_SECTIONS if sections is None else sections
+        if "about" in sections:
+            self._expand_about_js()
+        print("[EXTRACT_JS] Running in-browser extraction...")
+        raw = self.driver.execute_script(
+            PROFILE_EXTRACTION_JS, self.section_index, about_candidates(self.section_index), list(sections)
+        ) or {}
+        return self._parse_main_page(raw, sections)
+    
+    def _expand_about_js(self):
+        """Klik "see more" About dan tunggu teks lengkapnya dirender (lihat EXPAND_ABOUT_JS)"""
+        budget = self._wait_budget(ABOUT_EXPAND_SECONDS)
+        self.driver.set_script_timeout(budget + 5)
+        try:
+            result = self.driver.execute_async_script(
+                EXPAND_ABOUT_JS, about_candidates(self.section_index), int(budget * 1000)
+            ) or {}
         except Exception as e:
-            print(f"Error extracting profile data: {str(e)}")
-            return data
+            print(f"[EXTRACT_JS] ⚠ Expand About gagal: {str(e)}")
+            return
+        if result.get("clicked") and not result.get("expanded"):
+            print(f"[EXTRACT_JS] ⚠ About belum terbuka setelah {result.get('elapsed_ms')}ms")
     
     def _extract_experiences(self) -> List[Dict]:
         """Extract pengalaman kerja dengan handling duplikasi LinkedIn"""
         experiences = []
         try:
-            print(f"\n[EXTRACT_EXP] Starting experience extraction...")
+            print("\n[EXTRACT_EXP] Starting experience extraction...")
             
-            # Wait for sections to be available
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section"))
-                )
-                print("[EXTRACT_EXP] Sections loaded successfully")
-            except Exception as wait_err:
-                print(f"[EXTRACT_EXP] ⚠ Timeout waiting for sections: {str(wait_err)}")
-            
-            # Cari semua section untuk detect experience
-            sections = self.driver.find_elements(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section")
-            print(f"[EXTRACT_EXP] Found {len(sections)} total sections")
-            
-            exp_section_idx = None
-            
-            for idx, section in enumerate(sections, start=1):
-                try:
-                    section_id = section.get_attribute("id")
-                    if section_id and "experience" in section_id.lower():
-                        exp_section_idx = idx
-                        break
-                except:
-                    pass
-            
-            if not exp_section_idx:
-                # Fallback: cek berdasarkan heading
-                for idx, section in enumerate(sections, start=1):
-                    try:
-                        heading = section.find_element(By.TAG_NAME, "h2").text.lower()
-                        print(f"Section {idx} heading: {heading}")
-                        if "pengalaman" in heading or "experience" in heading:
-                            exp_section_idx = idx
-                            break
-                    except:
-                        pass
+            exp_section_idx = self.section_index.get("experience")
             
             if not exp_section_idx:
                 print("❌ Experience section not found")
@@ -302,12 +712,7 @@ class LinkedInScraper:
             print(f"✓ Experience section found at index: {exp_section_idx}")
             
             # Scroll ke section experience
-            try:
-                exp_section = self.driver.find_element(By.XPATH, f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{exp_section_idx}]")
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", exp_section)
-                time.sleep(1)
-            except:
-                pass
+            self._scroll_section_into_view(exp_section_idx)
             
             # Ambil list items dari experience section
             exp_items = self.driver.find_elements(By.XPATH, f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{exp_section_idx}]/div[3]/ul/li")
@@ -321,47 +726,22 @@ class LinkedInScraper:
                     texts = []
                     
                     for span in visible_spans:
-                        text = self._clean_text(span.text)
+                        text = clean_text(span.text)
                         if text and text not in texts:  # Avoid duplicates
                             texts.append(text)
                     
                     print(f"Experience item {idx} extracted texts: {texts}")
                     
-                    # LinkedIn experience pattern biasanya:
-                    # [0] = Title
-                    # [1] = Company · Employment type
-                    # [2] = Date range
-                    # [3] = Location (optional)
-                    
-                    if len(texts) >= 3:
-                        title = texts[0]
-                        company_raw = texts[1]
-                        date_range = texts[2]
-                        location = texts[3] if len(texts) > 3 else None
-                        
-                        # Parse company (remove employment type if exists)
-                        # e.g., "PaperPlay Studio · Magang" -> "PaperPlay Studio"
-                        company = company_raw.split('·')[0].strip() if '·' in company_raw else company_raw
-                        
-                        # Validasi: title dan company tidak boleh sama (indikator education)
-                        if title != company:
-                            exp_data = {
-                                "title": title,
-                                "company": company,
-                                "date_range": date_range,
-                                "location": location
-                            }
-                            experiences.append(exp_data)
-                            print(f"✓ Experience {idx}: {title} at {company}")
-                        else:
-                            print(f"✗ Experience {idx} skipped - title == company (likely education)")
-                    else:
-                        print(f"✗ Experience {idx} skipped - insufficient data (only {len(texts)} fields)")
+                    exp_data = parse_experience_texts(idx, texts)
+                    if exp_data:
+                        experiences.append(exp_data)
                         
                 except Exception as e:
+                    self._record_error("experiences")
                     print(f"Error parsing experience item {idx}: {str(e)}")
                     
         except Exception as e:
+            self._record_error("experiences")
             print(f"[EXTRACT_EXP] Error extracting experiences: {str(e)}")
             import traceback
             print(f"[EXTRACT_EXP] Traceback: {traceback.format_exc()}")
@@ -374,41 +754,9 @@ class LinkedInScraper:
         """Extract pendidikan dengan handling duplikasi LinkedIn"""
         education = []
         try:
-            print(f"\n[EXTRACT_EDU] Starting education extraction...")
-            
-            # Wait for sections
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section"))
-                )
-                print("[EXTRACT_EDU] Sections loaded successfully")
-            except Exception as wait_err:
-                print(f"[EXTRACT_EDU] ⚠ Timeout waiting for sections: {str(wait_err)}")
+            print("\n[EXTRACT_EDU] Starting education extraction...")
             
-            # Cari education section
-            sections = self.driver.find_elements(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section")
-            print(f"[EXTRACT_EDU] Found {len(sections)} total sections")
-            edu_section_idx = None
-            
-            for idx, section in enumerate(sections, start=1):
-                try:
-                    section_id = section.get_attribute("id")
-                    if section_id and "education" in section_id.lower():
-                        edu_section_idx = idx
-                        break
-                except:
-                    pass
-            
-            if not edu_section_idx:
-                # Fallback: cek berdasarkan heading
-                for idx, section in enumerate(sections, start=1):
-                    try:
-                        heading = section.find_element(By.TAG_NAME, "h2").text.lower()
-                        if "pendidikan" in heading or "education" in heading:
-                            edu_section_idx = idx
-                            break
-                    except:
-                        pass
+            edu_section_idx = self.section_index.get("education")
             
             if not edu_section_idx:
                 print("❌ Education section not found")
@@ -417,12 +765,7 @@ class LinkedInScraper:
             print(f"✓ Education section found at index: {edu_section_idx}")
             
             # Scroll ke section education
-            try:
-                edu_section = self.driver.find_element(By.XPATH, f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{edu_section_idx}]")
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", edu_section)
-                time.sleep(1)
-            except:
-                pass
+            self._scroll_section_into_view(edu_section_idx)
             
             # Ambil list items
             edu_items = self.driver.find_elements(By.XPATH, f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{edu_section_idx}]/div[3]/ul/li")
@@ -435,40 +778,22 @@ class LinkedInScraper:
                     texts = []
                     
                     for span in visible_spans:
-                        text = self._clean_text(span.text)
+                        text = clean_text(span.text)
                         if text and text not in texts:
                             texts.append(text)
                     
                     print(f"Education item {idx} extracted texts: {texts}")
                     
-                    # LinkedIn education pattern:
-                    # [0] = School name
-                    # [1] = Degree / Field of study
-                    # [2] = Date range
-                    
-                    if len(texts) >= 3:
-                        school = texts[0]
-                        degree = texts[1]
-                        date_range = texts[2]
-                        
-                        # Validasi: school dan degree tidak boleh sama persis
-                        if school != degree:
-                            edu_data = {
-                                "school": school,
-                                "degree": degree,
-                                "date_range": date_range
-                            }
-                            education.append(edu_data)
-                            print(f"✓ Education {idx}: {degree} at {school}")
-                        else:
-                            print(f"✗ Education {idx} skipped - school == degree (malformed data)")
-                    else:
-                        print(f"✗ Education {idx} skipped - insufficient data (only {len(texts)} fields)")
+                    edu_data = parse_education_texts(idx, texts)
+                    if edu_data:
+                        education.append(edu_data)
                         
                 except Exception as e:
+                    self._record_error("education")
                     print(f"Error parsing education item {idx}: {str(e)}")
                     
         except Exception as e:
+            self._record_error("education")
             print(f"[EXTRACT_EDU] Error extracting education: {str(e)}")
             import traceback
             print(f"[EXTRACT_EDU] Traceback: {traceback.format_exc()}")
@@ -481,37 +806,7 @@ class LinkedInScraper:
         """Extract certifications dengan handling duplikasi"""
         certifications = []
         try:
-            # Wait for sections
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_all_elements_located((By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section"))
-                )
-            except:
-                pass
-            
-            # Cari certification section
-            sections = self.driver.find_elements(By.XPATH, "//*[@id='profile-content']/div/div[2]/div/div/main/section")
-            cert_section_idx = None
-            
-            for idx, section in enumerate(sections, start=1):
-                try:
-                    section_id = section.get_attribute("id")
-                    if section_id and ("certification" in section_id.lower() or "license" in section_id.lower()):
-                        cert_section_idx = idx
-                        break
-                except:
-                    pass
-            
-            if not cert_section_idx:
-                # Fallback: cek berdasarkan heading
-                for idx, section in enumerate(sections, start=1):
-                    try:
-                        heading = section.find_element(By.TAG_NAME, "h2").text.lower()
-                        if "sertifikat" in heading or "license" in heading or "certification" in heading:
-                            cert_section_idx = idx
-                            break
-                    except:
-                        pass
+            cert_section_idx = self.section_index.get("certifications")
             
             if not cert_section_idx:
                 print("❌ Certifications section not found")
@@ -520,12 +815,7 @@ class LinkedInScraper:
             print(f"✓ Certifications section found at index: {cert_section_idx}")
             
             # Scroll ke section certifications
-            try:
-                cert_section = self.driver.find_element(By.XPATH, f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{cert_section_idx}]")
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", cert_section)
-                time.sleep(1)
-            except:
-                pass
+            self._scroll_section_into_view(cert_section_idx)
             
             cert_items = self.driver.find_elements(By.XPATH, f"//*[@id='profile-content']/div/div[2]/div/div/main/section[{cert_section_idx}]/div[3]/ul/li")
             print(f"Found {len(cert_items)} certification items")
@@ -537,129 +827,155 @@ class LinkedInScraper:
                     # Extract name
                     try:
                         name_elem = item.find_element(By.XPATH, ".//div/div[2]/div[1]/a/div/div/div/div/span[1]")
-                        cert_data["name"] = self._clean_text(name_elem.text)
+                        cert_data["name"] = clean_text(name_elem.text)
                     except:
                         try:
                             name_elem = item.find_element(By.XPATH, ".//span[@aria-hidden='true']")
-                            cert_data["name"] = self._clean_text(name_elem.text)
+                            cert_data["name"] = clean_text(name_elem.text)
                         except:
                             cert_data["name"] = None
                     
                     # Extract authority
                     try:
                         authority_elem = item.find_element(By.XPATH, ".//div/div[2]/div[1]/a/span[1]/span[1]")
-                        cert_data["authority"] = self._clean_text(authority_elem.text)
+                        cert_data["authority"] = clean_text(authority_elem.text)
                     except:
                         cert_data["authority"] = None
                     
                     # Extract issued date
                     try:
                         issued_elem = item.find_element(By.XPATH, ".//div/div[2]/div[1]/a/span[2]/span[1]")
-                        cert_data["issued"] = self._clean_text(issued_elem.text)
+                        cert_data["issued"] = clean_text(issued_elem.text)
                     except:
                         cert_data["issued"] = None
                     
                     # Extract credential ID
                     try:
                         credential_elem = item.find_element(By.XPATH, ".//div/div[2]/div[1]/a/span[3]/span[1]")
-                        cert_data["credential_id"] = self._clean_text(credential_elem.text)
+                        cert_data["credential_id"] = clean_text(credential_elem.text)
                     except:
                         cert_data["credential_id"] = None
                     
-                    # Hanya tambahkan jika ada name
-                    if cert_data.get("name"):
+                    if accept_certification(idx, cert_data):
                         certifications.append(cert_data)
-                        print(f"✓ Certification {idx}: {cert_data['name']}")
-                    else:
-                        print(f"✗ Certification {idx} skipped - no name found")
                         
                 except Exception as e:
+                    self._record_error("certifications")
                     print(f"Error parsing certification item {idx}: {str(e)}")
                     
         except Exception as e:
+            self._record_error("certifications")
             print(f"Error extracting certifications: {str(e)}")
         
         return certifications
     
-    def _generate_skills_with_ai(self, headline: str, about: str, experiences: List[Dict]) -> str:
-        """Generate skills menggunakan Gemini API berdasarkan headline, about, dan experience"""
+    def _generate_skills_with_ai(self, headline: str, about: str, experiences: List[Dict], future=None) -> str:
+        """
+        Generate skills menggunakan Gemini API berdasarkan headline, about, dan experience
+        
+        Args:
+            future: Hasil _submit_ai_skills yang sudah berjalan (prefetch); jika
+                None, request baru dikirim sekarang
+        """
         try:
-            gemini_api_key = os.getenv("GEMINI_API_KEY")
-            if not gemini_api_key:
-                print("⚠ GEMINI_API_KEY tidak diset, skip AI generation")
-                return ""
-            
-            genai.configure(api_key=gemini_api_key)
-            model = genai.GenerativeModel("gemini-2.5-flash")
-            
-            # Siapkan context dari experiences
-            experience_text = ""
-            if experiences:
-                for exp in experiences[:5]:  # Ambil 5 experience terakhir
-                    exp_text = f"- {exp.get('title', '')}"
-                    if exp.get('company'):
-                        exp_text += f" di {exp['company']}"
-                    if exp.get('description'):
-                        exp_text += f": {exp['description'][:100]}"
-                    experience_text += exp_text + "\n"
-            
-            # Buat prompt untuk Gemini
-            prompt = f"""Based on the following LinkedIn profile information, generate a list of relevant skills.
-
-Headline: {headline}
-
-About: {about}
-
-Experience:
-{experience_text}
-
-Provide the response in the format: skill1|skill2|skill3|skill4|skill5
-
-Only include relevant and specific skills, with no additional explanation. Maximum 10 skills."""
-            
-            print("[AI] Generating skills dengan Gemini...")
-            response = model.generate_content(prompt)
-            
-            if response.text:
-                skills_text = response.text.strip()
-                print(f"[AI] Generated skills: {skills_text}")
-                return skills_text
-            else:
-                print("[AI] Gemini response kosong")
-                return ""
-                
+            if future is None:
+                future = self._submit_ai_skills({
+                    "headline": headline,
+                    "about": about,
+                    "experiences": experiences
+                })
+            return future.result(timeout=self._wait_budget(self.ai_timeout))
+        
+        except FutureTimeoutError:
+            self._record_error("ai_fallback")
+            print(f"[AI ERROR] Gemini tidak merespon dalam {self._wait_budget(self.ai_timeout):.1f}s")
+            return ""
         except Exception as e:
+            self._record_error("ai_fallback")
             print(f"[AI ERROR] Error generating skills: {str(e)}")
             return ""
     
+    def _open_skills_tab(self, vanity_name: str):
+        """
+        Buka /details/skills/ di tab baru tanpa pindah fokus; browser me-load
+        halaman itu sementara tab profil di-scroll dan di-extract
+        """
+        skills_url = f"{self.base_url}/in/{vanity_name}/details/skills/"
+        try:
+            self.main_tab = self.driver.current_window_handle
+            existing = set(self.driver.window_handles)
+            self.driver.execute_script("window.open('about:blank', '_blank');")
+            new_tabs = [handle for handle in self.driver.window_handles if handle not in existing]
+            if new_tabs:
+                # Blocking CDP berlaku per tab: pasang dulu sebelum halaman skills di-load
+                self.skills_tab = new_tabs[0]
+                self.driver.switch_to.window(self.skills_tab)
+                apply_resource_blocking(self.driver, self.blocked_url_patterns)
+                self.driver.execute_script("window.location.href = arguments[0];", skills_url)
+                self.driver.switch_to.window(self.main_tab)
+                self.pages_loaded += 1
+                print(f"[SKILLS] Loading {skills_url} in background tab")
+        except Exception as e:
+            self._close_skills_tab()
+            print(f"[SKILLS] ⚠ Gagal membuka tab skills, fallback ke navigasi serial: {str(e)}")
+    
+    def _close_skills_tab(self):
+        """Tutup tab skills (jika masih terbuka) dan kembali ke tab profil"""
+        if not self.skills_tab:
+            return
+        try:
+            if self.skills_tab in self.driver.window_handles:
+                self.driver.switch_to.window(self.skills_tab)
+                self.driver.close()
+            self.driver.switch_to.window(self.main_tab)
+        except Exception as e:
+            print(f"[SKILLS] ⚠ Gagal menutup tab skills: {str(e)}")
+        finally:
+            self.skills_tab = None
+    
+    def _load_skill_texts(self) -> List[str]:
+        """Scroll/paginate list skills sampai lengkap (LOAD_SKILLS_JS) dan ambil semua teksnya"""
+        budget = self._wait_budget(self.load_budget, reserve=DEADLINE_EXTRACT_SECONDS)
+        self.driver.set_script_timeout(budget + 5)
+        try:
+            result = self.driver.execute_async_script(LOAD_SKILLS_JS, int(budget * 1000), self.settle_ms)
+            print(f"[SKILLS] List loaded ({result.get('reason')}) with {result.get('items')} item(s), "
+                  f"{result.get('pages')} page(s) in {result.get('elapsed_ms')}ms")
+            self._note_cut_short(["skills"], result, budget, {"skills": "skills"})
+            return result.get("skills") or []
+        except Exception as e:
+            print(f"[SKILLS] ⚠ Adaptive loading failed, reading visible skills only: {str(e)}")
+            # Ambil hanya span dengan aria-hidden="true" untuk avoid duplikasi
+            skill_elements = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'pvs-list__container')]//li//span[@aria-hidden='true']")
+            return [elem.text for elem in skill_elements]
+    
     def _extract_skills(self) -> str:
         """Extract skills dari halaman details/skills/"""
-        skills = []
         try:
-            profile_url = self.driver.current_url
-            skills_url = profile_url.rstrip("/") + "/details/skills/"
-            self.driver.get(skills_url)
+            if self.skills_tab:
+                # Halaman sudah di-load di background sejak navigasi profil
+                self.driver.switch_to.window(self.skills_tab)
+            else:
+                profile_url = self.driver.current_url
+                skills_url = profile_url.rstrip("/") + "/details/skills/"
+                self._navigate(skills_url)
             
             try:
-                WebDriverWait(self.driver, 10).until(
+                WebDriverWait(self.driver, self._wait_budget(10)).until(
                     EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'pvs-list__container')]"))
                 )
             except:
-                time.sleep(2)
+                print("⚠ Timeout waiting for skills list")
 
-            # Ambil hanya span dengan aria-hidden="true" untuk avoid duplikasi
-            skill_elements = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'pvs-list__container')]//li//span[@aria-hidden='true']")
-            
-            for elem in skill_elements:
-                skill_text = self._clean_text(elem.text)
-                # Filter: hanya ambil skill (biasanya pendek, < 50 karakter)
-                # Skip yang panjang (biasanya endorsement info)
-                if skill_text and len(skill_text) < 50 and skill_text not in skills:
-                    skills.append(skill_text)
+            skills = skills_from_texts(self._load_skill_texts())
+            self._archive_page("skills")
             
             print(f"Extracted {len(skills)} skills")
             return "|".join(skills) if skills else ""
             
         except Exception as e:
+            self._record_error("skills")
             print(f"Error extracting skills: {str(e)}")
             return ""
+        finally:
+            self._close_skills_tab()
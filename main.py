@@ -1,24 +1,825 @@
-from fastapi import FastAPI, Query
-from fastapi.responses import JSONResponse
-from linkedin_scraper_v2 import LinkedInScraper
+from fastapi import FastAPI, Header, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from linkedin_scraper_v2 import LINKEDIN_BASE_URL, LinkedInScraper, apply_li_at_cookie, check_session, create_driver
+from async_scraper import AsyncLinkedInScraper, check_session_cdp
+from cdp_browser import CDPBrowser
+from browser_watchdog import BrowserWatchdog, quit_driver
+from driver_pool import DriverPool
+from scrape_executor import (DEFAULT_LANES, ScrapeDeadlineExceeded, ScrapeExecutor, ScrapeQueueFull, default_reserved,
+                             parse_lane_values)
+from profile_cache import ProfileCache
+from scrape_state import PROFILE_NOT_FOUND_MESSAGE, remaining_seconds
+from single_flight import SingleFlight
+from ai_skills import get_skills_generator
+from resource_blocking import parse_blocked_url_patterns
+from voyager_client import VoyagerClient
+from account_pool import AccountPool, NoAccountAvailable
+from job_queue import create_job_queue
+from profile_snapshots import SnapshotStore, diff_profiles, parse_fields, project_fields
+from page_archive import PageArchive
+import metrics
 from dotenv import load_dotenv
+from typing import List, Optional, Tuple
+import asyncio
+import json
 import os
+import time
 
 # Load environment variables dari file .env
 load_dotenv()
 
 app = FastAPI()
 
-# Ambil li_at cookie dari file .env
-LI_AT_COOKIE = os.getenv("LINKEDIN_LI_AT", "")
+# Ambil li_at cookie dari file .env: satu akun (LINKEDIN_LI_AT) atau beberapa
+# akun dipisah koma (LINKEDIN_LI_AT_LIST)
+LI_AT_COOKIES = [cookie.strip() for cookie in os.getenv("LINKEDIN_LI_AT_LIST", "").split(",") if cookie.strip()]
+if not LI_AT_COOKIES and os.getenv("LINKEDIN_LI_AT"):
+    LI_AT_COOKIES = [os.getenv("LINKEDIN_LI_AT")]
+LI_AT_COOKIE = LI_AT_COOKIES[0] if LI_AT_COOKIES else ""
+
+# Rate limit per akun (token bucket; 0 = tanpa limit), lama quarantine setelah
+# login wall, dan berapa lama scrape menunggu akun yang tersedia
+ACCOUNT_RATE_PER_MINUTE = float(os.getenv("ACCOUNT_RATE_PER_MINUTE", "0"))
+ACCOUNT_BURST = int(os.getenv("ACCOUNT_BURST", "5"))
+ACCOUNT_QUARANTINE_SECONDS = float(os.getenv("ACCOUNT_QUARANTINE_SECONDS", "1800"))
+ACCOUNT_WAIT_SECONDS = float(os.getenv("ACCOUNT_WAIT_SECONDS", "30"))
+
+# Origin LinkedIn; arahkan ke stand-in lokal (benchmarks/stand_in_server.py) untuk benchmark
+LINKEDIN_URL = os.getenv("LINKEDIN_BASE_URL", LINKEDIN_BASE_URL)
+
+# Konfigurasi pool browser (0 = launch browser baru setiap request)
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+DRIVER_MAX_PAGES = int(os.getenv("DRIVER_MAX_PAGES", "50"))
+
+# Watchdog memori browser: driver (atau Chrome engine cdp) yang RSS tree
+# prosesnya / JS heap tab-nya melewati batas di-recycle (0 = tanpa batas), dan
+# proses Chrome yatim (driver.quit() gagal) dimatikan setiap interval
+BROWSER_MAX_RSS_MB = float(os.getenv("BROWSER_MAX_RSS_MB", "0"))
+BROWSER_MAX_JS_HEAP_MB = float(os.getenv("BROWSER_MAX_JS_HEAP_MB", "0"))
+BROWSER_WATCHDOG_INTERVAL = float(os.getenv("BROWSER_WATCHDOG_INTERVAL", "30"))
+KILL_ORPHAN_BROWSERS = os.getenv("KILL_ORPHAN_BROWSERS", "true").lower() in ("1", "true", "yes")
+
+# Mode extraction: "js" (satu execute_script per halaman) atau "webdriver"
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "js")
+
+# Budget maksimal (detik) adaptive scroll untuk memuat section profil
+LOAD_BUDGET_SECONDS = float(os.getenv("LOAD_BUDGET_SECONDS", "10"))
+
+# Fallback skills Gemini: kirim request paralel dengan halaman skills (opt-in; setiap
+# scrape tanpa cache jadi satu panggilan Gemini berbayar walau halaman skills berhasil),
+# dan batas waktu tunggu
+AI_SKILLS_PREFETCH = os.getenv("AI_SKILLS_PREFETCH", "false").lower() in ("1", "true", "yes")
+AI_SKILLS_TIMEOUT = float(os.getenv("AI_SKILLS_TIMEOUT", "20"))
+
+# Load halaman skills di tab kedua paralel dengan halaman profil
+SKILLS_PARALLEL_TAB = os.getenv("SKILLS_PARALLEL_TAB", "true").lower() in ("1", "true", "yes")
+
+# Engine scrape: "selenium" (browser), "http" (endpoint JSON LinkedIn, fallback ke Selenium)
+# atau "cdp" (asyncio, banyak scrape bersamaan di satu Chrome lewat CDP)
+SCRAPE_ENGINE = os.getenv("SCRAPE_ENGINE", "selenium")
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+
+# Engine cdp: binary Chrome (kosong = cari di PATH), jumlah scrape (browser
+# context) bersamaan di satu Chrome, dan restart Chrome setelah sekian halaman
+CHROME_BINARY = os.getenv("CHROME_BINARY") or None
+CDP_MAX_TABS = int(os.getenv("CDP_MAX_TABS", "16"))
+CDP_MAX_PAGES = int(os.getenv("CDP_MAX_PAGES", "500"))
+
+# Cek session li_at (buka /feed/) saat startup
+SESSION_CHECK_ON_STARTUP = os.getenv("SESSION_CHECK_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
+# Pola URL yang diblok via CDP (gambar, font, video, analytics); lihat resource_blocking.py
+BLOCKED_URL_PATTERNS = parse_blocked_url_patterns(os.getenv("BLOCKED_URL_PATTERNS"))
+
+# Konfigurasi concurrency scrape
+SCRAPE_MAX_IN_FLIGHT = int(os.getenv(
+    "SCRAPE_MAX_IN_FLIGHT", str(CDP_MAX_TABS if SCRAPE_ENGINE == "cdp" else max(DRIVER_POOL_SIZE, 1))
+))
+SCRAPE_MAX_QUEUE = int(os.getenv("SCRAPE_MAX_QUEUE", "10"))
+
+# Lane prioritas scrape, urut dari tertinggi: /profile memakai lane pertama,
+# batch /profiles dan refresh background lane terakhir. Slot in-flight yang
+# dipesan per lane (default satu slot per lane, lihat default_reserved), detik
+# sebelum lane yang tidak kebagian slot didahulukan (aging; 0 = mati, semua lane
+# wajib punya slot pesanan), batas antrian per lane (default SCRAPE_MAX_QUEUE)
+# dan per client (X-Client-Id atau IP; 0 = tanpa batas)
+SCRAPE_LANES = [lane.strip() for lane in os.getenv("SCRAPE_LANES", ",".join(DEFAULT_LANES)).split(",")
+                if lane.strip()]
+INTERACTIVE_LANE, BULK_LANE = SCRAPE_LANES[0], SCRAPE_LANES[-1]
+SCRAPE_LANE_RESERVED = (parse_lane_values(os.getenv("SCRAPE_LANE_RESERVED")) if os.getenv("SCRAPE_LANE_RESERVED")
+                        else default_reserved(SCRAPE_LANES, SCRAPE_MAX_IN_FLIGHT))
+SCRAPE_LANE_MAX_WAIT_SECONDS = float(os.getenv("SCRAPE_LANE_MAX_WAIT_SECONDS", "60"))
+SCRAPE_LANE_MAX_QUEUE = parse_lane_values(os.getenv("SCRAPE_LANE_MAX_QUEUE"))
+SCRAPE_CLIENT_MAX_QUEUE = int(os.getenv("SCRAPE_CLIENT_MAX_QUEUE", "0"))
+
+# Deadline default per request /profile (detik, 0 = tanpa deadline); bisa
+# diganti per request lewat ?deadline= atau header X-Deadline. Mendekati
+# deadline, certifications, halaman skills dan AI fallback dilewati dan
+# profil parsial dikembalikan dengan skipped_sections
+DEFAULT_DEADLINE_SECONDS = float(os.getenv("DEFAULT_DEADLINE_SECONDS", "0"))
+
+# Konfigurasi cache hasil scrape
+PROFILE_CACHE_DB = os.getenv("PROFILE_CACHE_DB", "profile_cache.sqlite3")
+PROFILE_CACHE_TTL = float(os.getenv("PROFILE_CACHE_TTL", "86400"))
+PROFILE_CACHE_STALE_TTL = float(os.getenv("PROFILE_CACHE_STALE_TTL", "3600"))
+PROFILE_CACHE_MEMORY_ENTRIES = int(os.getenv("PROFILE_CACHE_MEMORY_ENTRIES", "256"))
+PROFILE_CACHE_DISK_ENTRIES = int(os.getenv("PROFILE_CACHE_DISK_ENTRIES", "10000"))
+
+# Konfigurasi batch endpoint /profiles
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", str(SCRAPE_MAX_IN_FLIGHT)))
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "500"))
+BATCH_QUEUE_RETRIES = int(os.getenv("BATCH_QUEUE_RETRIES", "3"))
+
+# Refresh incremental: scrape ulang profil yang sudah punya snapshot hanya
+# meng-extract section yang berubah; full scrape tetap dipaksa setelah
+# PROFILE_FULL_REFRESH_SECONDS untuk menangkap perubahan yang lolos sinyal halaman
+INCREMENTAL_REFRESH = os.getenv("INCREMENTAL_REFRESH", "true").lower() in ("1", "true", "yes")
+PROFILE_FULL_REFRESH_SECONDS = float(os.getenv("PROFILE_FULL_REFRESH_SECONDS", "604800"))
+PROFILE_SNAPSHOT_DB = os.getenv("PROFILE_SNAPSHOT_DB", "profile_snapshots.sqlite3")
+PROFILE_SNAPSHOT_HISTORY = int(os.getenv("PROFILE_SNAPSHOT_HISTORY", "5"))
+
+# Simpan HTML halaman profil/skills yang sudah di-render (gzip) untuk extract
+# ulang offline dengan offline_extractor.py; kosong = tidak disimpan
+PAGE_ARCHIVE_DIR = os.getenv("PAGE_ARCHIVE_DIR", "")
+
+# Antrian job durable untuk worker.py (POST /jobs, GET /jobs/{id})
+JOB_QUEUE_URL = os.getenv("JOB_QUEUE_URL", "sqlite:///jobs.sqlite3")
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+driver_pool = None
+browser_watchdog = BrowserWatchdog(
+    max_rss_mb=BROWSER_MAX_RSS_MB,
+    max_js_heap_mb=BROWSER_MAX_JS_HEAP_MB,
+    interval=BROWSER_WATCHDOG_INTERVAL,
+    kill_orphans=KILL_ORPHAN_BROWSERS
+)
+# Satu Chrome bersama untuk engine cdp (dimulai di start_cdp_browser)
+cdp_browser = CDPBrowser(
+    chrome_path=CHROME_BINARY,
+    max_tabs=CDP_MAX_TABS,
+    max_pages=CDP_MAX_PAGES,
+    blocked_url_patterns=BLOCKED_URL_PATTERNS,
+    watchdog=browser_watchdog
+) if SCRAPE_ENGINE == "cdp" else None
+if cdp_browser:
+    browser_watchdog.watch(cdp_browser)
+# Hasil cek session saat startup (lihat check_linkedin_session)
+session_status = None
+account_pool = AccountPool(
+    LI_AT_COOKIES,
+    rate_per_minute=ACCOUNT_RATE_PER_MINUTE,
+    burst=ACCOUNT_BURST,
+    quarantine_seconds=ACCOUNT_QUARANTINE_SECONDS
+)
+# Client keep-alive untuk fast path JSON, satu per akun, dipakai bersama oleh semua scrape
+voyager_clients = {
+    account.account_id: VoyagerClient(
+        li_at_cookie=account.li_at_cookie,
+        base_url=LINKEDIN_URL,
+        timeout=HTTP_TIMEOUT_SECONDS,
+        pool_size=max(SCRAPE_MAX_IN_FLIGHT, 1)
+    )
+    for account in account_pool.accounts
+} if SCRAPE_ENGINE == "http" else {}
+profile_cache = ProfileCache(
+    db_path=PROFILE_CACHE_DB,
+    ttl=PROFILE_CACHE_TTL,
+    stale_ttl=PROFILE_CACHE_STALE_TTL,
+    max_memory_entries=PROFILE_CACHE_MEMORY_ENTRIES,
+    max_disk_entries=PROFILE_CACHE_DISK_ENTRIES
+)
+single_flight = SingleFlight()
+# Referensi task refresh background supaya tidak di-garbage-collect sebelum selesai
+background_tasks = set()
+snapshot_store = SnapshotStore(db_path=PROFILE_SNAPSHOT_DB, history=PROFILE_SNAPSHOT_HISTORY)
+page_archive = PageArchive(PAGE_ARCHIVE_DIR) if PAGE_ARCHIVE_DIR else None
+job_queue = create_job_queue(JOB_QUEUE_URL, max_attempts=JOB_MAX_ATTEMPTS)
+scrape_executor = ScrapeExecutor(
+    max_in_flight=SCRAPE_MAX_IN_FLIGHT,
+    max_queue=SCRAPE_MAX_QUEUE,
+    lanes=SCRAPE_LANES,
+    reserved=SCRAPE_LANE_RESERVED,
+    lane_max_queue=SCRAPE_LANE_MAX_QUEUE,
+    client_max_queue=SCRAPE_CLIENT_MAX_QUEUE,
+    max_wait=SCRAPE_LANE_MAX_WAIT_SECONDS
+)
+
+
+@app.on_event("startup")
+def start_driver_pool():
+    global driver_pool
+    if LI_AT_COOKIE and DRIVER_POOL_SIZE > 0 and cdp_browser is None:
+        driver_pool = DriverPool(
+            li_at_cookie=LI_AT_COOKIE,
+            size=DRIVER_POOL_SIZE,
+            max_pages_per_driver=DRIVER_MAX_PAGES,
+            base_url=LINKEDIN_URL,
+            blocked_url_patterns=BLOCKED_URL_PATTERNS,
+            watchdog=browser_watchdog
+        )
+        browser_watchdog.watch(driver_pool)
+        driver_pool.start()
+
+
+@app.on_event("startup")
+def start_browser_watchdog():
+    browser_watchdog.start()
+
+
+def check_accounts(driver) -> dict:
+    """Cek session setiap akun di satu driver; akun yang tidak login di-quarantine"""
+    valid = 0
+    for account in account_pool.accounts:
+        apply_li_at_cookie(driver, account.li_at_cookie, LINKEDIN_URL, clear_existing=True)
+        status = check_session(driver, LINKEDIN_URL)
+        if status["valid"]:
+            valid += 1
+        else:
+            account_pool.quarantine(account, f"startup check: {status.get('url') or status.get('error')}")
+    return {"valid": valid > 0, "valid_accounts": valid, "total_accounts": len(account_pool.accounts),
+            "checked_at": time.time()}
+
+
+@app.on_event("startup")
+def check_linkedin_session():
+    """Pastikan li_at masih login sebelum melayani request"""
+    global session_status
+    if not (LI_AT_COOKIES and SESSION_CHECK_ON_STARTUP) or cdp_browser:
+        return
+    try:
+        if driver_pool:
+            pooled = driver_pool.checkout()
+            try:
+                session_status = check_accounts(pooled.driver)
+            finally:
+                # Cookie driver sudah diganti: paksa switch akun di checkout berikutnya
+                pooled.account_id = None
+                driver_pool.checkin(pooled, pages_loaded=len(account_pool.accounts))
+            return
+        driver = create_driver(BLOCKED_URL_PATTERNS)
+        try:
+            session_status = check_accounts(driver)
+        finally:
+            quit_driver(driver)
+    except Exception as e:
+        session_status = {"valid": False, "url": None, "error": str(e), "checked_at": time.time()}
+    if not session_status["valid"]:
+        print(f"[STARTUP] ✗ LinkedIn session tidak valid: {session_status}")
+
+
+@app.on_event("startup")
+async def start_cdp_browser():
+    """Engine cdp: launch Chrome bersama lalu cek session setiap akun"""
+    global session_status
+    if not cdp_browser:
+        return
+    try:
+        await cdp_browser.start()
+        if not (LI_AT_COOKIES and SESSION_CHECK_ON_STARTUP):
+            return
+        valid = 0
+        for account in account_pool.accounts:
+            status = await check_session_cdp(cdp_browser, account.li_at_cookie, LINKEDIN_URL)
+            if status["valid"]:
+                valid += 1
+            else:
+                account_pool.quarantine(account, f"startup check: {status.get('url') or status.get('error')}")
+        session_status = {"valid": valid > 0, "valid_accounts": valid,
+                          "total_accounts": len(account_pool.accounts), "checked_at": time.time()}
+    except Exception as e:
+        session_status = {"valid": False, "url": None, "error": str(e), "checked_at": time.time()}
+    if not session_status["valid"]:
+        print(f"[STARTUP] ✗ LinkedIn session tidak valid: {session_status}")
+
+
+@app.on_event("shutdown")
+async def stop_cdp_browser():
+    if cdp_browser:
+        await cdp_browser.close()
+
+
+@app.on_event("shutdown")
+def stop_driver_pool():
+    scrape_executor.shutdown()
+    browser_watchdog.shutdown()
+    if driver_pool:
+        driver_pool.shutdown()
+    profile_cache.close()
+    snapshot_store.close()
+    job_queue.close()
+    for client in voyager_clients.values():
+        client.close()
+
+
+def request_deadline(seconds: Optional[float]) -> Optional[float]:
+    """Deadline (time.monotonic()) dari budget detik request, atau DEFAULT_DEADLINE_SECONDS"""
+    seconds = seconds or DEFAULT_DEADLINE_SECONDS
+    return time.monotonic() + seconds if seconds > 0 else None
+
+
+def client_id(request: Request, x_client_id: Optional[str] = None) -> str:
+    """Identitas client untuk fair share antrian: header X-Client-Id, atau IP client"""
+    if x_client_id and x_client_id.strip():
+        return x_client_id.strip()
+    return request.client.host if request.client else "unknown"
+
+
+def build_scraper(account, deadline: Optional[float] = None) -> LinkedInScraper:
+    """Buat LinkedInScraper untuk satu akun sesuai konfigurasi .env"""
+    return LinkedInScraper(
+        li_at_cookie=account.li_at_cookie,
+        extraction_mode=EXTRACTION_MODE,
+        load_budget=LOAD_BUDGET_SECONDS,
+        base_url=LINKEDIN_URL,
+        ai_prefetch=AI_SKILLS_PREFETCH,
+        ai_timeout=AI_SKILLS_TIMEOUT,
+        parallel_skills=SKILLS_PARALLEL_TAB,
+        blocked_url_patterns=BLOCKED_URL_PATTERNS,
+        http_client=voyager_clients.get(account.account_id),
+        page_archive=page_archive,
+        deadline=deadline
+    )
+
+
+def build_cdp_scraper(account, deadline: Optional[float] = None) -> AsyncLinkedInScraper:
+    """Buat AsyncLinkedInScraper (engine cdp) untuk satu akun"""
+    return AsyncLinkedInScraper(
+        li_at_cookie=account.li_at_cookie,
+        browser=cdp_browser,
+        load_budget=LOAD_BUDGET_SECONDS,
+        base_url=LINKEDIN_URL,
+        ai_prefetch=AI_SKILLS_PREFETCH,
+        ai_timeout=AI_SKILLS_TIMEOUT,
+        parallel_skills=SKILLS_PARALLEL_TAB,
+        page_archive=page_archive,
+        deadline=deadline
+    )
+
+
+def scrape_with_account(vanity_name: str, account, previous=None, fields: Optional[List[str]] = None,
+                        deadline: Optional[float] = None) -> Tuple[LinkedInScraper, dict]:
+    """
+    Scrape satu profil memakai session satu akun (previous: snapshot untuk
+    refresh incremental, fields: hanya field ini yang di-extract, deadline:
+    batas waktu time.monotonic())
+    """
+    scraper = build_scraper(account, deadline)
+    # Fast path JSON dulu supaya browser dari pool tidak dipinjam jika tidak perlu
+    profile_data = scraper.scrape_profile_http(vanity_name, previous, fields) if scraper.http_client else None
+    if profile_data is None and scraper.login_wall:
+        # Session akun ini ditolak; Selenium dengan cookie yang sama juga akan ditolak
+        return scraper, {"data": {}, "message": f"Error: {scraper.login_wall}"}
+    
+    if profile_data is None and driver_pool:
+        # Pinjam browser yang sudah warm dari pool, pasang cookie akun jika berbeda
+        pooled = driver_pool.checkout(timeout=remaining_seconds(deadline, driver_pool.checkout_timeout))
+        try:
+            if pooled.account_id != account.account_id:
+                apply_li_at_cookie(pooled.driver, account.li_at_cookie, LINKEDIN_URL, clear_existing=True)
+                pooled.account_id = account.account_id
+            scraper.attach_driver(pooled.driver)
+            profile_data = scraper.scrape_profile(vanity_name, previous, fields)
+        finally:
+            driver_pool.checkin(pooled, pages_loaded=scraper.pages_loaded)
+    elif profile_data is None:
+        # Inisialisasi scraper dengan browser baru setiap request
+        profile_data = scraper.scrape_profile(vanity_name, previous, fields)
+    return scraper, profile_data
+
+
+def run_scrape(vanity_name: str, fields: Optional[List[str]] = None, deadline: Optional[float] = None) -> dict:
+    """
+    Scrape satu profil secara blocking; dijalankan di worker thread executor
+    
+    Akun dipilih oleh account_pool; jika akun mendarat di login wall, akun
+    itu di-quarantine dan scrape diulang dengan akun lain.
+    
+    Hasil ditambah key "timings" (ms per fase); dibuang sebelum masuk cache
+    dan hanya dikirim ke client yang meminta ?timings=true.
+    
+    Jika INCREMENTAL_REFRESH aktif dan profil sudah punya snapshot, hanya
+    section yang berubah yang di-extract ulang. Hasil yang berhasil disimpan
+    sebagai snapshot baru (lihat profile_snapshots.SnapshotStore).
+    
+    Dengan fields, hanya section yang dibutuhkan yang di-extract; hasil
+    parsial tidak memakai maupun memperbarui snapshot.
+    
+    Dengan deadline, wait di setiap fase dipersingkat dan section opsional
+    dilewati saat waktunya hampir habis (hasil berisi skipped_sections).
+    
+    Raises:
+        NoAccountAvailable: jika semua akun kehabisan token atau di-quarantine
+    """
+    previous = previous_snapshot(vanity_name, fields)
+    
+    for attempt in range(max(len(account_pool.accounts), 1)):
+        account = account_pool.acquire(timeout=remaining_seconds(deadline, ACCOUNT_WAIT_SECONDS))
+        scraper, profile_data = scrape_with_account(vanity_name, account, previous, fields, deadline)
+        if not report_attempt(vanity_name, account, scraper, profile_data):
+            break
+    
+    return finish_scrape(vanity_name, scraper, profile_data, fields)
+
+
+async def run_scrape_async(vanity_name: str, fields: Optional[List[str]] = None,
+                           deadline: Optional[float] = None) -> dict:
+    """
+    Versi run_scrape untuk engine cdp: scrape di-await langsung di event
+    loop (tanpa worker thread), sehingga puluhan scrape bisa berjalan
+    bersamaan di satu Chrome
+    
+    Raises:
+        NoAccountAvailable: jika semua akun kehabisan token atau di-quarantine
+    """
+    # Snapshot store SQLite: baca/tulis di thread supaya scrape lain di event loop tidak tertahan
+    previous = await asyncio.to_thread(previous_snapshot, vanity_name, fields)
+    
+    for attempt in range(max(len(account_pool.accounts), 1)):
+        # acquire bisa menunggu token akun: jangan memblok event loop
+        account = await asyncio.to_thread(account_pool.acquire, remaining_seconds(deadline, ACCOUNT_WAIT_SECONDS))
+        scraper = build_cdp_scraper(account, deadline)
+        profile_data = await scraper.scrape_profile(vanity_name, previous, fields)
+        if not report_attempt(vanity_name, account, scraper, profile_data):
+            break
+    
+    return await asyncio.to_thread(finish_scrape, vanity_name, scraper, profile_data, fields)
+
+
+def previous_snapshot(vanity_name: str, fields: Optional[List[str]] = None):
+    """Snapshot untuk refresh incremental, atau None jika harus full scrape"""
+    previous = snapshot_store.latest(vanity_name) if INCREMENTAL_REFRESH and fields is None else None
+    if previous is not None and time.time() - previous.full_scraped_at > PROFILE_FULL_REFRESH_SECONDS:
+        previous = None
+    return previous
+
+
+def report_attempt(vanity_name: str, account, scraper: LinkedInScraper, profile_data: dict) -> bool:
+    """Laporkan hasil satu percobaan ke account_pool dan metrics; True jika perlu dicoba dengan akun lain"""
+    # Profil yang tidak ada bukan kegagalan akun
+    account_pool.report(account, success=is_successful(profile_data) or is_not_found(profile_data),
+                        login_wall=scraper.login_wall)
+    metrics.observe_scrape(scraper.timings, scraper.errors, scraper.skills_source, scraper.network,
+                           scraper.engine, account.account_id, scraper.reused_sections)
+    if not scraper.login_wall or account_pool.available_count() == 0:
+        return False
+    print(f"[ACCOUNTS] Retrying {vanity_name} with another account")
+    return True
+
+
+def finish_scrape(vanity_name: str, scraper: LinkedInScraper, profile_data: dict,
+                  fields: Optional[List[str]] = None) -> dict:
+    """Simpan snapshot hasil yang berhasil dan lengkap, lalu tambahkan blok timings"""
+    if is_successful(profile_data) and is_complete(profile_data) and fields is None:
+        changed = snapshot_store.save(vanity_name, profile_data["data"], signals=scraper.signals,
+                                      skills_source=scraper.skills_source, full=not scraper.reused_sections)
+        print(f"[SNAPSHOT] {vanity_name}: {len(changed)} section(s) changed {changed}")
+    
+    timings = {phase: round(seconds * 1000, 1) for phase, seconds in scraper.timings.items()}
+    return {**profile_data, "timings": timings}
+
+
+def without_timings(profile_data: dict) -> dict:
+    """Salinan hasil scrape tanpa blok timings"""
+    return {key: value for key, value in profile_data.items() if key != "timings"}
+
+
+class ProfilesRequest(BaseModel):
+    vanity_names: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_SIZE)
+    max_age: Optional[int] = Field(None, ge=0)
+    force_refresh: bool = False
+    timings: bool = False
+    concurrency: Optional[int] = Field(None, ge=1, description="Dibatasi BATCH_MAX_CONCURRENCY")
+    fields: Optional[List[str]] = Field(None, description="Hanya field/section ini (lihat GET /profile)")
+    deadline: Optional[float] = Field(None, gt=0, description="Batas waktu (detik) untuk seluruh batch")
+    priority: Optional[str] = Field(None, description="Lane prioritas scrape (default lane bulk)")
+
+
+class JobsRequest(BaseModel):
+    vanity_names: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_SIZE)
+    max_attempts: Optional[int] = Field(None, ge=1, le=10)
+
+
+def is_successful(profile_data: dict) -> bool:
+    """Hanya hasil scrape yang berhasil yang disimpan ke cache"""
+    return bool(profile_data and profile_data.get("data")) and profile_data.get("message") == "ok"
+
+
+def is_not_found(profile_data: dict) -> bool:
+    """
+    Scrape selesai tanpa error tapi tidak menghasilkan profil (redirect /404,
+    HTTP 404, atau halaman yang bukan profil); scrape ulang tidak akan berhasil
+    """
+    return profile_data.get("message") in ("ok", PROFILE_NOT_FOUND_MESSAGE) and not profile_data.get("data")
+
+
+def is_complete(profile_data: dict) -> bool:
+    """False untuk profil parsial (ada section yang dilewati karena deadline)"""
+    return not profile_data.get("skipped_sections")
+
+
+async def _scrape_and_cache(vanity_name: str, fields: Optional[List[str]] = None,
+                            deadline: Optional[float] = None, lane: Optional[str] = None,
+                            client: str = "", key: Optional[str] = None) -> dict:
+    profile_data = await scrape_executor.run(run_scrape_async if cdp_browser else run_scrape, vanity_name, fields,
+                                             deadline, deadline=deadline, lane=lane, client=client, key=key)
+    # Cache hanya menyimpan profil lengkap
+    if is_successful(profile_data) and is_complete(profile_data) and fields is None:
+        await asyncio.to_thread(profile_cache.set, vanity_name, without_timings(profile_data))
+    return profile_data
+
+
+async def scrape_and_cache(vanity_name: str, fields: Optional[List[str]] = None,
+                           deadline: Optional[float] = None, lane: Optional[str] = None,
+                           client: str = "") -> dict:
+    """
+    Scrape profil lewat executor lalu simpan hasil yang berhasil ke cache
+    
+    Request bersamaan untuk vanity_name (dan fields) yang sama menunggu satu
+    scrape yang sama (single-flight); error juga diteruskan ke semua yang menunggu.
+    Request hanya ikut scrape yang deadline-nya sama atau lebih lambat (atau
+    tanpa deadline), supaya tidak menerima profil parsial milik caller dengan
+    budget lebih kecil, dan berhenti menunggu saat deadline-nya habis.
+    Scrape yang masih antri di lane lebih rendah dipindah ke lane request ini.
+    
+    Args:
+        lane: Lane prioritas executor (default INTERACTIVE_LANE)
+        client: Identitas client untuk fair share di dalam lane
+    
+    Raises:
+        ScrapeDeadlineExceeded: jika deadline habis sebelum scrape selesai dimulai/ditunggu
+    """
+    key = vanity_name.strip().lower()
+    if fields is not None:
+        key += "?fields=" + ",".join(sorted(fields))
+    # Request interaktif yang menumpang scrape batch tidak ikut menunggu di lane bulk
+    scrape_executor.promote(key, lane)
+    if deadline is None:
+        return await single_flight.do(key, _scrape_and_cache, vanity_name, fields, None, lane, client, key)
+    try:
+        return await asyncio.wait_for(
+            single_flight.do(key, _scrape_and_cache, vanity_name, fields, deadline, lane, client, key,
+                             deadline=deadline),
+            max(deadline - time.monotonic(), 0)
+        )
+    except asyncio.TimeoutError:
+        raise ScrapeDeadlineExceeded("Deadline habis sebelum scrape selesai")
+
+
+async def refresh_in_background(vanity_name: str):
+    """Refresh entry stale tanpa membuat caller menunggu (stale-while-revalidate)"""
+    try:
+        await scrape_and_cache(vanity_name, lane=BULK_LANE, client="refresh")
+    except Exception as e:
+        print(f"[CACHE] Background refresh failed for {vanity_name}: {str(e)}")
+
+
+def queue_headers(lane: Optional[str], client: str) -> dict:
+    """Header posisi antrian dan estimasi tunggu (detik) saat request masuk antrian scrape"""
+    position = scrape_executor.position(lane, client)
+    return {
+        "X-Queue-Lane": position["lane"],
+        "X-Queue-Position": str(position["position"]),
+        "X-Queue-Wait-Estimate": str(position["estimated_wait_seconds"])
+    }
+
+
+async def fetch_profile(vanity_name: str, max_age: Optional[int] = None, force_refresh: bool = False,
+                        include_timings: bool = False, fields: Optional[List[str]] = None,
+                        deadline: Optional[float] = None, lane: Optional[str] = None,
+                        client: str = "") -> Tuple[int, dict, dict]:
+    """
+    Ambil profil dari cache atau scrape ulang
+    
+    Args:
+        include_timings: Sertakan blok "timings" (ms per fase) jika profil di-scrape
+        fields: Hanya field ini yang dikembalikan; cache profil lengkap tetap
+            dipakai, scrape hanya meng-extract section yang dibutuhkan
+        deadline: Batas waktu (time.monotonic()); profil bisa parsial
+            (skipped_sections) dan 504 jika scrape belum sempat dimulai
+        lane: Lane prioritas scrape (default INTERACTIVE_LANE)
+        client: Identitas client untuk fair share antrian
+    
+    Returns:
+        (status_code, content {"data", "message"}, headers)
+    """
+    if not force_refresh:
+        # Lookup SQLite di thread supaya event loop tidak ter-block
+        cached = await asyncio.to_thread(profile_cache.get, vanity_name, max_age=max_age)
+        if cached is not None:
+            result = {**cached.result, "data": project_fields(cached.result.get("data") or {}, fields)}
+            if cached.is_fresh(max_age):
+                return 200, result, {"X-Cache": "HIT"}
+            if max_age is None:
+                # Sajikan data lama sekarang, refresh di background
+                task = asyncio.create_task(refresh_in_background(vanity_name))
+                background_tasks.add(task)
+                task.add_done_callback(background_tasks.discard)
+                return 200, result, {"X-Cache": "STALE"}
+    
+    # Posisi saat masuk antrian; estimasi tunggu juga dikirim bersama 503
+    headers = queue_headers(lane, client)
+    try:
+        # Scrape di worker thread supaya event loop tidak ter-block
+        profile_data = await scrape_and_cache(vanity_name, fields, deadline, lane, client)
+        
+        if not profile_data or not profile_data.get("data"):
+            return 404, {"data": {}, "message": PROFILE_NOT_FOUND_MESSAGE}, headers
+        
+        content = profile_data if include_timings else without_timings(profile_data)
+        return 200, content, {**headers, "X-Cache": "MISS"}
+    
+    except (ScrapeQueueFull, NoAccountAvailable) as e:
+        return 503, {"data": {}, "message": str(e)}, {**headers, "Retry-After": str(e.retry_after)}
+    except ScrapeDeadlineExceeded as e:
+        return 504, {"data": {}, "message": str(e)}, headers
+    except Exception as e:
+        return 500, {"data": {}, "message": str(e)}, headers
+
+
+metrics.register_gauge(
+    "linkedin_browsers_active", "Jumlah browser Chrome yang hidup",
+    lambda: (driver_pool.stats()["alive"] if driver_pool else int(cdp_browser.connected) if cdp_browser
+             else scrape_executor.stats()["in_flight"])
+)
+metrics.register_gauge(
+    "linkedin_browsers_idle", "Jumlah browser di pool yang sedang menganggur",
+    lambda: driver_pool.stats()["idle"] if driver_pool else 0
+)
+metrics.register_gauge(
+    "linkedin_browser_rss_bytes", "Total RSS proses chromedriver + Chrome (sampling watchdog)",
+    lambda: (driver_pool or cdp_browser).stats()["rss_bytes"] if driver_pool or cdp_browser else 0
+)
+metrics.register_gauge(
+    "linkedin_browser_js_heap_bytes", "JS heap terpakai tab browser (CDP Runtime.getHeapUsage, sampling terakhir)",
+    lambda: (driver_pool or cdp_browser).stats()["js_heap_bytes"] if driver_pool or cdp_browser else 0
+)
+metrics.register_labeled_counter(
+    "linkedin_browsers_retired_total", "Jumlah browser yang di-recycle per alasan: pages, rss, js_heap",
+    "reason", ["pages", "rss", "js_heap"],
+    lambda: (driver_pool or cdp_browser).stats()["total_retired"] if driver_pool or cdp_browser else {}
+)
+metrics.register_counter(
+    "linkedin_browser_orphans_killed_total", "Jumlah proses Chrome/chromedriver yatim yang dimatikan",
+    lambda: browser_watchdog.total_orphans_killed
+    + ((driver_pool or cdp_browser).stats()["total_orphans_killed"] if driver_pool or cdp_browser else 0)
+)
+metrics.register_gauge(
+    "linkedin_scrape_in_flight", "Jumlah scrape yang sedang berjalan",
+    lambda: scrape_executor.stats()["in_flight"]
+)
+metrics.register_gauge(
+    "linkedin_scrape_queue_depth", "Jumlah scrape yang menunggu slot executor",
+    lambda: scrape_executor.stats()["queued"]
+)
+metrics.register_counter(
+    "linkedin_scrape_rejected_total", "Jumlah scrape yang ditolak karena antrian penuh",
+    lambda: scrape_executor.stats()["total_rejected"]
+)
+
+
+def lane_stat(field: str) -> dict:
+    """{lane: nilai field} dari statistik executor per lane"""
+    return {lane: stats[field] for lane, stats in scrape_executor.stats()["lanes"].items()}
+
+
+metrics.register_labeled_gauge(
+    "linkedin_scrape_lane_in_flight", "Jumlah scrape yang sedang berjalan per lane prioritas",
+    "lane", SCRAPE_LANES, lambda: lane_stat("in_flight")
+)
+metrics.register_labeled_gauge(
+    "linkedin_scrape_lane_queue_depth", "Jumlah scrape yang menunggu slot per lane prioritas",
+    "lane", SCRAPE_LANES, lambda: lane_stat("queued")
+)
+metrics.register_labeled_gauge(
+    "linkedin_scrape_lane_wait_estimate_seconds", "Estimasi tunggu (detik) scrape baru per lane prioritas",
+    "lane", SCRAPE_LANES, lambda: lane_stat("estimated_wait_seconds")
+)
+metrics.register_labeled_counter(
+    "linkedin_scrape_lane_aged_total", "Jumlah scrape yang didahulukan karena lane-nya terlalu lama tidak dapat slot",
+    "lane", SCRAPE_LANES, lambda: lane_stat("total_aged")
+)
+metrics.register_counter(
+    "linkedin_cache_hits_total", "Jumlah cache hit memory + disk",
+    lambda: profile_cache.memory_hits + profile_cache.disk_hits
+)
+metrics.register_counter(
+    "linkedin_cache_misses_total", "Jumlah cache miss",
+    lambda: profile_cache.misses
+)
+metrics.register_counter(
+    "linkedin_requests_coalesced_total", "Jumlah request yang menumpang scrape yang sedang berjalan",
+    lambda: single_flight.coalesced
+)
+metrics.register_gauge(
+    "linkedin_accounts_active", "Jumlah akun LinkedIn yang tidak di-quarantine",
+    lambda: account_pool.stats()["active"]
+)
+metrics.register_gauge(
+    "linkedin_accounts_quarantined", "Jumlah akun LinkedIn yang di-quarantine (login wall/checkpoint)",
+    lambda: account_pool.stats()["quarantined"]
+)
+metrics.register_counter(
+    "linkedin_ai_skills_api_calls_total", "Jumlah panggilan Gemini untuk fallback skills",
+    lambda: get_skills_generator().api_calls
+)
+metrics.register_counter(
+    "linkedin_ai_skills_cache_hits_total", "Jumlah fallback skills yang dilayani cache Gemini",
+    lambda: get_skills_generator().cache_hits
+)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Metrics format Prometheus"""
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/health")
+async def health():
+    """Status service, pool browser dan antrian scrape"""
+    session_valid = session_status is None or session_status["valid"]
+    return {
+        "status": "ok" if session_valid else "degraded",
+        "session": session_status,
+        "driver_pool": driver_pool.stats() if driver_pool else None,
+        "cdp_browser": cdp_browser.stats() if cdp_browser else None,
+        "browser_watchdog": browser_watchdog.stats(),
+        "executor": scrape_executor.stats(),
+        "cache": profile_cache.stats(),
+        "snapshots": snapshot_store.stats(),
+        "single_flight": single_flight.stats(),
+        "ai_skills": get_skills_generator().stats(),
+        "accounts": account_pool.stats(),
+        "jobs": job_queue.stats(),
+        "http_engine": {account_id: client.stats() for account_id, client in voyager_clients.items()} or None
+    }
+
+
+def unknown_lane_response(priority: str) -> JSONResponse:
+    return JSONResponse(
+        content={"data": {}, "message": f"priority tidak dikenal: {priority} (pilihan: {', '.join(SCRAPE_LANES)})"},
+        status_code=400
+    )
+
+
+@app.get("/queue")
+async def get_queue(
+    request: Request,
+    priority: Optional[str] = Query(None, description="Lane prioritas (default lane interaktif)"),
+    x_client_id: Optional[str] = Header(None, description="Identitas client (default IP)")
+):
+    """
+    Posisi dan estimasi tunggu scrape baru untuk client ini, plus statistik per lane
+    
+    Response:
+    {"lane", "position", "queued_by_client", "estimated_wait_seconds",
+     "lanes": {lane: {"in_flight", "queued", "reserved", "estimated_wait_seconds", ...}}}
+    """
+    if priority is not None and priority not in SCRAPE_LANES:
+        return unknown_lane_response(priority)
+    position = scrape_executor.position(priority or INTERACTIVE_LANE, client_id(request, x_client_id))
+    return {**position, "lanes": scrape_executor.stats()["lanes"]}
+
 
 @app.get("/profile")
-async def get_profile(vanity_name: str = Query(..., description="Vanity name LinkedIn")):
+async def get_profile(
+    request: Request,
+    vanity_name: str = Query(..., description="Vanity name LinkedIn"),
+    max_age: Optional[int] = Query(None, ge=0, description="Umur maksimal (detik) hasil cache yang diterima"),
+    force_refresh: bool = Query(False, description="Abaikan cache dan scrape ulang"),
+    timings: bool = Query(False, description="Sertakan durasi per fase scrape (ms)"),
+    fields: Optional[str] = Query(None, description="Field yang dibutuhkan, dipisah koma (contoh: full_name,headline)"),
+    deadline: Optional[float] = Query(None, gt=0, description="Batas waktu request (detik)"),
+    x_deadline: Optional[float] = Header(None, gt=0, description="Batas waktu request (detik), sama dengan ?deadline="),
+    priority: Optional[str] = Query(None, description="Lane prioritas scrape (default lane interaktif)"),
+    x_client_id: Optional[str] = Header(None, description="Identitas client untuk fair share antrian (default IP)")
+):
     """
     Scrape profil LinkedIn menggunakan Selenium + li_at cookie + XPath
     
     Query parameter:
     - vanity_name: Vanity name LinkedIn (contoh: naufal-arga-a5b22b2aa)
+    - max_age: Umur maksimal hasil cache dalam detik (default: TTL cache)
+    - force_refresh: true untuk selalu scrape ulang
+    - timings: true untuk menyertakan blok "timings" (ms per fase) jika profil di-scrape
+    - fields: field yang dibutuhkan (full_name, headline, location, about,
+      experiences, educations, certifications, skills) atau nama section
+      (top_card); section lain tidak di-scroll/di-extract, halaman skills dan
+      AI fallback hanya jika skills diminta
+    - deadline: batas waktu request dalam detik (atau header X-Deadline,
+      default DEFAULT_DEADLINE_SECONDS). Mendekati deadline, certifications,
+      halaman skills dan AI fallback dilewati; response berisi profil parsial
+      dengan "skipped_sections" (tidak di-cache). 504 jika scrape belum sempat
+      dimulai sebelum deadline.
+    - priority: lane scrape (SCRAPE_LANES, default lane pertama/interaktif).
+      Antrian tiap lane dilayani round-robin per client (header X-Client-Id,
+      default IP client)
+    
+    Header X-Cache pada response: HIT, STALE (disajikan sambil di-refresh) atau MISS.
+    Jika profil di-scrape: X-Queue-Lane, X-Queue-Position (scrape di depannya
+    saat masuk antrian) dan X-Queue-Wait-Estimate (detik)
     """
     
     if not LI_AT_COOKIE:
@@ -31,28 +832,149 @@ async def get_profile(vanity_name: str = Query(..., description="Vanity name Lin
         )
     
     try:
-        # Inisialisasi scraper dengan browser baru setiap request
-        scraper = LinkedInScraper(li_at_cookie=LI_AT_COOKIE)
-        
-        # Scrape profil
-        profile_data = scraper.scrape_profile(vanity_name)
-        
-        if not profile_data or not profile_data.get("data"):
-            return JSONResponse(
-                content={
-                    "data": {},
-                    "message": "Profil tidak ditemukan"
-                },
-                status_code=404
-            )
-        
-        return JSONResponse(content=profile_data)
+        selected_fields = parse_fields(fields)
+    except ValueError as e:
+        return JSONResponse(content={"data": {}, "message": str(e)}, status_code=400)
+    
+    if priority is not None and priority not in SCRAPE_LANES:
+        return unknown_lane_response(priority)
+    
+    started = time.perf_counter()
+    status_code, content, headers = await fetch_profile(vanity_name, max_age, force_refresh, timings,
+                                                        selected_fields, request_deadline(deadline or x_deadline),
+                                                        priority or INTERACTIVE_LANE, client_id(request, x_client_id))
+    metrics.observe_request("/profile", status_code, headers.get("X-Cache", "NONE"), time.perf_counter() - started)
+    return JSONResponse(content=content, status_code=status_code, headers=headers)
 
-    except Exception as e:
+
+@app.get("/profile/diff")
+async def get_profile_diff(vanity_name: str = Query(..., description="Vanity name LinkedIn")):
+    """
+    Perubahan profil antara snapshot terbaru dan versi sebelumnya
+    
+    Snapshot baru hanya dibuat jika ada section yang berubah; checked_at
+    menunjukkan kapan profil terakhir dipastikan masih sama.
+    
+    Response:
+    {"vanity_name", "scraped_at", "checked_at", "previous_scraped_at",
+     "changed": [section, ...], "sections": {section: perubahan}, "message"}
+    """
+    snapshots = await asyncio.get_running_loop().run_in_executor(None, snapshot_store.latest_two, vanity_name)
+    if not snapshots:
+        return JSONResponse(content={"data": {}, "message": "Belum ada snapshot untuk profil ini"}, status_code=404)
+    
+    latest = snapshots[0]
+    previous = snapshots[1] if len(snapshots) > 1 else None
+    diff = diff_profiles(previous.data, latest.data) if previous else {"changed": [], "sections": {}}
+    return {
+        "vanity_name": latest.vanity_name,
+        "scraped_at": latest.scraped_at,
+        "checked_at": latest.checked_at,
+        "previous_scraped_at": previous.scraped_at if previous else None,
+        **diff,
+        "message": "ok" if previous else "Belum ada snapshot sebelumnya"
+    }
+
+
+@app.post("/profiles")
+async def get_profiles(request: ProfilesRequest, http_request: Request,
+                       x_client_id: Optional[str] = Header(None, description="Identitas client untuk fair share antrian")):
+    """
+    Scrape banyak profil sekaligus, hasil di-stream sebagai NDJSON
+    
+    Setiap baris dikirim begitu profilnya selesai (urutan mengikuti waktu
+    selesai, bukan urutan input) dengan envelope yang sama seperti /profile
+    ditambah vanity_name dan status:
+    {"vanity_name": ..., "status": 200, "data": {...}, "message": "ok"}
+    
+    Scrape batch antri di lane bulk (atau "priority"), round-robin dengan
+    batch client lain, sehingga lookup /profile interaktif tetap didahulukan.
+    """
+    
+    if not LI_AT_COOKIE:
         return JSONResponse(
             content={
                 "data": {},
-                "message": str(e)
+                "message": "LINKEDIN_LI_AT tidak diset di file .env"
             },
             status_code=500
         )
+    
+    try:
+        selected_fields = parse_fields(",".join(request.fields)) if request.fields else None
+    except ValueError as e:
+        return JSONResponse(content={"data": {}, "message": str(e)}, status_code=400)
+    if request.priority is not None and request.priority not in SCRAPE_LANES:
+        return unknown_lane_response(request.priority)
+    lane = request.priority or BULK_LANE
+    client = client_id(http_request, x_client_id)
+    
+    # Nama duplikat di satu batch cukup di-scrape sekali
+    vanity_names = list(dict.fromkeys(name.strip() for name in request.vanity_names if name.strip()))
+    concurrency = min(request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+    # Satu deadline untuk seluruh batch (hanya jika diminta; DEFAULT_DEADLINE_SECONDS untuk /profile)
+    deadline = time.monotonic() + request.deadline if request.deadline else None
+    
+    async def fetch_item(vanity_name: str) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            for attempt in range(BATCH_QUEUE_RETRIES + 1):
+                status_code, content, headers = await fetch_profile(
+                    vanity_name, request.max_age, request.force_refresh, request.timings, selected_fields, deadline,
+                    lane, client
+                )
+                # Antrian penuh karena traffic lain: tunggu lalu coba lagi
+                if status_code != 503 or attempt == BATCH_QUEUE_RETRIES:
+                    break
+                await asyncio.sleep(remaining_seconds(deadline, min(int(headers.get("Retry-After", "5")), 30)))
+            metrics.observe_request("/profiles", status_code, headers.get("X-Cache", "NONE"),
+                                    time.perf_counter() - started)
+        return {"vanity_name": vanity_name, "status": status_code, **content}
+    
+    async def stream():
+        tasks = [asyncio.create_task(fetch_item(name)) for name in vanity_names]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                item = await finished
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+        finally:
+            # Client disconnect: batalkan item yang belum jalan
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.post("/jobs", status_code=202)
+async def enqueue_jobs(request: JobsRequest):
+    """
+    Antrikan scrape untuk dikerjakan worker.py (bisa banyak node)
+    
+    Returns:
+        {"jobs": [{"job_id", "vanity_name", "status"}]}; poll hasilnya di GET /jobs/{job_id}
+    """
+    vanity_names = list(dict.fromkeys(name.strip() for name in request.vanity_names if name.strip()))
+    jobs = await asyncio.get_running_loop().run_in_executor(
+        None, job_queue.enqueue, vanity_names, request.max_attempts
+    )
+    return {
+        "jobs": [
+            {"job_id": job.job_id, "vanity_name": job.vanity_name, "status": job.status}
+            for job in jobs
+        ]
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status dan hasil satu job
+    
+    status: queued, running, done (result berisi {"data", "message"}) atau
+    failed (error berisi pesan kegagalan terakhir)
+    """
+    job = await asyncio.get_running_loop().run_in_executor(None, job_queue.get, job_id)
+    if job is None:
+        return JSONResponse(content={"data": {}, "message": "Job tidak ditemukan"}, status_code=404)
+    return job.to_dict()
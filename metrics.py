@@ -0,0 +1,171 @@
+from typing import Callable, Dict, List
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily
+
+# Bucket durasi scrape: fase cepat (ms) sampai scrape penuh yang lambat (menit)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 3, 5, 8, 13, 20, 30, 45, 60, 90, 120)
+
+PHASE_DURATION = Histogram(
+    "linkedin_scraper_phase_duration_seconds",
+    "Durasi per fase scrape (driver_init, cookie_set, navigation, scroll, extract_*, skills, ai_fallback, total)",
+    ["phase"],
+    buckets=LATENCY_BUCKETS
+)
+
+REQUEST_DURATION = Histogram(
+    "linkedin_api_request_duration_seconds",
+    "Durasi request API termasuk antrian dan cache",
+    ["endpoint", "cache"],
+    buckets=LATENCY_BUCKETS
+)
+
+REQUESTS = Counter(
+    "linkedin_api_requests_total",
+    "Jumlah request API per status code",
+    ["endpoint", "status"]
+)
+
+EXTRACTOR_ERRORS = Counter(
+    "linkedin_scraper_extractor_errors_total",
+    "Jumlah error per extractor",
+    ["extractor"]
+)
+
+SKILLS_SOURCE = Counter(
+    "linkedin_scraper_skills_source_total",
+    "Sumber skills per scrape: page, api (fast path JSON), ai (Gemini fallback) atau none",
+    ["source"]
+)
+
+SCRAPE_ENGINE = Counter(
+    "linkedin_scraper_engine_total",
+    "Engine yang menghasilkan data per scrape: http (fast path JSON) atau selenium",
+    ["engine"]
+)
+
+NETWORK_REQUESTS = Counter(
+    "linkedin_scraper_network_requests_total",
+    "Request browser per scrape: loaded atau blocked (resource blocking CDP)",
+    ["outcome"]
+)
+
+NETWORK_BLOCKED = Counter(
+    "linkedin_scraper_network_blocked_total",
+    "Request yang diblok per resource type",
+    ["resource_type"]
+)
+
+NETWORK_BYTES = Counter(
+    "linkedin_scraper_network_bytes_total",
+    "Byte yang ditransfer browser selama scrape (encodedDataLength)"
+)
+
+SECTIONS_REUSED = Counter(
+    "linkedin_scraper_sections_reused_total",
+    "Section yang tidak di-extract ulang karena tidak berubah sejak snapshot terakhir (refresh incremental)",
+    ["section"]
+)
+
+ACCOUNT_SCRAPES = Counter(
+    "linkedin_account_scrapes_total",
+    "Scrape per akun LinkedIn (account_id dari AccountPool, bukan cookie)",
+    ["account"]
+)
+
+
+def observe_scrape(timings: Dict[str, float], errors: Dict[str, int], skills_source: str = None,
+                   network: Dict = None, engine: str = None, account: str = None,
+                   reused_sections: List[str] = None):
+    """Catat hasil instrumentasi satu LinkedInScraper.scrape_profile"""
+    if account:
+        ACCOUNT_SCRAPES.labels(account=account).inc()
+    for phase, seconds in timings.items():
+        PHASE_DURATION.labels(phase=phase).observe(seconds)
+    for extractor, count in errors.items():
+        EXTRACTOR_ERRORS.labels(extractor=extractor).inc(count)
+    if engine:
+        SCRAPE_ENGINE.labels(engine=engine).inc()
+    if "skills" in timings or engine == "http":
+        SKILLS_SOURCE.labels(source=skills_source or "none").inc()
+    if network:
+        NETWORK_REQUESTS.labels(outcome="loaded").inc(network["requests"] - network["blocked"])
+        NETWORK_REQUESTS.labels(outcome="blocked").inc(network["blocked"])
+        for resource_type, count in network["blocked_by_type"].items():
+            NETWORK_BLOCKED.labels(resource_type=resource_type).inc(count)
+        NETWORK_BYTES.inc(network["bytes"])
+    for section in reused_sections or []:
+        SECTIONS_REUSED.labels(section=section).inc()
+
+
+def observe_request(endpoint: str, status: int, cache: str, seconds: float):
+    """Catat satu request API"""
+    REQUESTS.labels(endpoint=endpoint, status=str(status)).inc()
+    REQUEST_DURATION.labels(endpoint=endpoint, cache=cache).observe(seconds)
+
+
+def register_gauge(name: str, documentation: str, fn: Callable[[], float]):
+    """Gauge yang nilainya dibaca dari fn saat /metrics di-scrape"""
+    gauge = Gauge(name, documentation)
+    gauge.set_function(fn)
+    return gauge
+
+
+def register_labeled_gauge(name: str, documentation: str, label: str, values: List[str],
+                           fn: Callable[[], Dict[str, float]]):
+    """Gauge dengan satu label; nilai tiap label dibaca dari dict hasil fn saat /metrics di-scrape"""
+    gauge = Gauge(name, documentation, [label])
+    for value in values:
+        gauge.labels(**{label: value}).set_function(lambda value=value: fn().get(value, 0))
+    return gauge
+
+
+class _FunctionCounter:
+    """Collector counter yang nilainya (total kumulatif milik objek lain) dibaca saat /metrics di-scrape"""
+
+    def __init__(self, name: str, documentation: str, fn: Callable, label: str = None, values: List[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.fn = fn
+        self.label = label
+        self.values = list(values)
+
+    def _family(self) -> CounterMetricFamily:
+        return CounterMetricFamily(self.name, self.documentation, labels=[self.label] if self.label else None)
+
+    def describe(self):
+        # Tanpa describe, registry memanggil collect (dan fn) saat register
+        return [self._family()]
+
+    def collect(self):
+        family = self._family()
+        if self.label:
+            totals = self.fn()
+            for value in self.values:
+                family.add_metric([value], totals.get(value, 0))
+        else:
+            family.add_metric([], self.fn())
+        yield family
+
+
+def register_counter(name: str, documentation: str, fn: Callable[[], float]):
+    """
+    Counter (suffix _total) untuk total kumulatif yang dihitung objek lain
+    (cache, executor, pool); dibaca dari fn saat /metrics di-scrape
+    """
+    collector = _FunctionCounter(name, documentation, fn)
+    REGISTRY.register(collector)
+    return collector
+
+
+def register_labeled_counter(name: str, documentation: str, label: str, values: List[str],
+                             fn: Callable[[], Dict[str, float]]):
+    """Counter dengan satu label; total tiap label dibaca dari dict hasil fn saat /metrics di-scrape"""
+    collector = _FunctionCounter(name, documentation, fn, label, values)
+    REGISTRY.register(collector)
+    return collector
+
+
+def render():
+    """Body dan content type untuk endpoint /metrics"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,204 @@
+"""
+Extract ulang halaman dari PageArchive tanpa browser
+
+Membaca HTML profil dan skills yang disimpan scraper (PAGE_ARCHIVE_DIR),
+mem-parse-nya dengan lxml memakai XPath dan aturan parsing yang sama dengan
+LinkedInScraper (profile_parsing), lalu menulis hasilnya sebagai
+NDJSON. Capture diproses paralel di semua core CPU.
+
+Usage:
+    python offline_extractor.py archive/ --output profiles.ndjson
+    python offline_extractor.py archive/ --latest-only --workers 8
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, Optional
+
+import lxml.html
+
+from profile_parsing import (about_candidates, accept_certification, clean_text, index_sections,
+                             parse_education_texts, parse_experience_texts, skills_from_texts)
+from page_archive import iter_captures, load_record
+
+SECTIONS_XPATH = "//*[@id='profile-content']/div/div[2]/div/div/main/section"
+FULL_NAME_XPATH = "/html/body/div[6]/div[3]/div/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[1]/span[1]/a/h1"
+HEADLINE_XPATH = "//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[1]/div[2]"
+LOCATION_XPATH = "//*[@id='profile-content']/div/div[2]/div/div/main/section[1]/div[2]/div[2]/div[2]/span[1]"
+SKILL_XPATH = "//div[contains(@class, 'pvs-list__container')]//li//span[@aria-hidden='true']"
+
+# Elemen yang di innerText browser menghasilkan baris baru
+LINE_BREAK_TAGS = ("br", "p", "div", "li")
+LINE_BREAK = "\ue000"
+
+def parse_document(html: str):
+    """Parse HTML dan tandai elemen yang menghasilkan baris baru (lihat inner_text)"""
+    tree = lxml.html.document_fromstring(html)
+    for elem in tree.iter(*LINE_BREAK_TAGS):
+        elem.tail = LINE_BREAK + (elem.tail or "")
+    return tree
+
+
+def inner_text(elem) -> Optional[str]:
+    """
+    Perkiraan innerText browser: whitespace di-collapse seperti CSS white-space
+    normal, <br> dan elemen block menjadi baris baru, lalu clean_text
+    """
+    if elem is None:
+        return None
+    text = re.sub(r"\s+", " ", elem.text_content()).replace(LINE_BREAK, "\n")
+    return clean_text(text)
+
+
+def first(tree_or_elem, xpath: str):
+    found = tree_or_elem.xpath(xpath)
+    return found[0] if found else None
+
+
+def visible_texts(item) -> List[str]:
+    """Text span aria-hidden='true' per item (sama dengan visibleTexts di PROFILE_EXTRACTION_JS)"""
+    texts = []
+    for span in item.xpath(".//span[@aria-hidden='true']"):
+        text = inner_text(span)
+        if text and text not in texts:
+            texts.append(text)
+    return texts
+
+
+def certification_fields(item) -> Dict:
+    name_elem = first(item, ".//div/div[2]/div[1]/a/div/div/div/div/span[1]")
+    return {
+        "name": inner_text(name_elem if name_elem is not None else first(item, ".//span[@aria-hidden='true']")),
+        "authority": inner_text(first(item, ".//div/div[2]/div[1]/a/span[1]/span[1]")),
+        "issued": inner_text(first(item, ".//div/div[2]/div[1]/a/span[2]/span[1]")),
+        "credential_id": inner_text(first(item, ".//div/div[2]/div[1]/a/span[3]/span[1]"))
+    }
+
+
+def parse_profile(html: str) -> Dict:
+    """Extract top card, about, experiences, educations dan certifications dari HTML profil"""
+    tree = parse_document(html)
+    sections = tree.xpath(SECTIONS_XPATH)
+    summary = []
+    for section in sections:
+        heading = first(section, ".//h2")
+        summary.append({"id": section.get("id") or "", "heading": heading.text_content() if heading is not None else ""})
+    section_index = index_sections(summary)
+
+    def items(kind: str):
+        idx = section_index.get(kind)
+        return sections[idx - 1].xpath("./div[3]/ul/li") if idx else []
+
+    about = None
+    for section_number in about_candidates(section_index):
+        about = inner_text(first(tree, f"{SECTIONS_XPATH}[{section_number}]/div[3]/div/div/div/span[1]"))
+        if about:
+            break
+
+    experiences = []
+    for idx, item in enumerate(items("experience")):
+        exp_data = parse_experience_texts(idx, visible_texts(item))
+        if exp_data:
+            experiences.append(exp_data)
+
+    educations = []
+    for idx, item in enumerate(items("education")):
+        edu_data = parse_education_texts(idx, visible_texts(item))
+        if edu_data:
+            educations.append(edu_data)
+
+    certifications = []
+    for idx, item in enumerate(items("certifications")):
+        cert_data = certification_fields(item)
+        if accept_certification(idx, cert_data):
+            certifications.append(cert_data)
+
+    return {
+        "full_name": inner_text(first(tree, FULL_NAME_XPATH)),
+        "headline": inner_text(first(tree, HEADLINE_XPATH)),
+        "location": inner_text(first(tree, LOCATION_XPATH)),
+        "about": about,
+        "experiences": experiences,
+        "educations": educations,
+        "certifications": certifications
+    }
+
+
+def parse_skills(html: str) -> str:
+    """Extract skills dari HTML halaman /details/skills/ (dipisah "|")"""
+    tree = parse_document(html)
+    texts = [inner_text(span) or "" for span in tree.xpath(SKILL_XPATH)]
+    return "|".join(skills_from_texts(texts))
+
+
+def extract_capture(capture: Dict) -> Dict:
+    """Extract satu scrape (halaman profil + skills) dari archive; dijalankan di worker process"""
+    result = {"vanity_name": capture["vanity_dir"], "scrape_id": capture["scrape_id"], "captured_at": None}
+    try:
+        records = {kind: load_record(path) for kind, path in capture["pages"].items()}
+        profile = records.get("profile")
+        if profile is None:
+            return {**result, "data": {}, "message": "Error: halaman profil tidak ada di archive"}
+
+        # Log per item dari parser profile_parsing tidak perlu untuk ribuan halaman
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = parse_profile(profile["html"])
+            data["skills"] = parse_skills(records["skills"]["html"]) if "skills" in records else ""
+
+        return {
+            **result,
+            "vanity_name": profile["vanity_name"],
+            "captured_at": profile["captured_at"],
+            "url": profile["url"],
+            "data": data,
+            "message": "ok" if data.get("full_name") else "Error: full_name tidak ditemukan"
+        }
+    except Exception as e:
+        return {**result, "data": {}, "message": f"Error: {str(e)}"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract ulang PageArchive tanpa browser")
+    parser.add_argument("archive", help="Direktori archive (PAGE_ARCHIVE_DIR)")
+    parser.add_argument("--output", default="-", help="File NDJSON hasil (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Jumlah process (default: jumlah core)")
+    parser.add_argument("--latest-only", action="store_true", help="Hanya scrape terbaru per profil")
+    parser.add_argument("--chunksize", type=int, default=16, help="Capture per batch yang dikirim ke worker")
+    args = parser.parse_args()
+
+    captures = iter_captures(args.archive, latest_only=args.latest_only)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    started = time.perf_counter()
+    total = failed = 0
+    try:
+        if args.workers <= 1:
+            results = map(extract_capture, captures)
+            pool = None
+        else:
+            pool = Pool(args.workers)
+            results = pool.imap_unordered(extract_capture, captures, chunksize=args.chunksize)
+        for result in results:
+            total += 1
+            if result["message"] != "ok":
+                failed += 1
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+        if pool:
+            pool.close()
+            pool.join()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"[OFFLINE] {total} capture(s), {failed} failed in {elapsed:.1f}s "
+          f"({total / elapsed if elapsed else 0:.0f}/s, {args.workers} worker(s))", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import gzip
+import json
+import os
+import re
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Versi format record; naikkan jika field berubah supaya extractor offline bisa membedakan
+ARCHIVE_FORMAT = 1
+
+ARCHIVE_FILE_PATTERN = re.compile(r"^(?P<captured>\d{8}T\d{6})-(?P<scrape_id>[0-9a-f]+)-(?P<kind>[a-z]+)\.json\.gz$")
+
+
+class PageArchive:
+    def __init__(self, root: str, compress_level: int = 6):
+        """
+        Simpan HTML halaman yang sudah di-render (profil dan skills) beserta
+        metadata, untuk di-extract ulang offline tanpa browser (lihat
+        offline_extractor.py)
+
+        Layout: <root>/<vanity_name>/<captured_at>-<scrape_id>-<kind>.json.gz,
+        satu record gzip JSON per halaman.
+
+        Args:
+            root: Direktori archive
+            compress_level: Level gzip (1 paling cepat, 9 paling kecil)
+        """
+        self.root = root
+        self.compress_level = compress_level
+        os.makedirs(root, exist_ok=True)
+
+    def _vanity_dir(self, vanity_name: str) -> str:
+        key = re.sub(r"[^a-z0-9_.-]", "_", vanity_name.strip().strip("/").lower())
+        return os.path.join(self.root, key)
+
+    def save(self, vanity_name: str, scrape_id: str, kind: str, html: str, url: str,
+             metadata: Optional[Dict] = None) -> str:
+        """
+        Tulis satu halaman ke archive
+
+        Args:
+            scrape_id: Id scrape; halaman profil dan skills dari scrape yang sama berbagi id
+            kind: "profile" atau "skills"
+            metadata: Field tambahan (misal section_index saat scrape)
+
+        Returns:
+            Path file yang ditulis
+        """
+        captured_at = time.time()
+        record = {
+            "format": ARCHIVE_FORMAT,
+            "vanity_name": vanity_name,
+            "scrape_id": scrape_id,
+            "kind": kind,
+            "url": url,
+            "captured_at": captured_at,
+            "metadata": metadata or {},
+            "html": html
+        }
+        directory = self._vanity_dir(vanity_name)
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(captured_at))}-{scrape_id}-{kind}.json.gz"
+        path = os.path.join(directory, name)
+        # Tulis ke file sementara dulu supaya extractor tidak membaca file setengah jadi
+        tmp_path = path + ".tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=self.compress_level) as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return path
+
+
+def load_record(path: str) -> Dict:
+    """Baca satu record archive"""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def iter_captures(root: str, latest_only: bool = False) -> Iterator[Dict]:
+    """
+    Kelompokkan file archive per scrape tanpa membuka isinya
+
+    Args:
+        latest_only: Hanya scrape terbaru per vanity_name
+
+    Yields:
+        {"vanity_dir", "scrape_id", "captured", "pages": {kind: path}}
+    """
+    for vanity_dir in sorted(os.listdir(root)):
+        directory = os.path.join(root, vanity_dir)
+        if not os.path.isdir(directory):
+            continue
+        captures = {}
+        for name in os.listdir(directory):
+            match = ARCHIVE_FILE_PATTERN.match(name)
+            if not match:
+                continue
+            capture = captures.setdefault(match["scrape_id"], {
+                "vanity_dir": vanity_dir,
+                "scrape_id": match["scrape_id"],
+                "captured": match["captured"],
+                "pages": {}
+            })
+            capture["captured"] = min(capture["captured"], match["captured"])
+            capture["pages"][match["kind"]] = os.path.join(directory, name)
+        ordered: List[Dict] = sorted(captures.values(), key=lambda c: c["captured"])
+        if latest_only:
+            ordered = ordered[-1:]
+        yield from ordered
@@ -0,0 +1,200 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class CachedProfile:
+    """Hasil scrape yang tersimpan di cache beserta waktu simpan dan TTL-nya"""
+
+    def __init__(self, result: Dict, stored_at: float, ttl: float):
+        self.result = result
+        self.stored_at = stored_at
+        self.ttl = ttl
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        """Masih fresh menurut TTL entry, atau menurut max_age dari caller jika diisi"""
+        limit = self.ttl if max_age is None else max_age
+        return self.age <= limit
+
+
+class ProfileCache:
+    def __init__(self, db_path: str = "profile_cache.sqlite3", ttl: float = 86400,
+                 stale_ttl: float = 3600, max_memory_entries: int = 256,
+                 max_disk_entries: int = 10000):
+        """
+        Cache hasil scrape dua tingkat: LRU in-memory di depan SQLite on-disk
+
+        File SQLite boleh dipakai bersama beberapa proses (API dan worker.py);
+        tulisan proses lain membuat LRU memory proses ini dibuang supaya
+        hasil yang lebih baru terbaca dari SQLite.
+
+        Args:
+            db_path: Lokasi file SQLite
+            ttl: Default umur (detik) entry dianggap fresh
+            stale_ttl: Setelah TTL habis, entry masih boleh disajikan selama
+                sekian detik sambil di-refresh di background (stale-while-revalidate)
+            max_memory_entries: Jumlah maksimal entry di LRU memory
+            max_disk_entries: Jumlah maksimal entry di SQLite; yang paling lama
+                tidak diakses dibuang lebih dulu
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                vanity_name TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                ttl REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_accessed ON profiles (accessed_at)")
+        self._conn.commit()
+        self._data_version = self._read_data_version()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, vanity_name: str) -> str:
+        return vanity_name.strip().strip("/").lower()
+
+    def _read_data_version(self) -> int:
+        # Berubah hanya jika koneksi lain (proses lain) commit ke database
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _sync_memory(self):
+        """Buang LRU memory jika proses lain sudah menulis ke SQLite"""
+        data_version = self._read_data_version()
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._memory.clear()
+
+    def _is_servable(self, entry: CachedProfile) -> bool:
+        """Entry masih boleh disajikan (fresh atau masih dalam jendela stale)"""
+        return entry.age <= entry.ttl + self.stale_ttl
+
+    def _remember(self, key: str, entry: CachedProfile):
+        """Simpan ke LRU memory dan buang entry paling lama jika penuh"""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, vanity_name: str, max_age: Optional[float] = None) -> Optional[CachedProfile]:
+        """
+        Ambil entry cache yang masih bisa disajikan
+
+        Returns:
+            CachedProfile (bisa fresh atau stale; cek dengan is_fresh) atau None
+        """
+        key = self._key(vanity_name)
+        with self._lock:
+            self._sync_memory()
+            entry = self._memory.get(key)
+            if entry is not None and not self._is_servable(entry):
+                del self._memory[key]
+                entry = None
+
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+            else:
+                row = self._conn.execute(
+                    "SELECT result, stored_at, ttl FROM profiles WHERE vanity_name = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = CachedProfile(json.loads(row[0]), row[1], row[2])
+                    if self._is_servable(entry):
+                        self.disk_hits += 1
+                        self._remember(key, entry)
+                        self._conn.execute(
+                            "UPDATE profiles SET accessed_at = ? WHERE vanity_name = ?", (time.time(), key)
+                        )
+                    else:
+                        self._conn.execute("DELETE FROM profiles WHERE vanity_name = ?", (key,))
+                        entry = None
+                    self._conn.commit()
+
+            if entry is None:
+                self.misses += 1
+            elif not entry.is_fresh(max_age):
+                self.stale_hits += 1
+            return entry
+
+    def set(self, vanity_name: str, result: Dict, ttl: Optional[float] = None, remember: bool = True):
+        """
+        Simpan hasil scrape ke memory dan SQLite
+
+        Args:
+            remember: False untuk hanya menulis ke SQLite (misal dari worker.py
+                yang hasilnya dibaca proses API, bukan dari memory-nya sendiri)
+        """
+        key = self._key(vanity_name)
+        entry = CachedProfile(result, time.time(), self.ttl if ttl is None else ttl)
+        with self._lock:
+            if remember:
+                self._remember(key, entry)
+            else:
+                self._memory.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles (vanity_name, result, stored_at, ttl, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), entry.stored_at, entry.ttl, entry.stored_at)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+            overflow = count - self.max_disk_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM profiles WHERE vanity_name IN "
+                    "(SELECT vanity_name FROM profiles ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def invalidate(self, vanity_name: str):
+        """Hapus entry dari kedua tingkat cache"""
+        key = self._key(vanity_name)
+        with self._lock:
+            self._memory.pop(key, None)
+            self._conn.execute("DELETE FROM profiles WHERE vanity_name = ?", (key,))
+            self._conn.commit()
+
+    def stats(self) -> Dict:
+        """Statistik hit/miss untuk health/metrics endpoint"""
+        with self._lock:
+            disk_entries = self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,163 @@
+"""
+Aturan parsing profil yang tidak bergantung pada browser
+
+Dipakai semua engine (Selenium, cdp) dan offline_extractor.py: input berupa
+text/dict hasil extract, output field profil. Tidak ada state; aman dipanggil
+dari banyak thread/process.
+"""
+from typing import Dict, List, Optional
+
+# Keyword untuk mengenali section profil dari id atau heading h2 (English + Indonesia)
+SECTION_KEYWORDS = {
+    "experience": (["experience"], ["pengalaman", "experience"]),
+    "education": (["education"], ["pendidikan", "education"]),
+    "certifications": (["certification", "license"], ["sertifikat", "license", "certification"]),
+    "skills": (["skills"], ["keahlian", "skills"]),
+    "about": (["about"], ["tentang", "about"]),
+}
+
+
+def index_sections(sections: List[Dict]) -> Dict[str, int]:
+    """
+    Petakan jenis section (experience, education, certifications, skills,
+    about) ke nomor section (1-based, sesuai XPath section[n])
+
+    Args:
+        sections: [{"id", "heading"}] per section, urut sesuai DOM (lihat SECTION_SUMMARY_JS)
+
+    Id section dicek lebih dulu di semua section, baru fallback ke heading.
+    """
+    index = {}
+    for kind, (id_keywords, heading_keywords) in SECTION_KEYWORDS.items():
+        for idx, section in enumerate(sections, start=1):
+            section_id = (section.get("id") or "").lower()
+            if section_id and any(k in section_id for k in id_keywords):
+                index[kind] = idx
+                break
+
+        if kind in index:
+            continue
+
+        # Fallback: cek berdasarkan heading
+        for idx, section in enumerate(sections, start=1):
+            heading = (section.get("heading") or "").lower()
+            if any(k in heading for k in heading_keywords):
+                index[kind] = idx
+                break
+    return index
+
+
+def about_candidates(section_index: Dict[str, int]) -> List[int]:
+    """Nomor section yang dicoba untuk About: hasil index dulu, lalu section[3] dan section[2]"""
+    candidates = []
+    if section_index.get("about"):
+        candidates.append(section_index["about"])
+    for section_number in (3, 2):
+        if section_number not in candidates:
+            candidates.append(section_number)
+    return candidates
+
+
+def clean_text(text: str) -> Optional[str]:
+    """Bersihkan text dari duplikasi dan whitespace"""
+    if not text:
+        return None
+
+    lines = text.split('\n')
+    cleaned_lines = []
+    prev_line = None
+
+    for line in lines:
+        line = line.strip()
+        if line and line != prev_line:
+            cleaned_lines.append(line)
+            prev_line = line
+
+    result = '\n'.join(cleaned_lines).strip()
+    return result if result else None
+
+
+def parse_experience_texts(idx: int, texts: List[str]) -> Optional[Dict]:
+    """Ubah text visible satu item experience menjadi dict experience"""
+    # LinkedIn experience pattern biasanya:
+    # [0] = Title
+    # [1] = Company · Employment type
+    # [2] = Date range
+    # [3] = Location (optional)
+
+    if len(texts) < 3:
+        print(f"✗ Experience {idx} skipped - insufficient data (only {len(texts)} fields)")
+        return None
+
+    title = texts[0]
+    company_raw = texts[1]
+    date_range = texts[2]
+    location = texts[3] if len(texts) > 3 else None
+
+    # Parse company (remove employment type if exists)
+    # e.g., "PaperPlay Studio · Magang" -> "PaperPlay Studio"
+    company = company_raw.split('·')[0].strip() if '·' in company_raw else company_raw
+
+    # Validasi: title dan company tidak boleh sama (indikator education)
+    if title == company:
+        print(f"✗ Experience {idx} skipped - title == company (likely education)")
+        return None
+
+    print(f"✓ Experience {idx}: {title} at {company}")
+    return {
+        "title": title,
+        "company": company,
+        "date_range": date_range,
+        "location": location
+    }
+
+
+def parse_education_texts(idx: int, texts: List[str]) -> Optional[Dict]:
+    """Ubah text visible satu item education menjadi dict education"""
+    # LinkedIn education pattern:
+    # [0] = School name
+    # [1] = Degree / Field of study
+    # [2] = Date range
+
+    if len(texts) < 3:
+        print(f"✗ Education {idx} skipped - insufficient data (only {len(texts)} fields)")
+        return None
+
+    school = texts[0]
+    degree = texts[1]
+    date_range = texts[2]
+
+    # Validasi: school dan degree tidak boleh sama persis
+    if school == degree:
+        print(f"✗ Education {idx} skipped - school == degree (malformed data)")
+        return None
+
+    print(f"✓ Education {idx}: {degree} at {school}")
+    return {
+        "school": school,
+        "degree": degree,
+        "date_range": date_range
+    }
+
+
+def accept_certification(idx: int, cert_data: Dict) -> bool:
+    """Hanya terima certification yang punya name"""
+    if cert_data.get("name"):
+        print(f"✓ Certification {idx}: {cert_data['name']}")
+        return True
+    print(f"✗ Certification {idx} skipped - no name found")
+    return False
+
+
+def skills_from_texts(texts: List[str]) -> List[str]:
+    """Bersihkan dan dedup teks list skills"""
+    skills = []
+    seen = set()
+    for text in texts:
+        skill_text = clean_text(text)
+        # Filter: hanya ambil skill (biasanya pendek, < 50 karakter)
+        # Skip yang panjang (biasanya endorsement info)
+        if skill_text and len(skill_text) < 50 and skill_text not in seen:
+            seen.add(skill_text)
+            skills.append(skill_text)
+    return skills
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Section profil yang di-fingerprint, beserta field hasil scrape milik masing-masing
+SECTION_FIELDS = {
+    "top_card": ("full_name", "headline", "location"),
+    "about": ("about",),
+    "experiences": ("experiences",),
+    "educations": ("educations",),
+    "certifications": ("certifications",),
+    "skills": ("skills",),
+}
+PROFILE_SECTIONS = tuple(SECTION_FIELDS)
+PROFILE_FIELDS = tuple(field for fields in SECTION_FIELDS.values() for field in fields)
+LIST_SECTIONS = ("experiences", "educations", "certifications", "skills")
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Baca parameter fields= (dipisah koma); nama section (misal top_card)
+    diperluas menjadi field-nya. None/kosong berarti semua field.
+
+    Raises:
+        ValueError: jika ada nama field yang tidak dikenal
+    """
+    if value is None or not value.strip():
+        return None
+    fields = []
+    for name in (part.strip() for part in value.split(",")):
+        if not name:
+            continue
+        if name in SECTION_FIELDS:
+            fields.extend(SECTION_FIELDS[name])
+        elif name in PROFILE_FIELDS:
+            fields.append(name)
+        else:
+            choices = ", ".join(dict.fromkeys(PROFILE_SECTIONS + PROFILE_FIELDS))
+            raise ValueError(f"Field tidak dikenal: {name} (pilihan: {choices})")
+    # Hanya koma/spasi (misal "fields=,") sama dengan tanpa fields
+    return list(dict.fromkeys(fields)) or None
+
+
+def sections_for_fields(fields: Optional[List[str]]) -> List[str]:
+    """Section yang perlu di-extract untuk fields; semua section jika fields None"""
+    if fields is None:
+        return list(PROFILE_SECTIONS)
+    return [section for section, owned in SECTION_FIELDS.items() if any(field in fields for field in owned)]
+
+
+def project_fields(data: Dict, fields: Optional[List[str]]) -> Dict:
+    """Ambil hanya fields dari hasil scrape; fields None berarti semua"""
+    if fields is None:
+        return data
+    return {field: data.get(field) for field in PROFILE_FIELDS if field in fields}
+
+
+def fingerprint(value) -> Optional[str]:
+    """Hash stabil (sha1 dari JSON kanonik) untuk satu nilai; None untuk nilai kosong"""
+    if value is None or value == "" or value == [] or value == {}:
+        return None
+    if isinstance(value, str):
+        payload = value
+    else:
+        payload = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def section_value(data: Dict, section: str):
+    """Nilai satu section dari hasil scrape; skills dipecah menjadi list"""
+    if section == "top_card":
+        return {field: data.get(field) for field in SECTION_FIELDS["top_card"]}
+    if section == "skills":
+        return [skill for skill in (data.get("skills") or "").split("|") if skill]
+    return data.get(section)
+
+
+def section_fields(data: Dict, sections) -> Dict:
+    """Salin field milik sections dari hasil scrape (untuk dipakai ulang saat refresh)"""
+    return {field: data.get(field) for section in sections for field in SECTION_FIELDS[section]}
+
+
+def content_fingerprints(data: Dict) -> Dict[str, Dict]:
+    """{section: {"count", "hash"}} dari hasil scrape"""
+    fingerprints = {}
+    for section in PROFILE_SECTIONS:
+        value = section_value(data, section)
+        if section == "top_card":
+            value = value if any(value.values()) else None
+        count = len(value) if isinstance(value, list) else int(bool(value))
+        fingerprints[section] = {"count": count, "hash": fingerprint(value)}
+    return fingerprints
+
+
+def changed_sections(previous: Optional[Dict[str, Dict]], current: Dict[str, Dict]) -> List[str]:
+    """
+    Section yang count/hash-nya berbeda antara dua set fingerprint (atau
+    sinyal halaman); semua section jika previous kosong
+    """
+    if not previous:
+        return list(PROFILE_SECTIONS)
+    return [section for section in PROFILE_SECTIONS if previous.get(section) != current.get(section)]
+
+
+def diff_profiles(old: Dict, new: Dict) -> Dict:
+    """
+    Perubahan per section antara dua hasil scrape
+
+    Returns:
+        {"changed": [section, ...], "sections": {section: perubahan}}; section
+        list berisi {"added", "removed"}, section lain {"old", "new"}
+    """
+    sections = {}
+    for section in PROFILE_SECTIONS:
+        old_value, new_value = section_value(old, section), section_value(new, section)
+        if fingerprint(old_value) == fingerprint(new_value):
+            continue
+        if section in LIST_SECTIONS:
+            old_keys = {fingerprint(item) for item in old_value or []}
+            new_keys = {fingerprint(item) for item in new_value or []}
+            sections[section] = {
+                "added": [item for item in new_value or [] if fingerprint(item) not in old_keys],
+                "removed": [item for item in old_value or [] if fingerprint(item) not in new_keys]
+            }
+        else:
+            sections[section] = {"old": old_value, "new": new_value}
+    return {"changed": list(sections), "sections": sections}
+
+
+class ProfileSnapshot:
+    """Satu versi profil beserta fingerprint section dan sinyal halaman saat di-scrape"""
+
+    def __init__(self, vanity_name: str, data: Dict, fingerprints: Dict, signals: Dict,
+                 skills_source: Optional[str], scraped_at: float, checked_at: float, full_scraped_at: float):
+        self.vanity_name = vanity_name
+        self.data = data
+        self.fingerprints = fingerprints
+        # Sinyal murah dari halaman profil (lihat LinkedInScraper._page_signals)
+        self.signals = signals
+        self.skills_source = skills_source
+        # scraped_at: versi ini pertama kali terlihat; checked_at: terakhir
+        # dipastikan masih sama; full_scraped_at: terakhir semua section di-extract
+        self.scraped_at = scraped_at
+        self.checked_at = checked_at
+        self.full_scraped_at = full_scraped_at
+
+
+class SnapshotStore:
+    def __init__(self, db_path: str = "profile_snapshots.sqlite3", history: int = 5):
+        """
+        Riwayat versi profil untuk refresh incremental dan endpoint diff
+
+        Scrape yang hasilnya sama dengan versi terakhir hanya memperbarui
+        checked_at; versi baru disimpan hanya jika ada section yang berubah.
+
+        Args:
+            db_path: Lokasi file SQLite
+            history: Jumlah versi yang disimpan per profil
+        """
+        self.db_path = db_path
+        self.history = max(history, 2)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                vanity_name TEXT NOT NULL,
+                data TEXT NOT NULL,
+                fingerprints TEXT NOT NULL,
+                signals TEXT NOT NULL,
+                skills_source TEXT,
+                scraped_at REAL NOT NULL,
+                checked_at REAL NOT NULL,
+                full_scraped_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_vanity ON snapshots (vanity_name, id)")
+        self._conn.commit()
+
+    def _key(self, vanity_name: str) -> str:
+        return vanity_name.strip().strip("/").lower()
+
+    def _recent(self, key: str, limit: int) -> List[ProfileSnapshot]:
+        rows = self._conn.execute(
+            "SELECT vanity_name, data, fingerprints, signals, skills_source, scraped_at, checked_at, "
+            "full_scraped_at FROM snapshots WHERE vanity_name = ? ORDER BY id DESC LIMIT ?", (key, limit)
+        ).fetchall()
+        return [
+            ProfileSnapshot(row[0], json.loads(row[1]), json.loads(row[2]), json.loads(row[3]),
+                            row[4], row[5], row[6], row[7])
+            for row in rows
+        ]
+
+    def latest(self, vanity_name: str) -> Optional[ProfileSnapshot]:
+        with self._lock:
+            snapshots = self._recent(self._key(vanity_name), 1)
+        return snapshots[0] if snapshots else None
+
+    def latest_two(self, vanity_name: str) -> List[ProfileSnapshot]:
+        """Versi terbaru dan sebelumnya (jika ada), terbaru lebih dulu"""
+        with self._lock:
+            return self._recent(self._key(vanity_name), 2)
+
+    def save(self, vanity_name: str, data: Dict, signals: Optional[Dict] = None,
+             skills_source: Optional[str] = None, full: bool = True) -> List[str]:
+        """
+        Simpan hasil scrape yang berhasil
+
+        Args:
+            signals: Sinyal halaman dari scrape ini ({} untuk engine http; sinyal
+                lama dipertahankan)
+            full: True jika semua section di-extract ulang (bukan refresh incremental)
+
+        Returns:
+            Section yang berubah dibanding versi sebelumnya (semua untuk profil baru)
+        """
+        key = self._key(vanity_name)
+        fingerprints = content_fingerprints(data)
+        now = time.time()
+        with self._lock:
+            previous = self._recent(key, 1)
+            previous = previous[0] if previous else None
+            changed = changed_sections(previous.fingerprints if previous else None, fingerprints)
+
+            if previous is not None and not changed:
+                self._conn.execute(
+                    "UPDATE snapshots SET checked_at = ?, signals = ?, skills_source = ?, full_scraped_at = ? "
+                    "WHERE id = (SELECT MAX(id) FROM snapshots WHERE vanity_name = ?)",
+                    (now, json.dumps(signals or previous.signals), skills_source or previous.skills_source,
+                     now if full else previous.full_scraped_at, key)
+                )
+            else:
+                self._conn.execute(
+                    "INSERT INTO snapshots (vanity_name, data, fingerprints, signals, skills_source, "
+                    "scraped_at, checked_at, full_scraped_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, json.dumps(data, ensure_ascii=False), json.dumps(fingerprints),
+                     json.dumps(signals or (previous.signals if previous else {})), skills_source,
+                     now, now, now if full or previous is None else previous.full_scraped_at)
+                )
+                self._conn.execute(
+                    "DELETE FROM snapshots WHERE vanity_name = ? AND id NOT IN "
+                    "(SELECT id FROM snapshots WHERE vanity_name = ? ORDER BY id DESC LIMIT ?)",
+                    (key, key, self.history)
+                )
+            self._conn.commit()
+        return changed
+
+    def stats(self) -> Dict:
+        """Statistik untuk health endpoint"""
+        with self._lock:
+            profiles, versions = self._conn.execute(
+                "SELECT COUNT(DISTINCT vanity_name), COUNT(*) FROM snapshots"
+            ).fetchone()
+        return {"profiles": profiles, "versions": versions}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
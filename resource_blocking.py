@@ -0,0 +1,92 @@
+import json
+from typing import Dict, List, Optional
+
+# Resource yang tidak pernah dibutuhkan extractor: gambar, font, video, serta
+# script analytics/iklan. Pola memakai wildcard Network.setBlockedURLs (*).
+# JS dan CSS milik LinkedIn sendiri tidak diblok karena halaman profil adalah SPA.
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    # Gambar
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*media.licdn.com/dms/image*",
+    # Font
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    # Video / audio
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*dms.licdn.com/playlist*",
+    # Analytics dan iklan
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*", "*linkedin.com/li/track*",
+    "*linkedin.com/sensorCollect*", "*bat.bing.com*", "*connect.facebook.net*",
+]
+
+
+def parse_blocked_url_patterns(value: Optional[str]) -> List[str]:
+    """
+    Baca daftar pola dari env (dipisah koma)
+
+    "" atau None -> DEFAULT_BLOCKED_URL_PATTERNS, "none" -> tanpa blocking,
+    "+pola1,pola2" -> default ditambah pola tersebut
+    """
+    if not value or not value.strip():
+        return list(DEFAULT_BLOCKED_URL_PATTERNS)
+    value = value.strip()
+    if value.lower() == "none":
+        return []
+    if value.startswith("+"):
+        extra = [p.strip() for p in value[1:].split(",") if p.strip()]
+        return DEFAULT_BLOCKED_URL_PATTERNS + extra
+    return [p.strip() for p in value.split(",") if p.strip()]
+
+
+def apply_resource_blocking(driver, patterns: List[str]):
+    """
+    Blok request yang cocok dengan patterns lewat CDP di tab aktif
+
+    Berlaku per tab (target CDP): panggil ulang setelah switch ke tab baru.
+    """
+    if not patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+def drain_network_log(driver):
+    """Buang performance log yang tersisa (misal dari scrape sebelumnya di driver pool)"""
+    try:
+        driver.get_log("performance")
+    except Exception:
+        pass
+
+
+def collect_network_stats(driver) -> Dict:
+    """
+    Ringkas performance log sejak drain terakhir
+
+    Returns:
+        {"requests", "blocked", "bytes", "blocked_by_type"}: jumlah request,
+        request yang diblok, byte yang benar-benar ditransfer (encodedDataLength),
+        dan jumlah request diblok per resource type. {} jika log tidak tersedia.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return {}
+
+    stats = {"requests": 0, "blocked": 0, "bytes": 0, "blocked_by_type": {}}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError, TypeError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+        elif method == "Network.loadingFinished":
+            stats["bytes"] += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            stats["blocked"] += 1
+            resource_type = params.get("type") or "Other"
+            stats["blocked_by_type"][resource_type] = stats["blocked_by_type"].get(resource_type, 0) + 1
+    return stats
@@ -0,0 +1,406 @@
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Sequence
+
+# Lane scrape berurutan dari prioritas tertinggi: lookup interaktif (UI) dan
+# enrichment bulk (batch /profiles, refresh background)
+DEFAULT_LANES = ("interactive", "bulk")
+
+
+def default_reserved(lanes: Sequence[str], max_in_flight: int) -> Dict[str, int]:
+    """
+    Slot yang dipesan per lane jika tidak dikonfigurasi: satu slot per lane
+    selama masih tersisa slot bersama, atau satu slot untuk lane pertama jika
+    slot terlalu sedikit (lane lain maju lewat aging, lihat ScrapeExecutor)
+    """
+    if len(lanes) < 2:
+        return {}
+    if max_in_flight > len(lanes):
+        return {lane: 1 for lane in lanes}
+    return {lanes[0]: 1} if max_in_flight > 1 else {}
+
+
+class ScrapeQueueFull(Exception):
+    """Antrian scrape penuh; caller sebaiknya retry setelah retry_after detik"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Antrian scrape penuh, coba lagi dalam {retry_after} detik")
+        self.retry_after = retry_after
+
+
+class ScrapeDeadlineExceeded(Exception):
+    """Deadline request habis sebelum scrape sempat dimulai (misal selama antri)"""
+
+
+def parse_lane_values(value: Optional[str]) -> Dict[str, int]:
+    """
+    Parse konfigurasi per lane dari env, contoh "interactive:1,bulk:2"
+
+    Raises:
+        ValueError: jika format salah
+    """
+    result = {}
+    for item in (value or "").split(","):
+        if not item.strip():
+            continue
+        lane, sep, number = item.partition(":")
+        if not sep or not lane.strip() or not number.strip().isdigit():
+            raise ValueError(f"Format lane tidak valid: {item.strip()!r} (contoh: interactive:1)")
+        result[lane.strip()] = int(number)
+    return result
+
+
+class _Waiter:
+    def __init__(self, lane: "_Lane", client: str, key: Optional[str]):
+        self.lane = lane
+        self.client = client
+        self.key = key
+        self.future = asyncio.get_running_loop().create_future()
+        self.enqueued_at = time.monotonic()
+
+
+class _Lane:
+    def __init__(self, name: str, priority: int, reserved: int, max_queue: int):
+        self.name = name
+        self.priority = priority
+        self.reserved = reserved
+        self.max_queue = max_queue
+        # {client: deque[_Waiter]}; urutan dict = giliran round-robin antar client
+        self.queues: "OrderedDict[str, deque]" = OrderedDict()
+        self.in_flight = 0
+        self.waiting = 0
+        self.total_completed = 0
+        self.total_rejected = 0
+        self.total_promoted = 0
+        self.total_wait_seconds = 0.0
+        self.total_started = 0
+        self.total_aged = 0
+        self.last_started = 0.0
+
+    def push(self, waiter: _Waiter):
+        self.queues.setdefault(waiter.client, deque()).append(waiter)
+        self.waiting += 1
+
+    def pop(self) -> _Waiter:
+        """Waiter berikutnya: client di depan giliran, lalu client itu pindah ke belakang"""
+        client, queue = next(iter(self.queues.items()))
+        waiter = queue.popleft()
+        del self.queues[client]
+        if queue:
+            self.queues[client] = queue
+        self.waiting -= 1
+        return waiter
+
+    def oldest(self) -> float:
+        """enqueued_at waiter terlama di lane ini (kepala antrian setiap client)"""
+        return min(queue[0].enqueued_at for queue in self.queues.values())
+
+    def remove(self, waiter: _Waiter) -> bool:
+        queue = self.queues.get(waiter.client)
+        if queue is None or waiter not in queue:
+            return False
+        queue.remove(waiter)
+        if not queue:
+            del self.queues[waiter.client]
+        self.waiting -= 1
+        return True
+
+    def ahead_of(self, client: str, index: int) -> int:
+        """Jumlah waiter di lane ini yang dilayani sebelum waiter ke-index milik client"""
+        ahead = 0
+        passed = False
+        for other, queue in self.queues.items():
+            if other == client:
+                passed = True
+                ahead += min(len(queue), index)
+            else:
+                # Client sebelum giliran client ini dilayani sekali lagi di putaran yang sama
+                ahead += min(len(queue), index if passed else index + 1)
+        return ahead
+
+
+class ScrapeExecutor:
+    def __init__(self, max_in_flight: int = 2, max_queue: int = 10, default_duration: float = 15.0,
+                 lanes: Sequence[str] = DEFAULT_LANES, reserved: Optional[Dict[str, int]] = None,
+                 lane_max_queue: Optional[Dict[str, int]] = None, client_max_queue: int = 0,
+                 max_wait: float = 60.0):
+        """
+        Jalankan scrape (blocking Selenium) di thread pool supaya event loop
+        FastAPI tetap responsif; scrape async (engine cdp) di-await langsung
+        dengan batas in-flight dan antrian yang sama
+
+        Scrape dijadwalkan per lane prioritas: slot kosong diberikan ke lane
+        dengan prioritas tertinggi yang punya antrian. Setiap lane bisa
+        memesan slot (reserved) yang hanya dipakai lane itu, sehingga lookup
+        interaktif tetap dapat browser saat batch besar berjalan dan bulk
+        tetap jalan saat traffic interaktif tinggi; sisa slot dipakai bersama.
+        Lane yang punya antrian tapi tidak memulai scrape selama max_wait
+        detik (aging) didahulukan untuk satu slot berikutnya yang boleh
+        dipakainya, jadi lane tanpa slot pesanan tetap maju minimal satu
+        scrape per max_wait detik. Di dalam satu lane, antrian dilayani
+        round-robin per client.
+
+        Args:
+            max_in_flight: Jumlah scrape yang berjalan bersamaan
+            max_queue: Jumlah scrape yang boleh menunggu giliran per lane; selebihnya ditolak
+            default_duration: Estimasi awal durasi scrape (detik) untuk Retry-After
+            lanes: Nama lane, urut dari prioritas tertinggi
+            reserved: {lane: slot in-flight yang dipesan}; total tidak boleh melebihi max_in_flight
+            lane_max_queue: {lane: batas antrian} untuk mengganti max_queue per lane
+            client_max_queue: Batas antrian satu client per lane (0 = tanpa batas)
+            max_wait: Detik tanpa scrape yang dimulai sebelum lane didahulukan (0 = tanpa aging)
+
+        Raises:
+            ValueError: jika lane tidak dikenal, slot yang dipesan melebihi
+                max_in_flight, ada lane tanpa slot sama sekali, atau aging
+                dimatikan sementara ada lane tanpa slot pesanan
+        """
+        reserved = reserved or {}
+        lane_max_queue = lane_max_queue or {}
+        unknown = (set(reserved) | set(lane_max_queue)) - set(lanes)
+        if not lanes or unknown:
+            raise ValueError(f"Lane tidak dikenal: {', '.join(sorted(unknown))} (lane: {', '.join(lanes)})")
+        if sum(reserved.values()) > max_in_flight:
+            raise ValueError(f"Slot yang dipesan ({sum(reserved.values())}) melebihi max_in_flight ({max_in_flight})")
+        starved = [lane for lane in lanes if not reserved.get(lane)]
+        if starved and sum(reserved.values()) == max_in_flight:
+            raise ValueError(f"Lane {', '.join(starved)} tidak pernah dapat slot: semua slot sudah dipesan lane lain")
+        if starved and len(lanes) > 1 and not max_wait:
+            raise ValueError(f"Lane {', '.join(starved)} bisa kehabisan slot saat lane lain penuh: "
+                             f"pesan slot untuk lane tersebut atau aktifkan aging (max_wait > 0)")
+
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.client_max_queue = client_max_queue
+        self.max_wait = max_wait
+        self.lanes: Dict[str, _Lane] = {
+            name: _Lane(name, priority, reserved.get(name, 0), lane_max_queue.get(name, max_queue))
+            for priority, name in enumerate(lanes)
+        }
+        self.default_lane = lanes[0]
+        # Slot yang tidak dipesan lane mana pun
+        self.shared_slots = max_in_flight - sum(reserved.values())
+
+        self._pool = ThreadPoolExecutor(max_workers=max(max_in_flight, 1), thread_name_prefix="scrape")
+        self._lock = threading.Lock()
+        self._avg_duration = default_duration
+
+    @property
+    def _in_flight(self) -> int:
+        return sum(lane.in_flight for lane in self.lanes.values())
+
+    @property
+    def _waiting(self) -> int:
+        return sum(lane.waiting for lane in self.lanes.values())
+
+    def _shared_in_use(self) -> int:
+        return sum(max(lane.in_flight - lane.reserved, 0) for lane in self.lanes.values())
+
+    def _can_start(self, lane: _Lane) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+        return lane.in_flight < lane.reserved or self._shared_in_use() < self.shared_slots
+
+    def _aged(self, lane: _Lane, now: float) -> bool:
+        """Lane punya antrian tapi tidak memulai scrape selama max_wait detik"""
+        if not self.max_wait or not lane.waiting:
+            return False
+        return now - max(lane.oldest(), lane.last_started) >= self.max_wait
+
+    def _start(self, lane: _Lane, now: float):
+        waiter = lane.pop()
+        lane.in_flight += 1
+        lane.total_started += 1
+        lane.last_started = now
+        lane.total_wait_seconds += now - waiter.enqueued_at
+        waiter.future.set_result(None)
+
+    def _dispatch(self):
+        """Berikan slot kosong ke waiter berikutnya, lane prioritas tertinggi dulu (dipanggil dengan _lock)"""
+        now = time.monotonic()
+        # Aging: lane yang terlalu lama tidak dapat slot didahulukan satu kali
+        for lane in self.lanes.values():
+            if self._aged(lane, now) and self._can_start(lane):
+                lane.total_aged += 1
+                self._start(lane, now)
+        for lane in self.lanes.values():
+            while lane.waiting and self._can_start(lane):
+                self._start(lane, now)
+
+    def _release(self, lane: _Lane):
+        lane.in_flight -= 1
+        self._dispatch()
+
+    def _lane(self, name: Optional[str]) -> _Lane:
+        lane = self.lanes.get(name or self.default_lane)
+        if lane is None:
+            raise ValueError(f"Lane tidak dikenal: {name} (lane: {', '.join(self.lanes)})")
+        return lane
+
+    def _capacity(self, lane: _Lane) -> int:
+        """Slot maksimal yang bisa dipakai lane (slot pesanannya + slot bersama)"""
+        return max(lane.reserved + self.shared_slots, 1)
+
+    def _estimate(self, lane: _Lane, ahead: int) -> int:
+        """Estimasi detik sampai waiter dengan `ahead` waiter di depannya mulai jalan"""
+        # Lane berprioritas lebih tinggi ikut berebut slot bersama
+        if self.shared_slots:
+            ahead += sum(other.waiting for other in self.lanes.values() if other.priority < lane.priority)
+        if ahead == 0 and self._can_start(lane):
+            return 0
+        rounds = (ahead + 1) / self._capacity(lane)
+        return max(1, math.ceil(rounds * self._avg_duration))
+
+    def _retry_after(self, lane: _Lane) -> int:
+        """Estimasi detik sampai ada slot kosong berdasarkan rata-rata durasi scrape"""
+        return max(1, self._estimate(lane, lane.waiting))
+
+    def position(self, lane: Optional[str] = None, client: str = "") -> Dict:
+        """
+        Posisi dan estimasi tunggu untuk scrape baru dari client di lane ini
+
+        Returns:
+            {"lane", "position" (jumlah scrape di depannya), "queued_by_client",
+             "estimated_wait_seconds"}
+        """
+        with self._lock:
+            lane = self._lane(lane)
+            queued = len(lane.queues.get(client, ()))
+            ahead = lane.ahead_of(client, queued)
+            return {
+                "lane": lane.name,
+                "position": ahead,
+                "queued_by_client": queued,
+                "estimated_wait_seconds": self._estimate(lane, ahead)
+            }
+
+    def promote(self, key: str, lane: Optional[str] = None) -> bool:
+        """
+        Pindahkan scrape dengan key ini yang masih antri di lane berprioritas
+        lebih rendah ke lane ini (misal request interaktif yang menumpang
+        scrape batch lewat single-flight)
+
+        Returns:
+            True jika ada waiter yang dipindah
+        """
+        with self._lock:
+            target = self._lane(lane)
+            for source in self.lanes.values():
+                if source.priority <= target.priority:
+                    continue
+                for queue in list(source.queues.values()):
+                    for waiter in queue:
+                        if waiter.key == key:
+                            source.remove(waiter)
+                            target.push(waiter)
+                            target.total_promoted += 1
+                            waiter.lane = target
+                            self._dispatch()
+                            return True
+            return False
+
+    async def run(self, fn: Callable, *args, deadline: Optional[float] = None, lane: Optional[str] = None,
+                  client: str = "", key: Optional[str] = None, **kwargs):
+        """
+        Jalankan fn(*args, **kwargs) di worker thread, atau await jika fn coroutine function
+
+        Args:
+            deadline: Batas waktu request (time.monotonic()); menunggu slot
+                tidak boleh melewatinya
+            lane: Lane prioritas (default lane pertama)
+            client: Identitas client untuk fair share di dalam lane
+            key: Key scrape (single-flight) supaya bisa di-promote ke lane lain
+
+        Raises:
+            ScrapeQueueFull: jika antrian lane (atau jatah client) sudah penuh
+            ScrapeDeadlineExceeded: jika deadline habis sebelum dapat slot
+            ValueError: jika lane tidak dikenal
+        """
+        with self._lock:
+            target = self._lane(lane)
+            waiter = _Waiter(target, client, key)
+            target.push(waiter)
+            self._dispatch()
+            if not waiter.future.done():
+                client_queued = len(target.queues.get(client, ()))
+                if target.waiting > target.max_queue or (
+                        self.client_max_queue and client_queued > self.client_max_queue):
+                    target.remove(waiter)
+                    target.total_rejected += 1
+                    raise ScrapeQueueFull(self._retry_after(target))
+
+        try:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            # shield: timeout tidak membatalkan future, slot yang terlanjur diberikan dilepas di bawah
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except BaseException as e:
+            with self._lock:
+                # Lane bisa berubah karena promote
+                if waiter.future.done():
+                    self._release(waiter.lane)
+                else:
+                    waiter.lane.remove(waiter)
+                    waiter.future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                raise ScrapeDeadlineExceeded("Deadline habis saat menunggu slot scrape")
+            raise
+
+        started = time.monotonic()
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                return await fn(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, lambda: fn(*args, **kwargs))
+        finally:
+            duration = time.monotonic() - started
+            with self._lock:
+                waiter.lane.total_completed += 1
+                # Exponential moving average durasi scrape
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+                self._release(waiter.lane)
+
+    def shutdown(self):
+        """Tunggu scrape yang sedang berjalan lalu matikan thread pool"""
+        self._pool.shutdown(wait=True)
+
+    def _lane_stats(self) -> Dict[str, Dict]:
+        """Statistik per lane (dipanggil dengan _lock)"""
+        return {
+            lane.name: {
+                "priority": lane.priority,
+                "reserved": lane.reserved,
+                "max_queue": lane.max_queue,
+                "in_flight": lane.in_flight,
+                "queued": lane.waiting,
+                "clients_queued": len(lane.queues),
+                "estimated_wait_seconds": self._estimate(lane, lane.waiting),
+                "avg_wait_seconds": round(lane.total_wait_seconds / lane.total_started, 2)
+                if lane.total_started else 0.0,
+                "total_completed": lane.total_completed,
+                "total_rejected": lane.total_rejected,
+                "total_promoted": lane.total_promoted,
+                "total_aged": lane.total_aged
+            }
+            for lane in self.lanes.values()
+        }
+
+    def stats(self) -> Dict:
+        """Statistik executor untuk health/metrics endpoint"""
+        with self._lock:
+            lanes = self._lane_stats()
+            return {
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "shared_slots": self.shared_slots,
+                "max_wait": self.max_wait,
+                "in_flight": self._in_flight,
+                "queued": self._waiting,
+                "avg_duration_seconds": round(self._avg_duration, 2),
+                "total_completed": sum(lane["total_completed"] for lane in lanes.values()),
+                "total_rejected": sum(lane["total_rejected"] for lane in lanes.values()),
+                "lanes": lanes
+            }
@@ -0,0 +1,293 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from ai_skills import get_skills_generator
+from profile_parsing import accept_certification, parse_education_texts, parse_experience_texts
+from profile_snapshots import (PROFILE_SECTIONS, changed_sections, content_fingerprints, fingerprint,
+                               project_fields, section_fields, sections_for_fields)
+
+# Section yang menjadi input prompt AI skills (lihat ai_skills.build_skills_prompt)
+AI_INPUT_SECTIONS = ("top_card", "about", "experiences")
+
+# Section yang dilewati saat deadline request hampir habis, sisa waktu minimal
+# (detik) untuk memulai pekerjaan opsional (section ini, AI fallback), dan waktu
+# yang disisakan untuk extract + response saat scroll/pagination dipersingkat
+OPTIONAL_SECTIONS = ("certifications", "skills")
+DEADLINE_RESERVE_SECONDS = 2.0
+DEADLINE_EXTRACT_SECONDS = 0.5
+
+# Pesan hasil scrape untuk profil yang tidak ada (bukan error; tidak perlu di-retry)
+PROFILE_NOT_FOUND_MESSAGE = "Profil tidak ditemukan"
+
+# Detik maksimal menunggu teks About terbuka setelah tombol "see more" diklik
+ABOUT_EXPAND_SECONDS = 1.0
+
+# Section yang baru dimuat setelah scroll (lazy) -> jenis section di SECTION_KEYWORDS
+LAZY_SECTION_KINDS = {"experiences": "experience", "educations": "education", "certifications": "certifications"}
+
+
+def remaining_seconds(deadline: Optional[float], timeout: float) -> float:
+    """timeout dipersingkat supaya tidak melewati deadline (time.monotonic(), None = tanpa deadline)"""
+    return timeout if deadline is None else max(min(timeout, deadline - time.monotonic()), 0.0)
+
+
+class ScrapeState:
+    """
+    State dan logika satu scrape yang tidak menyentuh browser, dipakai
+    bersama LinkedInScraper (Selenium) dan AsyncLinkedInScraper (cdp):
+    field/section yang diminta, deadline, instrumentasi (timings, errors,
+    skills_source, network, signals), parsing hasil PROFILE_EXTRACTION_JS,
+    refresh incremental dan bentuk response.
+
+    Method di sini tidak melakukan I/O, jadi aman dipanggil dari kode sync
+    maupun coroutine; method yang menyentuh browser ditulis per engine.
+    """
+
+    def _init_state(self, li_at_cookie: str, load_budget: float, settle_ms: int, base_url: str,
+                    skills_generator, ai_prefetch: bool, ai_timeout: float, parallel_skills: bool,
+                    page_archive, deadline: Optional[float]):
+        self.li_at_cookie = li_at_cookie
+        self.pages_loaded = 0
+        self.load_budget = load_budget
+        self.settle_ms = settle_ms
+        self.section_index = {}
+        self.base_url = base_url.rstrip("/")
+        self.skills_generator = skills_generator
+        self.ai_prefetch = ai_prefetch
+        self.ai_timeout = ai_timeout
+        self.parallel_skills = parallel_skills
+        self.page_archive = page_archive
+        self.vanity_name = None
+        self.scrape_id = None
+        # Field yang diminta caller (None: semua) dan section yang perlu di-extract
+        self.fields = None
+        self.sections = list(PROFILE_SECTIONS)
+        self.deadline = deadline
+        # Section yang dilewati atau tidak selesai dimuat karena deadline (hasil parsial)
+        self.skipped_sections = []
+
+        # Instrumentasi per scrape: durasi per fase (detik), error per extractor,
+        # sumber skills ("page", "api", "ai" atau None) dan engine yang
+        # menghasilkan data ("http", "selenium" atau "cdp")
+        self.timings = {}
+        self.errors = {}
+        self.skills_source = None
+        self.engine = None
+        self.started_at = None
+        # URL/alasan jika session li_at mendarat di login wall atau checkpoint
+        self.login_wall = None
+        # Statistik network per scrape (lihat resource_blocking.collect_network_stats)
+        self.network = {}
+        # Sinyal halaman per section (lihat _signals_from_raw) dan section yang
+        # dipakai ulang dari snapshot sebelumnya pada refresh incremental
+        self.signals = {}
+        self.reused_sections = []
+
+    @contextmanager
+    def _span(self, phase: str):
+        """Catat durasi satu fase ke self.timings (diakumulasi jika fase diulang)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - started
+
+    def _record_error(self, extractor: str):
+        """Hitung error per extractor untuk metrics"""
+        self.errors[extractor] = self.errors.get(extractor, 0) + 1
+
+    def _select_fields(self, fields: Optional[List[str]]):
+        """Tentukan section yang perlu di-extract untuk field yang diminta"""
+        self.fields = fields
+        self.sections = sections_for_fields(fields)
+
+    def _remaining(self) -> Optional[float]:
+        """Sisa waktu sampai deadline (detik), atau None jika tanpa deadline"""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def _wait_budget(self, timeout: float, reserve: float = 0.0) -> float:
+        """timeout dipersingkat supaya wait selesai reserve detik sebelum deadline"""
+        remaining = self._remaining()
+        if remaining is None:
+            return timeout
+        return max(min(timeout, remaining - reserve), 0.0)
+
+    def _has_time(self) -> bool:
+        """Cukup waktu untuk memulai pekerjaan opsional (section opsional, AI fallback)"""
+        remaining = self._remaining()
+        return remaining is None or remaining >= DEADLINE_RESERVE_SECONDS
+
+    def _skip_section(self, section: str):
+        """Tandai section sebagai dilewati karena deadline"""
+        if section not in self.skipped_sections:
+            self.skipped_sections.append(section)
+            print(f"[DEADLINE] Skipping {section}, {self._remaining():.1f}s left")
+
+    def _optional_sections(self, sections: List[str]) -> List[str]:
+        """Buang section opsional dari sections jika waktu tidak cukup"""
+        if self._has_time():
+            return sections
+        for section in sections:
+            if section in OPTIONAL_SECTIONS:
+                self._skip_section(section)
+        return [section for section in sections if section not in OPTIONAL_SECTIONS]
+
+    def _note_cut_short(self, sections: List[str], result: Dict, budget: float, kinds: Dict[str, str]):
+        """
+        Scroll/pagination yang dipotong deadline: section yang belum muncul
+        dianggap dilewati (bisa jadi memang tidak ada, tapi belum dipastikan)
+
+        Args:
+            kinds: {section: jenis di result["found"]}
+        """
+        if budget >= self.load_budget or result.get("reason") not in (None, "budget_exhausted"):
+            return
+        found = result.get("found") or {}
+        for section in sections:
+            if not found.get(kinds[section]):
+                self._skip_section(section)
+
+    def _note_lazy_cut_short(self, kinds: List[str], result: Dict, budget: float):
+        """Section lazy yang belum muncul saat scroll dipotong deadline (lihat _note_cut_short)"""
+        sections = [section for section, kind in LAZY_SECTION_KINDS.items() if kind in kinds]
+        self._note_cut_short(sections, result, budget, LAZY_SECTION_KINDS)
+
+    def _result(self, profile_data: Dict) -> Dict:
+        """Bentuk response scrape; section yang dilewati deadline bernilai None dan didaftar di skipped_sections"""
+        if self.skipped_sections:
+            profile_data = {**profile_data, **section_fields({}, self.skipped_sections)}
+        data = {
+            "data": project_fields(profile_data, self.fields),
+            "message": "ok"
+        }
+        if self.skipped_sections:
+            data["skipped_sections"] = [section for section in PROFILE_SECTIONS if section in self.skipped_sections]
+        return data
+
+    def _signals_from_raw(self, raw: Dict) -> Dict[str, Dict]:
+        """Sinyal per section ({"count", "hash"}) dari hasil PAGE_SIGNALS_JS"""
+        return {
+            section: {"count": raw[section].get("count", 0), "hash": fingerprint(raw[section].get("text"))}
+            for section in PROFILE_SECTIONS if raw.get(section)
+        }
+
+    def _page_sections(self, previous=None) -> List[str]:
+        """
+        Section halaman profil yang perlu di-extract: yang diminta, dikurangi
+        section yang sinyalnya sama dengan snapshot previous (dicatat di
+        reused_sections) dan section opsional jika waktu tidak cukup
+        """
+        sections = list(self.sections)
+        if previous is not None:
+            sections = changed_sections(previous.signals, self.signals)
+            self.reused_sections = [section for section in PROFILE_SECTIONS if section not in sections]
+            print(f"[REFRESH] Changed sections: {sections}, reused: {self.reused_sections}")
+        return self._optional_sections([section for section in sections if section != "skills"])
+
+    def _merge_reused(self, profile_data: Dict, previous=None) -> Dict:
+        """Gabungkan section yang di-extract dengan section yang dipakai ulang dari snapshot"""
+        if not self.reused_sections:
+            return profile_data
+        # Urutan field tetap sama dengan full scrape
+        merged = {**section_fields(previous.data, self.reused_sections), **profile_data}
+        return section_fields(merged, [section for section in PROFILE_SECTIONS if section != "skills"])
+
+    def _reused_skills(self, profile_data: Dict, previous=None) -> Optional[str]:
+        """Skills dari snapshot jika section skills dipakai ulang dan masih valid"""
+        if "skills" not in self.reused_sections:
+            return None
+        skills = self._reusable_skills(profile_data, previous)
+        if skills:
+            self.skills_source = previous.skills_source
+        else:
+            self.reused_sections.remove("skills")
+        return skills
+
+    def _needs_skills(self, skills: Optional[str]) -> bool:
+        """Skills perlu diambil dari halaman skills (diminta, belum ada, dan waktu cukup)"""
+        return not skills and "skills" in self.sections and bool(self._optional_sections(["skills"]))
+
+    def _reusable_skills(self, profile_data: Dict, previous) -> Optional[str]:
+        """
+        Skills dari snapshot sebelumnya, atau None jika harus diambil ulang
+
+        Skills hasil AI hanya dipakai ulang jika top card, about dan
+        experiences (input prompt Gemini) tidak berubah.
+        """
+        skills = previous.data.get("skills")
+        if not skills:
+            return None
+        if previous.skills_source == "ai":
+            changed = changed_sections(content_fingerprints(previous.data), content_fingerprints(profile_data))
+            if any(section in changed for section in AI_INPUT_SECTIONS):
+                return None
+        return skills
+
+    def _parse_main_page(self, raw: Dict, sections: List[str]) -> Dict:
+        """Parse hasil PROFILE_EXTRACTION_JS menjadi field profil (sama untuk semua engine browser)"""
+        experiences = []
+        for idx, texts in enumerate(raw.get("experience_items") or []):
+            exp_data = parse_experience_texts(idx, texts)
+            if exp_data:
+                experiences.append(exp_data)
+        if not raw.get("experience_found") and "experiences" in sections:
+            print("❌ Experience section not found")
+
+        education = []
+        for idx, texts in enumerate(raw.get("education_items") or []):
+            edu_data = parse_education_texts(idx, texts)
+            if edu_data:
+                education.append(edu_data)
+        if not raw.get("education_found") and "educations" in sections:
+            print("❌ Education section not found")
+
+        certifications = []
+        for idx, cert_data in enumerate(raw.get("certification_items") or []):
+            if accept_certification(idx, cert_data):
+                certifications.append(cert_data)
+        if not raw.get("certifications_found") and "certifications" in sections:
+            print("❌ Certifications section not found")
+
+        profile_data = {
+            "full_name": raw.get("full_name"),
+            "headline": raw.get("headline"),
+            "location": raw.get("location"),
+            "about": raw.get("about"),
+            "experiences": experiences,
+            "educations": education,
+            "certifications": certifications
+        }
+        return section_fields(profile_data, [section for section in sections if section != "skills"])
+
+    def _not_found_result(self, reason: str) -> Dict:
+        """Hasil scrape untuk profil yang tidak ada (redirect /404, HTTP 404)"""
+        print(f"[SCRAPER] Profil {self.vanity_name} tidak ditemukan: {reason}")
+        return {"data": {}, "message": PROFILE_NOT_FOUND_MESSAGE}
+
+    def _archive_enabled(self) -> bool:
+        # Scrape dengan fields hanya memuat sebagian section; tidak berguna untuk extract ulang
+        return bool(self.page_archive) and self.fields is None
+
+    def _archive_metadata(self, kind: str) -> Optional[Dict]:
+        return {"section_index": self.section_index} if kind == "profile" else None
+
+    def _submit_ai_skills(self, profile_data: Dict):
+        """Mulai generate skills via Gemini di background (lihat ai_skills.SkillsGenerator)"""
+        generator = self.skills_generator or get_skills_generator()
+        return generator.submit(
+            headline=profile_data.get("headline", ""),
+            about=profile_data.get("about", ""),
+            experiences=profile_data.get("experiences", [])
+        )
+
+    def _ai_skills_result(self, skills: str) -> str:
+        """Catat hasil fallback AI (skills_source) dan kembalikan skills-nya"""
+        if skills:
+            self.skills_source = "ai"
+            print(f"[SKILLS] AI generation berhasil: {skills}")
+        else:
+            print("[SKILLS] AI generation juga gagal")
+        return skills
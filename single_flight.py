@@ -0,0 +1,62 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+def covers(flight_deadline: Optional[float], deadline: Optional[float]) -> bool:
+    """Flight dengan flight_deadline boleh dipakai caller dengan deadline (None = tanpa deadline)"""
+    if flight_deadline is None:
+        return True
+    return deadline is not None and flight_deadline >= deadline
+
+
+class SingleFlight:
+    def __init__(self):
+        """
+        Gabungkan pemanggilan bersamaan dengan key yang sama menjadi satu eksekusi
+
+        Caller pertama menjalankan pekerjaan sebagai task terpisah; caller lain
+        dengan key yang sama menunggu task yang sama dan menerima hasil atau
+        exception yang sama. Task tetap berjalan walau caller pertama batal.
+
+        Pekerjaan dengan deadline (hasilnya bisa parsial) hanya diikuti caller
+        yang deadline-nya sama atau lebih awal; caller lain memulai flight
+        baru yang menggantikannya untuk caller berikutnya.
+        """
+        # {key: (task, deadline flight)}
+        self._in_flight: Dict[str, Tuple[asyncio.Task, Optional[float]]] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[..., Awaitable], *args, deadline: Optional[float] = None, **kwargs):
+        """
+        Jalankan await fn(*args, **kwargs) sekali per key yang sedang berjalan
+
+        Args:
+            deadline: Deadline caller (time.monotonic()); hanya ikut flight yang
+                deadline-nya tidak lebih awal. Tidak diteruskan ke fn.
+        """
+        flight = self._in_flight.get(key)
+        if flight is not None and covers(flight[1], deadline):
+            task = flight[0]
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            self._in_flight[key] = (task, deadline)
+            task.add_done_callback(lambda done: self._forget(key, done))
+        # shield: caller yang batal tidak membatalkan task milik caller lain
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        # Flight yang sudah digantikan flight lain tidak menghapus penggantinya
+        flight = self._in_flight.get(key)
+        if flight is not None and flight[0] is task:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict:
+        """Statistik untuk health/metrics endpoint"""
+        return {
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced
+        }
@@ -0,0 +1,102 @@
+import pytest
+
+import account_pool
+from account_pool import AccountPool, NoAccountAvailable
+
+
+class FakeTime:
+    """Pengganti modul time untuk account_pool: waktu hanya maju lewat advance()"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(account_pool, "time", fake)
+    return fake
+
+
+def test_token_bucket_limits_burst_and_refills(clock):
+    pool = AccountPool(["cookie-1"], rate_per_minute=60, burst=2)
+    pool.acquire(timeout=0)
+    pool.acquire(timeout=0)
+
+    with pytest.raises(NoAccountAvailable) as error:
+        pool.acquire(timeout=0)
+    assert error.value.retry_after == 1
+
+    # 60 per menit: satu token per detik, tidak melebihi burst
+    clock.advance(1)
+    pool.acquire(timeout=0)
+    clock.advance(10)
+    assert pool.stats()["accounts"][0]["tokens"] == 2
+
+
+def test_unlimited_accounts_never_run_out(clock):
+    pool = AccountPool(["cookie-1"], rate_per_minute=0, burst=1)
+    for _ in range(10):
+        pool.acquire(timeout=0)
+
+    assert pool.stats()["accounts"][0]["tokens"] is None
+    assert pool.accounts[0].scrapes == 10
+
+
+def test_load_is_spread_over_accounts(clock):
+    pool = AccountPool(["cookie-1", "cookie-2", "cookie-3"], rate_per_minute=60, burst=5)
+    picked = [pool.acquire(timeout=0).account_id for _ in range(6)]
+
+    assert sorted(picked) == ["account-1", "account-1", "account-2", "account-2", "account-3", "account-3"]
+
+
+def test_login_wall_quarantines_with_exponential_backoff(clock):
+    pool = AccountPool(["cookie-1", "cookie-2"], quarantine_seconds=100, max_quarantine_seconds=250)
+    account = pool.accounts[0]
+
+    pool.report(account, success=False, login_wall="/authwall")
+    assert pool.available_count() == 1
+    assert all(pool.acquire(timeout=0) is pool.accounts[1] for _ in range(3))
+
+    clock.advance(100)
+    assert pool.available_count() == 2
+    pool.report(account, success=False, login_wall="/checkpoint")
+    clock.advance(199)
+    assert account.is_quarantined(clock.now)
+    clock.advance(1)
+    assert not account.is_quarantined(clock.now)
+
+    # Backoff dibatasi max_quarantine_seconds
+    pool.report(account, success=False, login_wall="/checkpoint")
+    assert account.quarantined_until - clock.now == 250
+
+
+def test_success_resets_backoff(clock):
+    pool = AccountPool(["cookie-1"], quarantine_seconds=100)
+    account = pool.accounts[0]
+    pool.report(account, success=False, login_wall="/authwall")
+    clock.advance(100)
+    pool.report(account, success=True)
+    pool.report(account, success=False, login_wall="/authwall")
+
+    assert account.quarantined_until - clock.now == 100
+    assert (account.successes, account.failures, account.login_walls) == (1, 0, 2)
+
+
+def test_all_quarantined_reports_retry_after(clock):
+    pool = AccountPool(["cookie-1"], quarantine_seconds=30)
+    pool.quarantine(pool.accounts[0], "session check gagal")
+
+    with pytest.raises(NoAccountAvailable) as error:
+        pool.acquire(timeout=0)
+    assert error.value.retry_after == 30
+    stats = pool.stats()
+    assert (stats["active"], stats["quarantined"]) == (0, 1)
+    assert stats["accounts"][0]["quarantine_reason"] == "session check gagal"
+    assert stats["accounts"][0]["li_at"] == "…ie-1"
@@ -0,0 +1,120 @@
+import pytest
+
+import job_queue
+from job_queue import JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING, SQLiteJobQueue, create_job_queue
+
+
+class FakeTime:
+    """Pengganti modul time untuk job_queue: waktu hanya maju lewat advance()"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(job_queue, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_claim_in_fifo_order_and_complete(queue, clock):
+    first, second = queue.enqueue(["a", "b"])
+    clock.advance(1)
+
+    job = queue.claim("worker-1", visibility_timeout=60)
+    assert (job.job_id, job.status, job.attempts, job.worker_id) == (first.job_id, JOB_RUNNING, 1, "worker-1")
+    assert queue.claim("worker-2", visibility_timeout=60).job_id == second.job_id
+    assert queue.claim("worker-3", visibility_timeout=60) is None
+
+    assert queue.complete(job.job_id, "worker-1", {"data": {"name": "A"}})
+    done = queue.get(job.job_id)
+    assert (done.status, done.result, done.worker_id) == (JOB_DONE, {"data": {"name": "A"}}, None)
+    assert queue.stats() == {JOB_QUEUED: 0, JOB_RUNNING: 1, JOB_DONE: 1, JOB_FAILED: 0}
+
+
+def test_expired_lease_is_reclaimed_and_counts_an_attempt(queue, clock):
+    job, = queue.enqueue(["a"])
+    queue.claim("worker-1", visibility_timeout=60)
+
+    clock.advance(59)
+    assert queue.claim("worker-2", visibility_timeout=60) is None
+    assert queue.extend(job.job_id, "worker-1", visibility_timeout=60)
+
+    # Worker-1 berhenti memperpanjang lease: job muncul lagi untuk worker lain
+    clock.advance(61)
+    reclaimed = queue.claim("worker-2", visibility_timeout=60)
+    assert (reclaimed.job_id, reclaimed.attempts, reclaimed.worker_id) == (job.job_id, 2, "worker-2")
+
+    # Lease worker-1 sudah hilang
+    assert not queue.extend(job.job_id, "worker-1", visibility_timeout=60)
+    assert not queue.complete(job.job_id, "worker-1", {"data": {}})
+    assert queue.fail(job.job_id, "worker-1", "terlambat").status == JOB_RUNNING
+
+
+def test_lease_expiring_on_last_attempt_fails_job(queue, clock):
+    job, = queue.enqueue(["a"])
+    for worker_id in ("worker-1", "worker-2"):
+        assert queue.claim(worker_id, visibility_timeout=60) is not None
+        clock.advance(61)
+
+    assert queue.claim("worker-3", visibility_timeout=60) is None
+    failed = queue.get(job.job_id)
+    assert (failed.status, failed.attempts) == (JOB_FAILED, 2)
+
+
+def test_fail_retries_after_delay_until_max_attempts(queue, clock):
+    job, = queue.enqueue(["a"])
+    queue.claim("worker-1", visibility_timeout=60)
+
+    retried = queue.fail(job.job_id, "worker-1", "timeout", retry_delay=30)
+    assert (retried.status, retried.error, retried.worker_id) == (JOB_QUEUED, "timeout", None)
+    clock.advance(29)
+    assert queue.claim("worker-1", visibility_timeout=60) is None
+    clock.advance(1)
+    assert queue.claim("worker-1", visibility_timeout=60).attempts == 2
+
+    failed = queue.fail(job.job_id, "worker-1", "timeout", retry_delay=30)
+    assert (failed.status, failed.attempts) == (JOB_FAILED, 2)
+
+
+def test_fail_without_retry_fails_on_first_attempt(queue, clock):
+    job, = queue.enqueue(["missing-profile"])
+    queue.claim("worker-1", visibility_timeout=60)
+
+    failed = queue.fail(job.job_id, "worker-1", "Profil tidak ditemukan", retry_delay=30, retry=False)
+    assert (failed.status, failed.attempts) == (JOB_FAILED, 1)
+    clock.advance(30)
+    assert queue.claim("worker-1", visibility_timeout=60) is None
+
+
+def test_fail_without_counting_attempt(queue, clock):
+    job, = queue.enqueue(["a"], max_attempts=1)
+    queue.claim("worker-1", visibility_timeout=60)
+
+    # Misal semua akun sedang di-rate-limit: bukan salah job
+    retried = queue.fail(job.job_id, "worker-1", "no account", retry_delay=5, count_attempt=False)
+    assert (retried.status, retried.attempts) == (JOB_QUEUED, 0)
+    clock.advance(5)
+    assert queue.claim("worker-1", visibility_timeout=60).attempts == 1
+
+
+def test_create_job_queue(tmp_path):
+    queue = create_job_queue(f"sqlite:///{tmp_path / 'jobs.sqlite3'}", max_attempts=5)
+    assert isinstance(queue, SQLiteJobQueue) and queue.max_attempts == 5
+    queue.close()
+    with pytest.raises(ValueError):
+        create_job_queue("redis://localhost")
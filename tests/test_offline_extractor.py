@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from offline_extractor import parse_profile, parse_skills
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def test_parse_profile_on_rendered_page():
+    profile = parse_profile((FIXTURES / "rendered_profile.html").read_text(encoding="utf-8"))
+
+    assert profile["full_name"] == "Rina Pratama Putri"
+    assert profile["headline"] == "Senior Backend Engineer | Python, Go"
+    assert profile["location"] == "Jakarta, Indonesia"
+    # <br> menjadi baris baru, whitespace lain di-collapse seperti innerText
+    assert profile["about"] == "Backend engineer with 8 years of experience.\nFocused on reliability and observability."
+    assert profile["experiences"] == [
+        {"title": "Senior Backend Engineer", "company": "Nusantara Commerce", "date_range": "Jan 2022 - Present",
+         "location": "Jakarta, Indonesia"},
+        {"title": "Software Engineer Intern", "company": "PaperPlay Studio", "date_range": "Jun 2018 - Feb 2019",
+         "location": None},
+    ]
+    # Section tanpa id dikenali dari heading "Pendidikan"
+    assert profile["educations"] == [
+        {"school": "Institut Teknologi Bandung", "degree": "Bachelor of Engineering, Informatics",
+         "date_range": "2014 - 2018"},
+    ]
+    assert profile["certifications"] == [
+        {"name": "AWS Certified Solutions Architect", "authority": "Amazon Web Services (AWS)",
+         "issued": "Issued Aug 2023", "credential_id": "Credential ID ABC123XYZ"},
+    ]
+
+
+def test_parse_profile_without_sections():
+    profile = parse_profile("<html><body><main><h1>Page not found</h1></main></body></html>")
+
+    assert profile == {"full_name": None, "headline": None, "location": None, "about": None,
+                       "experiences": [], "educations": [], "certifications": []}
+
+
+def test_parse_skills():
+    html = """<html><body><div class="pvs-list__container"><ul>
+      <li><span aria-hidden="true">Python</span><span class="visually-hidden">Python</span></li>
+      <li><span aria-hidden="true">Go</span></li>
+      <li><span aria-hidden="true">Endorsed by 12 colleagues at Nusantara Commerce and 3 others</span></li>
+      <li><span aria-hidden="true">Python</span></li>
+    </ul></div></body></html>"""
+
+    assert parse_skills(html) == "Python|Go"
@@ -0,0 +1,132 @@
+import pytest
+
+import profile_cache
+from profile_cache import ProfileCache
+
+
+class FakeTime:
+    """Pengganti modul time untuk profile_cache: waktu hanya maju lewat advance()"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(profile_cache, "time", fake)
+    return fake
+
+
+def make_cache(tmp_path, **kwargs) -> ProfileCache:
+    return ProfileCache(db_path=str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_entry_fresh_until_ttl_then_stale_until_stale_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl=100, stale_ttl=50)
+    cache.set("johndoe", {"data": {"name": "John"}})
+
+    clock.advance(100)
+    assert cache.get("johndoe").is_fresh()
+
+    # Lewat TTL: masih disajikan (stale-while-revalidate) tapi tidak fresh
+    clock.advance(1)
+    entry = cache.get("johndoe")
+    assert entry is not None and not entry.is_fresh()
+    assert cache.stats()["stale_hits"] == 1
+
+    # Lewat jendela stale: dibuang dari memory dan SQLite
+    clock.advance(50)
+    assert cache.get("johndoe") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_max_age_overrides_entry_ttl(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl=100, stale_ttl=50)
+    cache.set("johndoe", {"data": {}}, ttl=10)
+
+    clock.advance(5)
+    assert cache.get("johndoe", max_age=60).is_fresh(60)
+    assert not cache.get("johndoe", max_age=1).is_fresh(1)
+
+    # TTL per entry (10) berlaku tanpa max_age
+    clock.advance(6)
+    assert not cache.get("johndoe").is_fresh()
+
+
+def test_key_is_normalized(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.set("/JohnDoe/ ", {"data": {"name": "John"}})
+
+    assert cache.get("johndoe").result == {"data": {"name": "John"}}
+
+
+def test_memory_lru_evicts_least_recently_used_to_disk(tmp_path, clock):
+    cache = make_cache(tmp_path, max_memory_entries=2)
+    cache.set("a", {"v": "a"})
+    cache.set("b", {"v": "b"})
+    cache.get("a")
+    cache.set("c", {"v": "c"})
+
+    # b paling lama tidak diakses: keluar dari memory tapi masih ada di SQLite
+    assert list(cache._memory) == ["a", "c"]
+    assert cache.get("b").result == {"v": "b"}
+    stats = cache.stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_entries"] == 2
+
+
+def test_disk_evicts_least_recently_accessed(tmp_path, clock):
+    cache = make_cache(tmp_path, max_memory_entries=1, max_disk_entries=2)
+    cache.set("a", {"v": "a"})
+    clock.advance(1)
+    cache.set("b", {"v": "b"})
+    clock.advance(1)
+    # Akses a dari disk memperbarui accessed_at; b jadi yang paling lama
+    assert cache.get("a") is not None
+    clock.advance(1)
+    cache.set("c", {"v": "c"})
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["disk_entries"] == 2
+    cache._memory.clear()
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+
+def test_invalidate_removes_both_tiers(tmp_path, clock):
+    cache = make_cache(tmp_path)
+    cache.set("johndoe", {"data": {}})
+    cache.invalidate("johndoe")
+
+    assert cache.get("johndoe") is None
+    assert cache.stats()["disk_entries"] == 0
+
+
+def test_entries_survive_restart(tmp_path, clock):
+    make_cache(tmp_path).set("johndoe", {"data": {"name": "John"}})
+
+    cache = make_cache(tmp_path)
+    assert cache.get("johndoe").result == {"data": {"name": "John"}}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_writes_from_another_process_replace_memory_entry(tmp_path, clock):
+    api = make_cache(tmp_path)
+    worker = make_cache(tmp_path)
+    api.set("johndoe", {"v": 1})
+    assert api.get("johndoe").result == {"v": 1}
+
+    # worker.py hanya menulis ke SQLite; API membaca versi baru dari disk
+    worker.set("johndoe", {"v": 2}, remember=False)
+    assert not worker._memory
+    assert api.get("johndoe").result == {"v": 2}
+    assert api.stats()["disk_hits"] == 1
+    assert api.get("johndoe").result == {"v": 2}
+    assert api.stats()["memory_hits"] == 2
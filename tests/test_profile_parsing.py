@@ -0,0 +1,66 @@
+from profile_parsing import (about_candidates, clean_text, index_sections, parse_education_texts,
+                             parse_experience_texts, skills_from_texts)
+
+
+def test_index_sections_prefers_ids_over_headings():
+    sections = [
+        {"id": "", "heading": ""},
+        {"id": "", "heading": "About"},
+        {"id": "about", "heading": ""},
+        {"id": "experience", "heading": "Pengalaman"},
+        {"id": "", "heading": "Pendidikan"},
+        {"id": "licenses_and_certifications", "heading": "Licenses & certifications"},
+        {"id": "", "heading": "Keahlian"},
+    ]
+
+    assert index_sections(sections) == {"experience": 4, "education": 5, "certifications": 6, "skills": 7, "about": 3}
+
+
+def test_index_sections_missing_kinds_are_absent():
+    assert index_sections([{"id": None, "heading": None}, {"id": "", "heading": "Activity"}]) == {}
+
+
+def test_about_candidates():
+    assert about_candidates({"about": 5}) == [5, 3, 2]
+    assert about_candidates({"about": 3}) == [3, 2]
+    assert about_candidates({}) == [3, 2]
+
+
+def test_clean_text_drops_blank_and_repeated_lines():
+    assert clean_text("  Python \n\nPython\n Go \n") == "Python\nGo"
+    assert clean_text(" \n ") is None
+    assert clean_text(None) is None
+
+
+def test_parse_experience_texts():
+    texts = ["Software Engineer Intern", "PaperPlay Studio · Magang", "Jun 2018 - Feb 2019", "Bandung"]
+
+    assert parse_experience_texts(0, texts) == {
+        "title": "Software Engineer Intern",
+        "company": "PaperPlay Studio",
+        "date_range": "Jun 2018 - Feb 2019",
+        "location": "Bandung"
+    }
+    assert parse_experience_texts(0, texts[:3])["location"] is None
+
+
+def test_parse_experience_texts_skips_invalid_items():
+    assert parse_experience_texts(0, ["Engineer", "Acme"]) is None
+    # Title sama dengan company: biasanya item education yang salah section
+    assert parse_experience_texts(0, ["Institut Teknologi Bandung", "Institut Teknologi Bandung", "2014 - 2018"]) is None
+
+
+def test_parse_education_texts():
+    assert parse_education_texts(0, ["Institut Teknologi Bandung", "Bachelor, Informatics", "2014 - 2018"]) == {
+        "school": "Institut Teknologi Bandung",
+        "degree": "Bachelor, Informatics",
+        "date_range": "2014 - 2018"
+    }
+    assert parse_education_texts(0, ["Institut Teknologi Bandung", "2014 - 2018"]) is None
+    assert parse_education_texts(0, ["ITB", "ITB", "2014 - 2018"]) is None
+
+
+def test_skills_from_texts_dedupes_and_drops_endorsements():
+    texts = ["Python", " Go ", "Endorsed by 12 colleagues at Nusantara Commerce and 3 others", "", "Python"]
+
+    assert skills_from_texts(texts) == ["Python", "Go"]
@@ -0,0 +1,94 @@
+import pytest
+
+from profile_snapshots import (PROFILE_SECTIONS, SnapshotStore, changed_sections, content_fingerprints, diff_profiles,
+                               parse_fields, project_fields, sections_for_fields)
+
+PROFILE = {
+    "full_name": "John Doe",
+    "headline": "Engineer",
+    "location": "Jakarta",
+    "about": "Hello",
+    "experiences": [{"title": "Engineer", "company": "Acme"}],
+    "educations": [{"school": "ITB"}],
+    "certifications": [],
+    "skills": "Python|SQL",
+}
+
+
+def test_diff_profiles_reports_only_changed_sections():
+    new = {**PROFILE, "headline": "Senior Engineer", "skills": "Python|Go"}
+
+    diff = diff_profiles(PROFILE, new)
+
+    assert diff["changed"] == ["top_card", "skills"]
+    assert diff["sections"]["top_card"]["old"]["headline"] == "Engineer"
+    assert diff["sections"]["top_card"]["new"]["headline"] == "Senior Engineer"
+    assert diff["sections"]["skills"] == {"added": ["Go"], "removed": ["SQL"]}
+
+
+def test_diff_profiles_lists_added_and_removed_items():
+    new = {**PROFILE, "experiences": [{"title": "CTO", "company": "Startup"}, *PROFILE["experiences"]],
+           "educations": [], "certifications": [{"name": "AWS"}], "about": None}
+
+    diff = diff_profiles(PROFILE, new)
+
+    assert diff["changed"] == ["about", "experiences", "educations", "certifications"]
+    assert diff["sections"]["about"] == {"old": "Hello", "new": None}
+    assert diff["sections"]["experiences"] == {"added": [{"title": "CTO", "company": "Startup"}], "removed": []}
+    assert diff["sections"]["educations"] == {"added": [], "removed": [{"school": "ITB"}]}
+    assert diff["sections"]["certifications"] == {"added": [{"name": "AWS"}], "removed": []}
+
+
+def test_diff_profiles_ignores_order_of_keys_and_empty_values():
+    reordered = {key: PROFILE[key] for key in reversed(list(PROFILE))}
+    reordered["experiences"] = [{"company": "Acme", "title": "Engineer"}]
+    reordered["certifications"] = None
+
+    assert diff_profiles(PROFILE, reordered) == {"changed": [], "sections": {}}
+
+
+def test_changed_sections_from_fingerprints():
+    fingerprints = content_fingerprints(PROFILE)
+
+    assert fingerprints["skills"]["count"] == 2
+    assert changed_sections(None, fingerprints) == list(PROFILE_SECTIONS)
+    assert changed_sections(fingerprints, content_fingerprints({**PROFILE, "about": "Hi"})) == ["about"]
+
+
+def test_store_keeps_new_versions_only_when_changed(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots.sqlite3"), history=2)
+
+    assert store.save("JohnDoe", PROFILE, signals={"about": 1}) == list(PROFILE_SECTIONS)
+    assert store.save("johndoe", PROFILE, full=False) == []
+    assert store.stats() == {"profiles": 1, "versions": 1}
+    # Sinyal lama dipertahankan jika scrape tidak mengirim sinyal
+    assert store.latest("johndoe").signals == {"about": 1}
+
+    for headline in ("Senior Engineer", "Staff Engineer"):
+        assert store.save("johndoe", {**PROFILE, "headline": headline}) == ["top_card"]
+
+    # history=2: versi paling lama dibuang
+    latest, previous = store.latest_two("johndoe")
+    assert (latest.data["headline"], previous.data["headline"]) == ("Staff Engineer", "Senior Engineer")
+    assert store.stats() == {"profiles": 1, "versions": 2}
+    store.close()
+
+
+def test_parse_fields_expands_sections_and_dedupes():
+    assert parse_fields(None) is None
+    assert parse_fields(" , ") is None
+    assert parse_fields("top_card, about,full_name,,skills") == ["full_name", "headline", "location", "about", "skills"]
+
+
+def test_parse_fields_rejects_unknown_names():
+    with pytest.raises(ValueError, match="Field tidak dikenal: photo"):
+        parse_fields("about,photo")
+
+
+def test_sections_and_projection_for_fields():
+    fields = parse_fields("headline,experiences")
+
+    assert sections_for_fields(fields) == ["top_card", "experiences"]
+    assert sections_for_fields(None) == list(PROFILE_SECTIONS)
+    assert project_fields(PROFILE, fields) == {"headline": "Engineer", "experiences": PROFILE["experiences"]}
+    assert project_fields(PROFILE, None) is PROFILE
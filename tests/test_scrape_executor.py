@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from scrape_executor import ScrapeExecutor, default_reserved
+
+
+def run_mixed(executor: ScrapeExecutor, interactive: int, bulk: int, duration: float = 0.01):
+    """Antrikan scrape interactive lalu bulk sekaligus; kembalikan urutan lane yang selesai"""
+    finished = []
+
+    async def scrape(lane: str):
+        await asyncio.sleep(duration)
+        finished.append(lane)
+
+    async def main():
+        jobs = [executor.run(scrape, "interactive", lane="interactive", client=f"ui-{i}")
+                for i in range(interactive)]
+        jobs += [executor.run(scrape, "bulk", lane="bulk", client="batch") for _ in range(bulk)]
+        await asyncio.gather(*jobs)
+
+    asyncio.run(main())
+    return finished
+
+
+def test_bulk_progresses_while_interactive_saturated():
+    # Dua slot, hanya interactive yang memesan slot: tanpa aging bulk menunggu semua interactive
+    executor = ScrapeExecutor(max_in_flight=2, max_queue=100, reserved={"interactive": 1}, max_wait=0.05)
+    finished = run_mixed(executor, interactive=100, bulk=3)
+
+    # Semua bulk selesai sebelum separuh antrian interactive habis
+    assert finished[:len(finished) // 2].count("bulk") == 3
+    assert executor.stats()["lanes"]["bulk"]["total_aged"] > 0
+
+
+def test_reserved_bulk_slot_runs_alongside_interactive():
+    executor = ScrapeExecutor(max_in_flight=3, max_queue=100, reserved=default_reserved(("interactive", "bulk"), 3),
+                              max_wait=0)
+    finished = run_mixed(executor, interactive=30, bulk=3)
+
+    assert finished[:len(finished) // 2].count("bulk") == 3
+    assert executor.stats()["lanes"]["bulk"]["total_aged"] == 0
+
+
+def test_default_reserved():
+    assert default_reserved(("interactive", "bulk"), 3) == {"interactive": 1, "bulk": 1}
+    assert default_reserved(("interactive", "bulk"), 2) == {"interactive": 1}
+    assert default_reserved(("interactive", "bulk"), 1) == {}
+    assert default_reserved(("interactive",), 4) == {}
+
+
+def test_lane_without_reserved_slot_requires_aging():
+    with pytest.raises(ValueError):
+        ScrapeExecutor(max_in_flight=2, reserved={"interactive": 1}, max_wait=0)
+    with pytest.raises(ValueError):
+        ScrapeExecutor(max_in_flight=2, reserved={"interactive": 2})
+    ScrapeExecutor(max_in_flight=2, reserved={"interactive": 1, "bulk": 1}, max_wait=0)
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def scrape(vanity_name: str):
+        calls.append(vanity_name)
+        await asyncio.sleep(0.01)
+        return {"vanity_name": vanity_name}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("johndoe", scrape, "johndoe") for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert calls == ["johndoe"]
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "executions": 1, "coalesced": 4}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+
+    async def scrape(vanity_name: str):
+        await asyncio.sleep(0.01)
+        return vanity_name
+
+    async def main():
+        return await asyncio.gather(flight.do("a", scrape, "a"), flight.do("b", scrape, "b"))
+
+    assert asyncio.run(main()) == ["a", "b"]
+    assert flight.executions == 2
+
+
+def test_exception_is_shared_and_key_is_released():
+    flight = SingleFlight()
+
+    async def scrape():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("login wall")
+
+    async def main():
+        results = await asyncio.gather(flight.do("johndoe", scrape), flight.do("johndoe", scrape),
+                                       return_exceptions=True)
+        assert flight.stats()["in_flight"] == 0
+        # Key sudah dilepas: pemanggilan berikutnya menjalankan ulang
+        with pytest.raises(RuntimeError):
+            await flight.do("johndoe", scrape)
+        return results
+
+    results = asyncio.run(main())
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert flight.executions == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight()
+    finished = []
+
+    async def scrape():
+        await asyncio.sleep(0.05)
+        finished.append(True)
+        return "ok"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("johndoe", scrape))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("johndoe", scrape))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first
+
+    result, first = asyncio.run(main())
+
+    assert result == "ok"
+    assert first.cancelled()
+    assert finished == [True]
+
+
+def test_caller_with_later_deadline_starts_own_flight():
+    flight = SingleFlight()
+    budgets = []
+
+    async def scrape(budget: float):
+        budgets.append(budget)
+        await asyncio.sleep(0.01)
+        return budget
+
+    async def main():
+        return await asyncio.gather(
+            flight.do("johndoe", scrape, 1.0, deadline=100.0),
+            # Deadline lebih awal: hasil flight pertama cukup untuknya
+            flight.do("johndoe", scrape, 0.5, deadline=50.0),
+            # Deadline lebih lama atau tanpa deadline: flight parsial tidak cukup
+            flight.do("johndoe", scrape, 2.0, deadline=200.0),
+            flight.do("johndoe", scrape, None),
+            # Ikut flight tanpa deadline yang menggantikan flight sebelumnya
+            flight.do("johndoe", scrape, 3.0, deadline=300.0),
+        )
+
+    assert asyncio.run(main()) == [1.0, 1.0, 2.0, None, None]
+    assert budgets == [1.0, 2.0, None]
+    assert flight.stats() == {"in_flight": 0, "executions": 3, "coalesced": 2}
+
+
+def test_replaced_flight_does_not_release_its_successor():
+    flight = SingleFlight()
+
+    async def scrape(seconds: float):
+        await asyncio.sleep(seconds)
+        return seconds
+
+    async def main():
+        short = asyncio.ensure_future(flight.do("johndoe", scrape, 0.01, deadline=1.0))
+        await asyncio.sleep(0)
+        long = asyncio.ensure_future(flight.do("johndoe", scrape, 0.05, deadline=2.0))
+        await short
+        # Flight pendek selesai; key masih milik flight yang menggantikannya
+        assert flight.stats()["in_flight"] == 1
+        joined = await flight.do("johndoe", scrape, 9.0, deadline=2.0)
+        return joined, await long
+
+    assert asyncio.run(main()) == (0.05, 0.05)
+    assert flight.coalesced == 1
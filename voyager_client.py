@@ -0,0 +1,273 @@
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import quote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from linkedin_scraper_v2 import LINKEDIN_BASE_URL, is_login_wall
+from scrape_state import remaining_seconds
+
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+
+class VoyagerError(Exception):
+    """Fast path HTTP gagal; caller sebaiknya fallback ke Selenium"""
+
+
+class VoyagerAuthError(VoyagerError):
+    """Session li_at ditolak (401/403 atau redirect ke login/authwall)"""
+    session_rejected = True
+
+
+class VoyagerNotFound(VoyagerError):
+    """Profil tidak ada (HTTP 404 dari profileView); fallback Selenium tidak berguna"""
+    profile_missing = True
+
+
+def format_date(date: Optional[Dict]) -> Optional[str]:
+    """{"month": 1, "year": 2022} -> "Jan 2022"; tanpa month -> "2022" """
+    if not date or not date.get("year"):
+        return None
+    month = date.get("month")
+    if month and 1 <= month <= 12:
+        return f"{MONTHS[month - 1]} {date['year']}"
+    return str(date["year"])
+
+
+def format_duration(start: Dict, end: Optional[Dict]) -> Optional[str]:
+    """Durasi inklusif seperti di halaman profil: "2 yrs 9 mos" """
+    if not start or not start.get("year") or not start.get("month"):
+        return None
+    if end and end.get("year"):
+        end_year, end_month = end["year"], end.get("month") or 12
+    else:
+        now = time.localtime()
+        end_year, end_month = now.tm_year, now.tm_mon
+    months = (end_year - start["year"]) * 12 + (end_month - start["month"]) + 1
+    if months <= 0:
+        return None
+    years, months = divmod(months, 12)
+    parts = []
+    if years:
+        parts.append(f"{years} yr" if years == 1 else f"{years} yrs")
+    if months:
+        parts.append(f"{months} mo" if months == 1 else f"{months} mos")
+    return " ".join(parts)
+
+
+def format_date_range(time_period: Optional[Dict], with_duration: bool = False) -> Optional[str]:
+    """timePeriod Voyager -> "Jan 2022 - Present · 2 yrs 9 mos" (format teks halaman profil)"""
+    if not time_period:
+        return None
+    start = format_date(time_period.get("startDate"))
+    if not start:
+        return None
+    end = format_date(time_period.get("endDate")) or "Present"
+    date_range = f"{start} - {end}"
+    if with_duration:
+        duration = format_duration(time_period.get("startDate"), time_period.get("endDate"))
+        if duration:
+            date_range += f" · {duration}"
+    return date_range
+
+
+class VoyagerClient:
+    def __init__(self, li_at_cookie: str, base_url: str = LINKEDIN_BASE_URL,
+                 timeout: float = 10.0, pool_size: int = 10):
+        """
+        Client HTTP keep-alive untuk endpoint JSON LinkedIn (Voyager)
+
+        Args:
+            li_at_cookie: LinkedIn session cookie (li_at value)
+            base_url: Origin LinkedIn; bisa diarahkan ke stand-in lokal
+            timeout: Detik maksimal per request (dipersingkat sampai deadline scrape)
+            pool_size: Jumlah koneksi keep-alive yang disimpan
+        """
+        self.li_at_cookie = li_at_cookie
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "application/json",
+            "Accept-Language": "en-US,en;q=0.9",
+            "x-li-lang": "en_US",
+            "x-restli-protocol-version": "2.0.0",
+        })
+        host = urlparse(self.base_url).hostname or ""
+        self.cookie_domain = ".linkedin.com" if host.endswith("linkedin.com") else host
+        self.session.cookies.set("li_at", li_at_cookie, domain=self.cookie_domain, path="/")
+
+        self._csrf_lock = threading.Lock()
+        self._csrf_token = None
+
+        self.total_requests = 0
+        self.total_failures = 0
+
+    def _timeout(self, deadline: Optional[float]) -> float:
+        """Timeout satu request: self.timeout, dipersingkat sampai deadline"""
+        timeout = remaining_seconds(deadline, self.timeout)
+        if timeout <= 0:
+            raise VoyagerError("Deadline habis sebelum request Voyager")
+        return timeout
+
+    def _ensure_csrf_token(self, deadline: Optional[float] = None) -> str:
+        """
+        Voyager mewajibkan header csrf-token = nilai cookie JSESSIONID.
+        JSESSIONID diambil dari response halaman biasa; jika tidak diset
+        server, dibuat sendiri (LinkedIn hanya mencocokkan keduanya).
+        """
+        with self._csrf_lock:
+            if self._csrf_token:
+                return self._csrf_token
+            try:
+                self.session.get(f"{self.base_url}/feed/", timeout=self._timeout(deadline), allow_redirects=False)
+            except requests.RequestException as e:
+                print(f"[VOYAGER] ⚠ Bootstrap JSESSIONID gagal: {str(e)}")
+            jsessionid = self.session.cookies.get("JSESSIONID")
+            if not jsessionid:
+                jsessionid = f"ajax:{random.randint(10 ** 18, 10 ** 19 - 1)}"
+                self.session.cookies.set("JSESSIONID", f'"{jsessionid}"', domain=self.cookie_domain, path="/")
+            self._csrf_token = jsessionid.strip('"')
+            self.session.headers["csrf-token"] = self._csrf_token
+            return self._csrf_token
+
+    def _get(self, path: str, params: Optional[Dict] = None, deadline: Optional[float] = None) -> Dict:
+        """GET endpoint Voyager dan kembalikan JSON; VoyagerError untuk semua kegagalan (termasuk deadline habis)"""
+        self._ensure_csrf_token(deadline)
+        timeout = self._timeout(deadline)
+        self.total_requests += 1
+        try:
+            response = self.session.get(f"{self.base_url}/voyager/api{path}", params=params,
+                                        timeout=timeout, allow_redirects=False)
+        except requests.RequestException as e:
+            self.total_failures += 1
+            raise VoyagerError(f"Request {path} gagal: {str(e)}")
+
+        if response.status_code in (301, 302, 303, 307) and is_login_wall(response.headers.get("Location", "")):
+            self.total_failures += 1
+            raise VoyagerAuthError(f"Redirect ke {response.headers.get('Location')}")
+        if response.status_code in (401, 403):
+            self.total_failures += 1
+            # Token csrf mungkin sudah basi; bootstrap ulang di request berikutnya
+            self._csrf_token = None
+            raise VoyagerAuthError(f"{path}: HTTP {response.status_code}")
+        if response.status_code == 404 and path.endswith("/profileView"):
+            self.total_failures += 1
+            raise VoyagerNotFound(f"{path}: HTTP 404")
+        if response.status_code != 200:
+            self.total_failures += 1
+            raise VoyagerError(f"{path}: HTTP {response.status_code}")
+        try:
+            return response.json()
+        except ValueError:
+            self.total_failures += 1
+            raise VoyagerError(f"{path}: response bukan JSON")
+
+    def get_profile_view(self, vanity_name: str, deadline: Optional[float] = None) -> Dict:
+        """Profil lengkap: profile, positionView, educationView, certificationView"""
+        return self._get(f"/identity/profiles/{quote(vanity_name)}/profileView", deadline=deadline)
+
+    def get_skills(self, vanity_name: str, count: int = 100, deadline: Optional[float] = None) -> List[str]:
+        """Nama semua skill, dipaginasi sampai habis"""
+        names = []
+        start = 0
+        while True:
+            data = self._get(f"/identity/profiles/{quote(vanity_name)}/skills",
+                             params={"count": count, "start": start}, deadline=deadline)
+            elements = data.get("elements") or []
+            names.extend(element.get("name") for element in elements if element.get("name"))
+            total = (data.get("paging") or {}).get("total", len(names))
+            start += len(elements)
+            if not elements or start >= total:
+                return names
+
+    def fetch_profile(self, vanity_name: str, include_skills: bool = True, deadline: Optional[float] = None) -> Dict:
+        """
+        Ambil profil dan map ke bentuk dict yang sama dengan
+        LinkedInScraper._extract_profile_data()["data"]
+        
+        Args:
+            include_skills: False untuk melewati endpoint skills (skills kosong)
+            deadline: Batas waktu (time.monotonic()); setiap request dipersingkat
+                sampai deadline dan VoyagerError jika sudah habis
+        """
+        view = self.get_profile_view(vanity_name, deadline)
+        profile = view.get("profile") or {}
+        full_name = " ".join(filter(None, [profile.get("firstName"), profile.get("lastName")])).strip()
+        if not full_name:
+            raise VoyagerError("profileView tanpa nama")
+
+        experiences = []
+        for position in (view.get("positionView") or {}).get("elements") or []:
+            if not position.get("title") or not position.get("companyName"):
+                continue
+            experiences.append({
+                "title": position["title"],
+                "company": position["companyName"],
+                "date_range": format_date_range(position.get("timePeriod"), with_duration=True),
+                "location": position.get("locationName")
+            })
+
+        educations = []
+        for education in (view.get("educationView") or {}).get("elements") or []:
+            if not education.get("schoolName"):
+                continue
+            degree = ", ".join(filter(None, [education.get("degreeName"), education.get("fieldOfStudy")]))
+            educations.append({
+                "school": education["schoolName"],
+                "degree": degree or None,
+                "date_range": format_date_range(education.get("timePeriod"))
+            })
+
+        certifications = []
+        for certification in (view.get("certificationView") or {}).get("elements") or []:
+            if not certification.get("name"):
+                continue
+            issued = format_date((certification.get("timePeriod") or {}).get("startDate"))
+            certifications.append({
+                "name": certification["name"],
+                "authority": certification.get("authority"),
+                "issued": f"Issued {issued}" if issued else None,
+                "credential_id": (f"Credential ID {certification['licenseNumber']}"
+                                  if certification.get("licenseNumber") else None)
+            })
+
+        skills = []
+        seen = set()
+        for name in (self.get_skills(vanity_name, deadline=deadline) if include_skills else []):
+            name = name.strip()
+            if name and len(name) < 50 and name not in seen:
+                seen.add(name)
+                skills.append(name)
+
+        return {
+            "full_name": full_name,
+            "headline": profile.get("headline"),
+            "location": profile.get("geoLocationName") or profile.get("locationName"),
+            "about": profile.get("summary"),
+            "experiences": experiences,
+            "educations": educations,
+            "certifications": certifications,
+            "skills": "|".join(skills)
+        }
+
+    def stats(self) -> Dict:
+        """Statistik untuk health endpoint"""
+        return {
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures
+        }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,160 @@
+"""
+Worker scrape untuk horizontal scaling
+
+Mengambil job dari antrian JOB_QUEUE_URL (diisi lewat POST /jobs), menjalankan
+scrape dengan pool browser, akun dan konfigurasi .env yang sama dengan API,
+lalu menulis hasilnya kembali ke antrian dan ke SQLite cache profil
+(PROFILE_CACHE_DB) yang dibaca API. Jalankan sebanyak yang dibutuhkan di node
+mana pun yang bisa mengakses antrian dan database cache yang sama dengan API.
+
+Usage:
+    python worker.py
+    python worker.py --concurrency 4 --worker-id node-2
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+
+import main as service
+from account_pool import NoAccountAvailable
+from job_queue import Job, JobQueue
+
+JOB_VISIBILITY_TIMEOUT = float(os.getenv("JOB_VISIBILITY_TIMEOUT", "300"))
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "30"))
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", str(
+    service.CDP_MAX_TABS if service.cdp_browser else max(service.DRIVER_POOL_SIZE, 1)
+)))
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "2"))
+
+# Engine cdp: event loop tempat Chrome bersama berjalan; thread worker
+# menitipkan scrape ke loop ini (lihat run_scrape)
+cdp_loop = None
+
+
+def run_scrape(vanity_name: str) -> dict:
+    """service.run_scrape, atau run_scrape_async di cdp_loop untuk engine cdp"""
+    if cdp_loop is None:
+        return service.run_scrape(vanity_name)
+    return asyncio.run_coroutine_threadsafe(service.run_scrape_async(vanity_name), cdp_loop).result()
+
+
+class LeaseKeeper:
+    """Perpanjang visibility timeout job secara berkala selama scrape berjalan"""
+
+    def __init__(self, job_queue: JobQueue, job: Job, worker_id: str, visibility_timeout: float):
+        self.job_queue = job_queue
+        self.job = job
+        self.worker_id = worker_id
+        self.visibility_timeout = visibility_timeout
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.visibility_timeout / 3):
+            if not self.job_queue.extend(self.job.job_id, self.worker_id, self.visibility_timeout):
+                print(f"[WORKER] ⚠ Lease job {self.job.job_id} hilang")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def process_job(job_queue: JobQueue, job: Job, worker_id: str):
+    """Scrape satu job lalu tandai done, atau fail (retry dengan backoff hanya untuk error sementara)"""
+    print(f"[WORKER] {worker_id} scraping {job.vanity_name} (job {job.job_id}, attempt {job.attempts})")
+    retry_delay = JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+    try:
+        with LeaseKeeper(job_queue, job, worker_id, JOB_VISIBILITY_TIMEOUT):
+            profile_data = run_scrape(job.vanity_name)
+    except NoAccountAvailable as e:
+        # Bukan salah job: kembalikan ke antrian tanpa menghabiskan percobaan
+        job_queue.fail(job.job_id, worker_id, str(e), retry_delay=e.retry_after, count_attempt=False)
+        return
+    except Exception as e:
+        job_queue.fail(job.job_id, worker_id, str(e), retry_delay=retry_delay)
+        return
+
+    result = service.without_timings(profile_data)
+    if service.is_successful(profile_data):
+        # Hanya tier SQLite: LRU memory proses worker tidak pernah dibaca API
+        service.profile_cache.set(job.vanity_name, result, remember=False)
+        job_queue.complete(job.job_id, worker_id, result)
+        print(f"[WORKER] ✓ Job {job.job_id} done")
+    else:
+        # Profil tidak ada: retry hanya menghabiskan scrape dan kuota akun
+        failed = job_queue.fail(job.job_id, worker_id, result.get("message") or "scrape gagal",
+                                retry_delay=retry_delay, retry=not service.is_not_found(profile_data))
+        print(f"[WORKER] ✗ Job {job.job_id} failed ({failed.status if failed else 'lease lost'})")
+
+
+def worker_loop(job_queue: JobQueue, worker_id: str, stop: threading.Event):
+    """Claim dan kerjakan job sampai stop di-set"""
+    while not stop.is_set():
+        try:
+            job = job_queue.claim(worker_id, JOB_VISIBILITY_TIMEOUT)
+        except Exception as e:
+            print(f"[WORKER] ⚠ Claim gagal: {str(e)}")
+            job = None
+        if job is None:
+            stop.wait(WORKER_POLL_INTERVAL)
+            continue
+        process_job(job_queue, job, worker_id)
+
+
+def main():
+    global cdp_loop
+    parser = argparse.ArgumentParser(description="Worker scrape LinkedIn")
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY,
+                        help="Jumlah job yang dikerjakan paralel (default: WORKER_CONCURRENCY)")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{uuid.uuid4().hex[:6]}")
+    args = parser.parse_args()
+
+    if not service.LI_AT_COOKIES:
+        raise SystemExit("LINKEDIN_LI_AT / LINKEDIN_LI_AT_LIST tidak diset di file .env")
+
+    service.start_driver_pool()
+    service.start_browser_watchdog()
+    service.check_linkedin_session()
+    if service.cdp_browser:
+        cdp_loop = asyncio.new_event_loop()
+        threading.Thread(target=cdp_loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(service.start_cdp_browser(), cdp_loop).result()
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    threads = [
+        threading.Thread(target=worker_loop, args=(service.job_queue, f"{args.worker_id}/{i}", stop))
+        for i in range(args.concurrency)
+    ]
+    print(f"[WORKER] {args.worker_id} started with {args.concurrency} thread(s) on {service.JOB_QUEUE_URL}")
+    for thread in threads:
+        thread.start()
+    try:
+        while not stop.is_set():
+            time.sleep(1)
+    finally:
+        stop.set()
+        # Job yang sedang berjalan diselesaikan dulu
+        for thread in threads:
+            thread.join()
+        service.stop_driver_pool()
+        if cdp_loop:
+            asyncio.run_coroutine_threadsafe(service.stop_cdp_browser(), cdp_loop).result()
+            cdp_loop.call_soon_threadsafe(cdp_loop.stop)
+        print(f"[WORKER] {args.worker_id} stopped")
+
+
+if __name__ == "__main__":
+    main()